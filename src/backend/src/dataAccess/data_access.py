@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import Annotated
+from typing import Annotated, Set
 from fastapi import Depends
 from fastapi_pagination import Page
 from dataAccess.database.change_database import DataBase, oauth2_scheme
@@ -22,9 +22,11 @@ from endpoints.models.website_model import (
     CheckCustomLoginScript,
     CheckCustomLoginScriptResponse,
     GetWebsite,
+    validate_success_url,
 )
 from endpoints.webhooks.webhook_endpoints import WebhookEndpoints
 from execution.login.custom_login.parser import CustomLoginScriptParser
+from utils.exceptions import RequestValidationError
 
 
 class DataAccess:
@@ -43,6 +45,10 @@ class DataAccess:
     def get_website(website_id: int, current_user: User) -> Website:
         return DataBase.get_website(website_id, current_user)
 
+    @staticmethod
+    def get_website_ids(current_user: User) -> Set[int]:
+        return DataBase.get_website_ids(current_user)
+
     @staticmethod
     def check_custom_login_script(
         request: CheckCustomLoginScript,
@@ -58,10 +64,27 @@ class DataAccess:
 
     def edit_website(self, website_id: int, request: EditWebsite, current_user: User):
         existing_website = DataBase.get_website(website_id, current_user)
+        DataAccess.validate_edited_success_url(request, existing_website)
         website = request.edit_existing_model(existing_website)
         DataBase.edit_website(website, current_user)
         self.webhook_endpoints.login_data_changed()
 
+    @staticmethod
+    def validate_edited_success_url(request: EditWebsite, existing_website: Website):
+        """
+        The pattern has to be valid for the match type it is used with, either may be stored already.
+        :raises RequestValidationError: If the edited website would have an invalid success URL.
+        """
+        try:
+            validate_success_url(
+                request.success_url if request.success_url is not None else existing_website.success_url,
+                request.success_url_match
+                if request.success_url_match is not None
+                else existing_website.success_url_match,
+            )
+        except ValueError as e:
+            raise RequestValidationError(str(e))
+
     def delete_website(self, website_id: int, current_user: User):
         DataBase.delete_website(website_id, current_user)
         self.webhook_endpoints.login_data_changed()
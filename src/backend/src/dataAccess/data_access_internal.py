@@ -1,7 +1,7 @@
-from datetime import datetime
-from typing import List
+from datetime import datetime, timedelta
+from typing import Iterator, List
 
-from dataAccess.database.change_database import DataBase
+from dataAccess.database.change_database import DataBase, ExpirationEntry, ScheduleEntry
 from dataAccess.database.database import (
     Website,
     ActionHistory,
@@ -28,15 +28,32 @@ class DataAccessInternal:
     def get_websites_all_users() -> List[Website]:
         return DataBase.get_websites_all_users()
 
+    @staticmethod
+    def get_schedule_entries_all_users() -> Iterator[ScheduleEntry]:
+        return DataBase.get_schedule_entries_all_users()
+
+    @staticmethod
+    def get_expiration_entries_all_users() -> Iterator[ExpirationEntry]:
+        return DataBase.get_expiration_entries_all_users()
+
+    @staticmethod
+    def get_expiration_entry(website_id: int) -> ExpirationEntry | None:
+        return DataBase.get_expiration_entry(website_id)
+
     @staticmethod
     def get_website_all_users(website_id: int) -> Website:
         return DataBase.get_website_all_users(website_id)
 
     def unexpected_execution_failure(
-        self, website_id: int, execution_started: datetime
+        self,
+        website_id: int,
+        execution_started: datetime,
+        failed_details: ActionFailedDetails = ActionFailedDetails.UNKNOWN_EXECUTION_ERROR,
     ):
         ids = DataBase.unexpected_execution_failure(
-            website_id=website_id, execution_started=execution_started
+            website_id=website_id,
+            execution_started=execution_started,
+            failed_details=failed_details,
         )
 
         for action_history_id in ids:
@@ -78,8 +95,8 @@ class DataAccessInternal:
             )
 
     @staticmethod
-    def set_next_schedule(website_id: int):
-        DataBase.set_next_schedule(website_id)
+    def set_next_schedule(website_id: int, retry_after: timedelta | None = None):
+        DataBase.set_next_schedule(website_id, retry_after)
 
     @staticmethod
     def get_notifications_all_users() -> List[Notification]:
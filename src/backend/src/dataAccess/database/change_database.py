@@ -1,5 +1,5 @@
-from datetime import datetime, timezone
-from typing import List, Annotated
+from datetime import datetime, timedelta, timezone
+from typing import List, Annotated, Iterator, NamedTuple, Optional, Set
 from fastapi_pagination import Page
 from sqlalchemy import select, func, and_, case
 from sqlalchemy.orm import joinedload, selectinload, Session, aliased
@@ -26,6 +26,42 @@ from utils.security import decode_token
 
 oauth2_scheme = OAuth2PasswordBearerWithCookie(tokenUrl="/api/user/login")
 
+# Number of rows that are fetched at once when streaming large results
+STREAM_BATCH_SIZE = 1000
+
+
+class ScheduleEntry(NamedTuple):
+    """
+    Columns of a website that are needed to schedule its logins.
+    """
+
+    id: int
+    paused: bool
+    next_schedule: Optional[datetime]
+    expiration_interval: Optional[timedelta]
+
+
+class ExpirationEntry(NamedTuple):
+    """
+    Columns of a website that are needed to determine when its account expires.
+    """
+
+    id: int
+    user: int
+    paused: bool
+    added_at: datetime
+    expiration_interval: timedelta
+    last_successful_login: Optional[datetime]
+
+    @property
+    def deadline(self) -> datetime:
+        """
+        Time the account expires without another successful login. Websites that never had a successful login
+        count from the time they were added.
+        """
+        last_login = self.last_successful_login or self.added_at
+        return last_login.replace(tzinfo=timezone.utc) + self.expiration_interval
+
 
 class DataBase:
     """--------------------------- USER ACCESS ---------------------------"""
@@ -127,6 +163,11 @@ class DataBase:
             return website
         raise NotFoundException(f"Website {website_id} not found")
 
+    @staticmethod
+    def get_website_ids(current_user: User) -> Set[int]:
+        session = db_session.get()
+        return set(session.scalars(select(Website.id).where(Website.user == current_user.id)))
+
     @staticmethod
     def add_website(website: Website, current_user: User) -> Website:
         session = db_session.get()
@@ -354,6 +395,63 @@ class DataBase:
             )
             return session.scalars(stmt).all()
 
+    @staticmethod
+    def get_schedule_entries_all_users() -> Iterator[ScheduleEntry]:
+        """
+        Streams the scheduling columns of all websites in one query.
+        """
+        with get_db_session() as session:
+            stmt = select(
+                Website.id,
+                Website.paused,
+                Website.next_schedule,
+                Website.expiration_interval,
+            ).execution_options(yield_per=STREAM_BATCH_SIZE)
+            for row in session.execute(stmt):
+                yield ScheduleEntry(*row)
+
+    @staticmethod
+    def get_expiration_entries_all_users() -> Iterator[ExpirationEntry]:
+        """
+        Streams the expiration columns of all websites with an expiration interval in one query.
+        """
+        with get_db_session() as session:
+            stmt = DataBase._select_expiration_entries().execution_options(
+                yield_per=STREAM_BATCH_SIZE
+            )
+            for row in session.execute(stmt):
+                yield ExpirationEntry(*row)
+
+    @staticmethod
+    def get_expiration_entry(website_id: int) -> ExpirationEntry | None:
+        """
+        Returns the expiration columns of a website. None if the website has no expiration interval.
+        """
+        with get_db_session() as session:
+            stmt = DataBase._select_expiration_entries().where(Website.id == website_id)
+            row = session.execute(stmt).first()
+            return ExpirationEntry(*row) if row is not None else None
+
+    @staticmethod
+    def _select_expiration_entries():
+        # Correlated, so only the history of the selected websites is read through the index on website
+        last_successful_login = (
+            select(func.max(ActionHistory.execution_started))
+            .where(
+                ActionHistory.website == Website.id,
+                ActionHistory.execution_status == ActionStatusCode.SUCCESS,
+            )
+            .scalar_subquery()
+        )
+        return select(
+            Website.id,
+            Website.user,
+            Website.paused,
+            Website.added_at,
+            Website.expiration_interval,
+            last_successful_login,
+        ).where(Website.expiration_interval.is_not(None))
+
     @staticmethod
     def get_website_all_users(website_id: int) -> Website:
         with get_db_session() as session:
@@ -395,7 +493,10 @@ class DataBase:
             return website_id
 
     @staticmethod
-    def set_next_schedule(website_id: int):
+    def set_next_schedule(website_id: int, retry_after: timedelta | None = None):
+        """
+        :param retry_after: Schedules the website at the latest after this duration, e.g. to retry a failed login.
+        """
         with get_db_session() as session:
             website = (
                 session.query(Website)
@@ -412,12 +513,19 @@ class DataBase:
                 website.next_schedule = (
                     website.action_interval.get_random_action_datetime()
                 )
+                if retry_after is not None:
+                    retry_schedule = datetime.now(timezone.utc).replace(tzinfo=None) + retry_after
+                    website.next_schedule = min(
+                        website.next_schedule.replace(tzinfo=None), retry_schedule
+                    )
 
             session.commit()
 
     @staticmethod
     def unexpected_execution_failure(
-        website_id: int, execution_started: datetime
+        website_id: int,
+        execution_started: datetime,
+        failed_details: ActionFailedDetails = ActionFailedDetails.UNKNOWN_EXECUTION_ERROR,
     ) -> List[int]:
         with get_db_session() as session:
             running_action_histories = (
@@ -432,9 +540,7 @@ class DataBase:
             for action_history in running_action_histories:
                 action_history.execution_status = ActionStatusCode.FAILED
                 action_history.execution_ended = datetime.now(timezone.utc)
-                action_history.failed_details = (
-                    ActionFailedDetails.UNKNOWN_EXECUTION_ERROR
-                )
+                action_history.failed_details = failed_details
                 action_history_ids.append(action_history.id)
             if len(running_action_histories) == 0:
                 created_action_history = DataBase.add_action_history(
@@ -443,7 +549,7 @@ class DataBase:
                         execution_status=ActionStatusCode.FAILED,
                         execution_started=execution_started,
                         execution_ended=datetime.now(timezone.utc),
-                        failed_details=ActionFailedDetails.UNKNOWN_EXECUTION_ERROR,
+                        failed_details=failed_details,
                     ),
                 )
                 action_history_ids.append(created_action_history.id)
@@ -15,7 +15,7 @@ from sqlalchemy.orm import (
     sessionmaker,
     Session,
 )
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, false
 from enum import Enum
 from werkzeug.security import generate_password_hash, check_password_hash
 from utils.security import get_database_key, get_database_pepper
@@ -127,6 +127,36 @@ class ActionFailedDetails(Enum):
     TEXT_FIELD_NOT_FOUND = "TEXT_FIELD_NOT_FOUND"
     SUCCESS_URL_DID_NOT_MATCH = "SUCCESS_URL_DID_NOT_MATCH"
     UNKNOWN_EXECUTION_ERROR = "UNKNOWN_EXECUTION_ERROR"
+    EXECUTION_TIMEOUT = "EXECUTION_TIMEOUT"
+    SITE_UNREACHABLE = "SITE_UNREACHABLE"
+    WAIT_TIMEOUT = "WAIT_TIMEOUT"
+
+
+class ExecutionEngine(Enum):
+    # Logs in with a browser
+    BROWSER = "BROWSER"
+    # Tries to submit the login form with plain HTTP requests first and falls back to the browser
+    HTTP = "HTTP"
+
+
+class BrowserProfileMode(Enum):
+    # Every login starts with a new temporary profile
+    NONE = "NONE"
+    # The HTTP cache and service worker caches are kept between the logins
+    CACHE = "CACHE"
+    # The cookies and site data are kept as well
+    CACHE_AND_COOKIES = "CACHE_AND_COOKIES"
+
+
+class SuccessUrlMatch(Enum):
+    # The URL has to be the success URL, a trailing slash is ignored
+    EXACT = "EXACT"
+    # The URL has to start with the success URL
+    PREFIX = "PREFIX"
+    # The success URL is a glob pattern, e.g. https://example.com/*/dashboard
+    GLOB = "GLOB"
+    # The success URL is a regular expression the whole URL has to match
+    REGEX = "REGEX"
 
 
 class User(Base):
@@ -185,6 +215,15 @@ class Website(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     url: Mapped[str] = mapped_column(nullable=False)
     success_url: Mapped[str] = mapped_column(nullable=False)
+    success_url_match: Mapped[SuccessUrlMatch] = mapped_column(
+        nullable=False,
+        default=SuccessUrlMatch.EXACT,
+        server_default=SuccessUrlMatch.EXACT.value,
+    )
+    # XPath of an element that is only present after a successful login
+    success_selector: Mapped[Optional[str]] = mapped_column(nullable=True)
+    # Name of a cookie that is only set after a successful login
+    success_cookie: Mapped[Optional[str]] = mapped_column(nullable=True)
     name: Mapped[str] = mapped_column(nullable=False)
     username: Mapped[str] = mapped_column(nullable=False)
     password: Mapped[str] = mapped_column(nullable=False)
@@ -194,6 +233,20 @@ class Website(Base):
     paused: Mapped[bool] = mapped_column(nullable=False)
     expiration_interval: Mapped[Optional[timedelta]] = mapped_column(nullable=True)
     next_schedule: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    execution_engine: Mapped[ExecutionEngine] = mapped_column(
+        nullable=False,
+        default=ExecutionEngine.BROWSER,
+        server_default=ExecutionEngine.BROWSER.value,
+    )
+    browser_profile: Mapped[BrowserProfileMode] = mapped_column(
+        nullable=False,
+        default=BrowserProfileMode.NONE,
+        server_default=BrowserProfileMode.NONE.value,
+    )
+    # Blocks images, fonts, media and trackers during the login
+    block_resources: Mapped[bool] = mapped_column(
+        nullable=False, default=False, server_default=false()
+    )
 
     user: Mapped[int] = mapped_column(ForeignKey("user.id"))
 
@@ -213,6 +266,10 @@ class Website(Base):
 
 class ActionHistory(Base):
     __tablename__ = "action_history"
+    # The last successful login of a website is looked up whenever its login is scheduled
+    __table_args__ = (
+        Index("ix_action_history_website_execution_started", "website", "execution_started"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     execution_started: Mapped[datetime] = mapped_column(nullable=False)
@@ -3,10 +3,11 @@ from sqlalchemy.orm.attributes import get_history
 from dataAccess.database.database import Website, ActionHistory, Notification
 from execution.notifications.notification_manager import NotificationManager
 from execution.scheduler import Scheduler
+from execution.scheduler_client import SchedulerClient
 from sqlalchemy.orm import object_session
 
 
-def register_database_events(scheduler: Scheduler, notification_manager: NotificationManager):
+def register_database_events(scheduler: Scheduler | SchedulerClient, notification_manager: NotificationManager):
     """------------------- Website -------------------"""
 
     @listens_for(Website, "after_insert")
@@ -0,0 +1,53 @@
+from fastapi import FastAPI, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from dataAccess.data_access import DataAccess
+from dataAccess.database.database import get_db, db_session
+from endpoints.models.scheduler_model import GetSchedulerMetrics, GetSchedulerStatus
+from execution.scheduler import Scheduler
+from execution.scheduler_client import SchedulerClient
+from utils.exceptions import SchedulerUnavailableException
+
+
+def register_scheduler_endpoints(app: FastAPI, scheduler: Scheduler | SchedulerClient):
+    # ---------------------------- GET ----------------------------
+    @app.get(
+        "/api/scheduler/status",
+        response_model=GetSchedulerStatus,
+        tags=["Scheduler"],
+    )
+    def get_scheduler_status(
+        current_user=Depends(DataAccess.get_current_user),
+        session: Session = Depends(get_db),
+    ):
+        db_session.set(session)
+        try:
+            return GetSchedulerStatus.from_status(
+                scheduler.get_status(),
+                scheduler.get_danger_window_websites(),
+                current_user.id,
+                DataAccess.get_website_ids(current_user),
+            )
+        except SchedulerUnavailableException as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=e.message
+            )
+
+    @app.get(
+        "/api/scheduler/metrics",
+        response_model=GetSchedulerMetrics,
+        tags=["Scheduler"],
+    )
+    def get_scheduler_metrics(
+        current_user=Depends(DataAccess.get_current_user),
+        session: Session = Depends(get_db),
+    ):
+        db_session.set(session)
+        try:
+            return GetSchedulerMetrics.from_snapshot(
+                scheduler.get_metrics(), DataAccess.get_website_ids(current_user)
+            )
+        except SchedulerUnavailableException as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=e.message
+            )
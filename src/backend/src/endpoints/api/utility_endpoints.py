@@ -1,14 +1,16 @@
 import os
 from fastapi import FastAPI, Depends, HTTPException
 from starlette import status
-from starlette.responses import FileResponse
+from starlette.responses import FileResponse, JSONResponse
 from sqlalchemy.orm import Session
 
 from dataAccess.data_access import DataAccess
 from dataAccess.database.database import get_db, db_session
+from execution.scheduler import Scheduler
+from execution.scheduler_client import SchedulerClient
 
 
-def register_utility_endpoints(app: FastAPI):
+def register_utility_endpoints(app: FastAPI, scheduler: Scheduler | SchedulerClient):
     @app.get("/api/screenshot/{screenshot_id}", tags=["Other"])
     def get_screenshot(
         screenshot_id: str,
@@ -35,6 +37,12 @@ def register_utility_endpoints(app: FastAPI):
 
     @app.get("/api/health", tags=["Other"])
     async def health_check():
+        # Without the scheduler worker no login is executed, so the container has to be reported as unhealthy
+        if isinstance(scheduler, SchedulerClient) and not scheduler.connected:
+            return JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"status": "unhealthy", "detail": "Scheduler worker is not reachable"},
+            )
         return {"status": "healthy"}
 
     @app.post("/api/trigger_login/{website_id}", tags=["Other"])
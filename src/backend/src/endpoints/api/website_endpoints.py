@@ -1,5 +1,5 @@
 from typing import Optional
-from fastapi import FastAPI, Depends, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, status
 from fastapi_filters import SortingValues, create_sorting
 from fastapi_pagination import Page
 from sqlalchemy.orm import Session
@@ -12,6 +12,7 @@ from endpoints.models.website_model import (
     CheckCustomLoginScript,
     CheckCustomLoginScriptResponse,
 )
+from utils.exceptions import RequestValidationError
 
 
 def register_website_endpoints(app: FastAPI, data_access: DataAccess):
@@ -57,7 +58,12 @@ def register_website_endpoints(app: FastAPI, data_access: DataAccess):
         session: Session = Depends(get_db),
     ):
         db_session.set(session)
-        data_access.edit_website(website_id, website_request, current_user)
+        try:
+            data_access.edit_website(website_id, website_request, current_user)
+        except RequestValidationError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=e.message
+            )
 
     # ---------------------------- DELETE ----------------------------
     @app.delete("/api/websites/{website_id}", tags=["Websites"])
@@ -0,0 +1,174 @@
+from typing import Dict, List, Optional, Set
+from pydantic import BaseModel
+
+from execution.login.dom_interaction.browser_pool import BrowserPoolStats
+from execution.login_queue import WaitTimeStats
+from execution.login_worker_pool import LoginWorkerPoolStatus, LoginWorkerStatus
+from execution.scheduler_metrics import CaptchaMetricsSnapshot, PercentileStats, SchedulerMetricsSnapshot
+
+
+class GetLoginWorkerStatus(BaseModel):
+    worker_id: int
+    busy: bool
+    website_id: int | None
+    jobs_executed: int
+    utilisation: float
+
+    @staticmethod
+    def from_status(status: LoginWorkerStatus, user_website_ids: Set[int]) -> "GetLoginWorkerStatus":
+        """
+        The website of the job is only included if it belongs to the user.
+        """
+        return GetLoginWorkerStatus(
+            worker_id=status.worker_id,
+            busy=status.busy,
+            website_id=status.website_id if status.website_id in user_website_ids else None,
+            jobs_executed=status.jobs_executed,
+            utilisation=round(status.utilisation, 4),
+        )
+
+
+class GetWaitTimeStats(BaseModel):
+    jobs: int
+    average_seconds: float
+    max_seconds: float
+
+    @staticmethod
+    def from_stats(stats: WaitTimeStats) -> "GetWaitTimeStats":
+        return GetWaitTimeStats(
+            jobs=stats.jobs,
+            average_seconds=round(stats.average_seconds, 3),
+            max_seconds=round(stats.max_seconds, 3),
+        )
+
+
+class GetBrowserPoolStats(BaseModel):
+    size: int
+    idle: int
+    busy: int
+    launched: int
+    recycled: int
+    prewarmed: int
+    prewarm_hits: int
+    suspended: bool
+
+    @staticmethod
+    def from_stats(stats: BrowserPoolStats | None) -> Optional["GetBrowserPoolStats"]:
+        if stats is None:
+            return None
+        return GetBrowserPoolStats(
+            size=stats.size,
+            idle=stats.idle,
+            busy=stats.busy,
+            launched=stats.launched,
+            recycled=stats.recycled,
+            prewarmed=stats.prewarmed,
+            prewarm_hits=stats.prewarm_hits,
+            suspended=stats.suspended,
+        )
+
+
+class GetSchedulerStatus(BaseModel):
+    queue_depth: int
+    throttled_jobs: int
+    timed_out_jobs: int
+    workers: List[GetLoginWorkerStatus]
+    user_wait_time: Optional[GetWaitTimeStats]
+    browser_pool: Optional[GetBrowserPoolStats]
+    danger_window_websites: int
+    user_danger_window_websites: int
+
+    @staticmethod
+    def from_status(
+        status: LoginWorkerPoolStatus,
+        danger_window_websites: Dict[int, int],
+        user_id: int,
+        user_website_ids: Set[int],
+    ) -> "GetSchedulerStatus":
+        """
+        Creates the status for a user. Only the wait times and websites of the user itself are included.
+        """
+        user_wait_time = status.wait_times.get(user_id)
+        return GetSchedulerStatus(
+            queue_depth=status.queue_depth,
+            throttled_jobs=status.throttled_jobs,
+            timed_out_jobs=status.timed_out_jobs,
+            workers=[GetLoginWorkerStatus.from_status(worker, user_website_ids) for worker in status.workers],
+            user_wait_time=(
+                GetWaitTimeStats.from_stats(user_wait_time)
+                if user_wait_time is not None
+                else None
+            ),
+            browser_pool=GetBrowserPoolStats.from_stats(status.browser_pool),
+            danger_window_websites=sum(danger_window_websites.values()),
+            user_danger_window_websites=danger_window_websites.get(user_id, 0),
+        )
+
+
+class GetPercentileStats(BaseModel):
+    samples: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+    @staticmethod
+    def from_stats(stats: PercentileStats | None) -> Optional["GetPercentileStats"]:
+        if stats is None:
+            return None
+        return GetPercentileStats(
+            samples=stats.samples,
+            p50=round(stats.p50, 3),
+            p90=round(stats.p90, 3),
+            p99=round(stats.p99, 3),
+            max=round(stats.max, 3),
+        )
+
+
+class GetCaptchaMetrics(BaseModel):
+    probes: int
+    hits: int
+    solve_seconds: Optional[GetPercentileStats]
+
+    @staticmethod
+    def from_snapshot(snapshot: CaptchaMetricsSnapshot) -> "GetCaptchaMetrics":
+        return GetCaptchaMetrics(
+            probes=snapshot.probes,
+            hits=snapshot.hits,
+            solve_seconds=GetPercentileStats.from_stats(snapshot.solve_seconds),
+        )
+
+
+class GetSchedulerMetrics(BaseModel):
+    start_lag_seconds: Optional[GetPercentileStats]
+    queue_depth: Optional[GetPercentileStats]
+    duration_seconds: Optional[GetPercentileStats]
+    misfires: int
+    browser_recycles: Dict[str, int]
+    blocked_requests: int
+    loaded_bytes_with_blocking: Optional[GetPercentileStats]
+    login_step_seconds: Dict[str, GetPercentileStats]
+    captchas: Dict[int, GetCaptchaMetrics]
+
+    @staticmethod
+    def from_snapshot(snapshot: SchedulerMetricsSnapshot, user_website_ids: Set[int]) -> "GetSchedulerMetrics":
+        """
+        Creates the metrics for a user. Only the captchas of the websites of the user are included.
+        """
+        return GetSchedulerMetrics(
+            start_lag_seconds=GetPercentileStats.from_stats(snapshot.start_lag_seconds),
+            queue_depth=GetPercentileStats.from_stats(snapshot.queue_depth),
+            duration_seconds=GetPercentileStats.from_stats(snapshot.duration_seconds),
+            misfires=snapshot.misfires,
+            browser_recycles=snapshot.browser_recycles,
+            blocked_requests=snapshot.blocked_requests,
+            loaded_bytes_with_blocking=GetPercentileStats.from_stats(snapshot.loaded_bytes_with_blocking),
+            login_step_seconds={
+                step: GetPercentileStats.from_stats(stats) for step, stats in snapshot.login_step_seconds.items()
+            },
+            captchas={
+                website_id: GetCaptchaMetrics.from_snapshot(captchas)
+                for website_id, captchas in snapshot.captchas.items()
+                if website_id in user_website_ids
+            },
+        )
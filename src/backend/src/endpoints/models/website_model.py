@@ -1,7 +1,8 @@
+import re
 from datetime import timedelta, datetime, timezone
 from typing import Optional
-from pydantic import BaseModel
-from dataAccess.database.database import Website
+from pydantic import BaseModel, model_validator
+from dataAccess.database.database import BrowserProfileMode, ExecutionEngine, SuccessUrlMatch, Website
 from utils.utils import to_utc_time
 from endpoints.decorators.request_validator import (
     GetRequestBaseModel,
@@ -29,6 +30,18 @@ class DateTime(BaseModel):
         )
 
 
+def validate_success_url(success_url: str | None, url_match: SuccessUrlMatch | None):
+    """
+    :raises ValueError: If the success URL is not a valid pattern for the match type.
+    """
+    if success_url is None or url_match != SuccessUrlMatch.REGEX:
+        return
+    try:
+        re.compile(success_url)
+    except re.error as e:
+        raise ValueError(f"Success URL is not a valid regular expression: {e}")
+
+
 class AddWebsite(PostRequestBaseModel):
     url: str
     success_url: str
@@ -39,8 +52,19 @@ class AddWebsite(PostRequestBaseModel):
     paused: Optional[bool] = None
     expiration_interval_minutes: Optional[int] = None
     custom_login_script: Optional[str] = None
+    execution_engine: Optional[ExecutionEngine] = None
+    block_resources: Optional[bool] = None
+    browser_profile: Optional[BrowserProfileMode] = None
+    success_url_match: Optional[SuccessUrlMatch] = None
+    success_selector: Optional[str] = None
+    success_cookie: Optional[str] = None
     action_interval: AddActionInterval
 
+    @model_validator(mode="after")
+    def check_success_url(self) -> "AddWebsite":
+        validate_success_url(self.success_url, self.success_url_match)
+        return self
+
     def to_sql_model(self) -> Website:
         expiration_interval = None
         if self.expiration_interval_minutes is not None:
@@ -56,6 +80,24 @@ class AddWebsite(PostRequestBaseModel):
             paused=self.paused if self.paused is not None else False,
             added_at=datetime.now(timezone.utc),
             expiration_interval=expiration_interval,
+            execution_engine=(
+                self.execution_engine
+                if self.execution_engine is not None
+                else ExecutionEngine.BROWSER
+            ),
+            block_resources=self.block_resources if self.block_resources is not None else False,
+            browser_profile=(
+                self.browser_profile
+                if self.browser_profile is not None
+                else BrowserProfileMode.NONE
+            ),
+            success_url_match=(
+                self.success_url_match
+                if self.success_url_match is not None
+                else SuccessUrlMatch.EXACT
+            ),
+            success_selector=self.success_selector,
+            success_cookie=self.success_cookie,
         )
 
         website.action_interval = self.action_interval.to_sql_model()
@@ -72,8 +114,19 @@ class EditWebsite(BaseModel):
     paused: Optional[bool] = None
     expiration_interval_minutes: Optional[int] = None
     custom_login_script: Optional[str] = None
+    execution_engine: Optional[ExecutionEngine] = None
+    block_resources: Optional[bool] = None
+    browser_profile: Optional[BrowserProfileMode] = None
+    success_url_match: Optional[SuccessUrlMatch] = None
+    success_selector: Optional[str] = None
+    success_cookie: Optional[str] = None
     action_interval: Optional[EditActionInterval] = None
 
+    @model_validator(mode="after")
+    def check_success_url(self) -> "EditWebsite":
+        validate_success_url(self.success_url, self.success_url_match)
+        return self
+
     def edit_existing_model(self, existing_website: Website) -> Website:
         if self.url is not None:
             existing_website.url = self.url
@@ -96,6 +149,19 @@ class EditWebsite(BaseModel):
         else:
             existing_website.expiration_interval = None
         existing_website.custom_login_script = self.custom_login_script
+        if self.execution_engine is not None:
+            existing_website.execution_engine = self.execution_engine
+        if self.block_resources is not None:
+            existing_website.block_resources = self.block_resources
+        if self.browser_profile is not None:
+            existing_website.browser_profile = self.browser_profile
+        if self.success_url_match is not None:
+            existing_website.success_url_match = self.success_url_match
+        # Only the fields the client sent, null clears them but edits like pausing leave them untouched
+        if "success_selector" in self.model_fields_set:
+            existing_website.success_selector = self.success_selector
+        if "success_cookie" in self.model_fields_set:
+            existing_website.success_cookie = self.success_cookie
         if self.action_interval is not None:
             existing_website.action_interval = self.action_interval.edit_existing_model(
                 existing_website.action_interval
@@ -122,6 +188,12 @@ class GetWebsite(GetRequestBaseModel):
     paused: bool
     expiration_interval_minutes: Optional[int] = None
     custom_login_script: Optional[str] = None
+    execution_engine: ExecutionEngine
+    block_resources: bool
+    browser_profile: BrowserProfileMode
+    success_url_match: SuccessUrlMatch
+    success_selector: Optional[str] = None
+    success_cookie: Optional[str] = None
     action_interval: Optional[GetActionInterval] = None
     next_schedule: Optional[datetime] = None
     last_login_attempt: Optional[datetime] = None
@@ -154,6 +226,12 @@ class GetWebsite(GetRequestBaseModel):
             paused=website.paused,
             expiration_interval_minutes=expiration_interval_minutes,
             custom_login_script=website.custom_login_script,
+            execution_engine=website.execution_engine,
+            block_resources=website.block_resources,
+            browser_profile=website.browser_profile,
+            success_url_match=website.success_url_match,
+            success_selector=website.success_selector,
+            success_cookie=website.success_cookie,
             action_interval=(
                 GetActionInterval.from_sql_model(website.action_interval)
                 if website.action_interval
@@ -0,0 +1,134 @@
+import os
+from typing import Dict
+
+from utils.utils import get_env_bool, get_env_int
+
+# Number of login jobs that are executed in parallel. Each worker runs its own browser.
+LOGIN_WORKERS = max(1, get_env_int("LOGIN_WORKERS", 1))
+
+# Number of browsers that are kept running between logins. 0 starts a new browser for every login.
+BROWSER_POOL_SIZE = max(0, get_env_int("BROWSER_POOL_SIZE", 0))
+
+# Browsers for logins that are due within this many seconds are launched in advance, so the login does not wait
+# for its browser to start. The website is only opened by the login itself. 0 disables prewarming.
+BROWSER_PREWARM_SECONDS = max(0, get_env_int("BROWSER_PREWARM_SECONDS", 0))
+
+# Seconds between two checks for logins that are due soon.
+BROWSER_PREWARM_INTERVAL_SECONDS = 10
+
+# Browsers and virtual displays that are kept running are closed while the next login is due in more than
+# this many minutes. They are started again this many minutes before the next login. 0 keeps them running.
+IDLE_TEARDOWN_MINUTES = max(0, get_env_int("IDLE_TEARDOWN_MINUTES", 30))
+
+# Seconds between two checks whether the kept browsers can be closed or have to be started again.
+IDLE_CHECK_INTERVAL_SECONDS = 60
+
+# Every browser gets its own virtual Xvfb display, so concurrent logins do not share one screen and mouse.
+# Enabled by default when more than one login worker runs. Displays start at VIRTUAL_DISPLAY_START.
+VIRTUAL_DISPLAYS = get_env_bool("VIRTUAL_DISPLAYS", LOGIN_WORKERS > 1)
+VIRTUAL_DISPLAY_START = max(0, get_env_int("VIRTUAL_DISPLAY_START", 100))
+
+# Browsers are replaced between two logins after this many logins or when they use more resident memory
+# than this many MB, including all renderer processes. 0 disables the limit.
+BROWSER_RECYCLE_JOBS = max(0, get_env_int("BROWSER_RECYCLE_JOBS", 50))
+BROWSER_RECYCLE_MEMORY_MB = max(0, get_env_int("BROWSER_RECYCLE_MEMORY_MB", 1536))
+
+# "browser" runs every login in a dedicated browser, "context" runs the logins in isolated browser contexts
+# of one shared browser. A website whose login fails with an execution error in a context is tried in a dedicated
+# browser next, if that login succeeds the website keeps using a dedicated browser for BROWSER_CONTEXT_FALLBACK_HOURS.
+BROWSER_ISOLATION_BROWSER = "browser"
+BROWSER_ISOLATION_CONTEXT = "context"
+BROWSER_ISOLATION = os.getenv("BROWSER_ISOLATION", BROWSER_ISOLATION_BROWSER).strip().lower()
+if BROWSER_ISOLATION not in (BROWSER_ISOLATION_BROWSER, BROWSER_ISOLATION_CONTEXT):
+    print(f"Invalid BROWSER_ISOLATION {BROWSER_ISOLATION}, using {BROWSER_ISOLATION_BROWSER}")
+    BROWSER_ISOLATION = BROWSER_ISOLATION_BROWSER
+BROWSER_CONTEXT_FALLBACK_HOURS = max(1, get_env_int("BROWSER_CONTEXT_FALLBACK_HOURS", 24))
+
+# Checks with DNS, TCP and, for HTTPS, a TLS handshake whether a website is reachable before its browser is launched.
+# Unreachable websites fail fast and are retried after SITE_UNREACHABLE_RETRY_MINUTES, unless they are due earlier.
+PREFLIGHT_CHECK = get_env_bool("PREFLIGHT_CHECK", True)
+SITE_UNREACHABLE_RETRY_MINUTES = max(1, get_env_int("SITE_UNREACHABLE_RETRY_MINUTES", 30))
+
+# Resource types that are blocked during the logins of websites with resource blocking:
+# image, font, media and tracker (analytics and ad scripts).
+BLOCKED_RESOURCE_TYPES = [
+    entry.strip().lower()
+    for entry in os.getenv("BLOCKED_RESOURCE_TYPES", "image,font,media,tracker").split(",")
+    if entry.strip()
+]
+# URL patterns that are never blocked, e.g. resources a website breaks without. Captcha providers are always allowed.
+RESOURCE_BLOCKING_ALLOWLIST = [
+    entry.strip() for entry in os.getenv("RESOURCE_BLOCKING_ALLOWLIST", "").split(",") if entry.strip()
+]
+
+# Websites with a persistent browser profile keep their profile in this directory. The profiles of all websites
+# share a disk budget of BROWSER_PROFILES_MAX_MB, the least recently used profiles are removed when it is exceeded.
+BROWSER_PROFILES_DIR = os.getenv(
+    "BROWSER_PROFILES_DIR",
+    "/config/profiles" if os.getenv("RUN_MODE") == "production" else "../config/profiles",
+)
+BROWSER_PROFILES_MAX_MB = max(0, get_env_int("BROWSER_PROFILES_MAX_MB", 2048))
+# Size limit of the HTTP cache of a single profile. 0 uses the default of Chrome.
+BROWSER_PROFILE_CACHE_MB = max(0, get_env_int("BROWSER_PROFILE_CACHE_MB", 200))
+BROWSER_PROFILES_GC_INTERVAL_MINUTES = 60
+
+# Hard wall-clock budget of a single login. Logins that take longer are aborted and their browser is killed.
+# 0 disables the watchdog.
+LOGIN_TIMEOUT_SECONDS = max(0, get_env_int("LOGIN_TIMEOUT_SECONDS", 300))
+
+# Maximum number of logins that run against the same host at the same time.
+LOGIN_MAX_PER_HOST = max(1, get_env_int("LOGIN_MAX_PER_HOST", 1))
+
+# Minimum number of seconds between the start of two logins to the same host.
+LOGIN_HOST_MIN_INTERVAL_SECONDS = max(0, get_env_int("LOGIN_HOST_MIN_INTERVAL_SECONDS", 10))
+
+# Maximum number of logins of the same user that run at the same time. 0 disables the limit.
+LOGIN_MAX_PER_USER = max(0, get_env_int("LOGIN_MAX_PER_USER", 0))
+
+
+def _parse_user_weights(value: str | None) -> Dict[int, float]:
+    """
+    Parses fair share weights in the format "<user_id>:<weight>,<user_id>:<weight>".
+    """
+    weights = {}
+    if not value:
+        return weights
+    for entry in value.split(","):
+        try:
+            user_id, weight = entry.split(":")
+            user_id, weight = int(user_id), float(weight)
+        except ValueError:
+            print(f"Invalid user weight {entry} in LOGIN_USER_WEIGHTS")
+            continue
+        if weight <= 0:
+            print(f"User weight {entry} in LOGIN_USER_WEIGHTS must be positive")
+            continue
+        weights[user_id] = weight
+    return weights
+
+# Share of the login workers per user id. Users without weight have the weight 1.
+LOGIN_USER_WEIGHTS = _parse_user_weights(os.getenv("LOGIN_USER_WEIGHTS"))
+
+# Logins of websites whose account expires within this window run before all other queued logins.
+EXPIRATION_DANGER_WINDOW_HOURS = max(0, get_env_int("EXPIRATION_DANGER_WINDOW_HOURS", 24))
+
+# Overdue logins found at startup are spread over this window instead of starting all at once.
+CATCH_UP_WINDOW_MINUTES = max(0, get_env_int("CATCH_UP_WINDOW_MINUTES", 30))
+
+# Rough duration of a single login, used to project how long a catch-up takes.
+ESTIMATED_LOGIN_SECONDS = 60
+
+# Persist scheduled jobs in the database, so only changed websites are scheduled again on startup.
+SCHEDULER_PERSISTENT_JOBS = get_env_bool("SCHEDULER_PERSISTENT_JOBS", True)
+
+# "embedded" runs the scheduler inside the API process, "worker" talks to a separate scheduler worker process
+# started with "python -m execution.scheduler_worker".
+SCHEDULER_MODE_EMBEDDED = "embedded"
+SCHEDULER_MODE_WORKER = "worker"
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", SCHEDULER_MODE_EMBEDDED).strip().lower()
+if SCHEDULER_MODE not in (SCHEDULER_MODE_EMBEDDED, SCHEDULER_MODE_WORKER):
+    print(f"Invalid SCHEDULER_MODE {SCHEDULER_MODE}, using {SCHEDULER_MODE_EMBEDDED}")
+    SCHEDULER_MODE = SCHEDULER_MODE_EMBEDDED
+
+# Unix socket the API process uses to talk to the scheduler worker process.
+SCHEDULER_WORKER_SOCKET = os.getenv("SCHEDULER_WORKER_SOCKET", "/tmp/enterr-scheduler.sock")
@@ -15,9 +15,24 @@ class LoginStatusCode(Enum):
     TEXT_FIELD_NOT_FOUND = ActionFailedDetails.TEXT_FIELD_NOT_FOUND
     SUCCESS_URL_DID_NOT_MATCH = ActionFailedDetails.SUCCESS_URL_DID_NOT_MATCH
     UNKNOWN_EXECUTION_ERROR = ActionFailedDetails.UNKNOWN_EXECUTION_ERROR
+    EXECUTION_TIMEOUT = ActionFailedDetails.EXECUTION_TIMEOUT
+    SITE_UNREACHABLE = ActionFailedDetails.SITE_UNREACHABLE
+    WAIT_TIMEOUT = ActionFailedDetails.WAIT_TIMEOUT
     FAILED = ActionStatusCode.FAILED
 
 
 TIMEOUT = 30
+# Seconds the page after the submit may take to reach the success url before the success url is opened,
+# the opened success url then has TIMEOUT seconds on its own
+POST_SUBMIT_TIMEOUT = 10
+# Captchas that are solved while waiting for the success url
+MAX_CAPTCHA_ATTEMPTS = 3
+# Seconds the selector and cookie of the success criteria may take to appear once the url matched
+SUCCESS_CONDITIONS_TIMEOUT = 5
+# Upper bounds of the waits between the steps of a login script in milliseconds
+ELEMENT_TIMEOUT_MS = 5000
+VALUE_COMMIT_TIMEOUT_MS = 1000
+# Time without requests after which the network counts as idle, the same as the networkIdle event of Chrome
+NETWORK_IDLE_QUIET_MS = 500
 
 type CustomFailedDetailsMessage = str | None
\ No newline at end of file
@@ -1,66 +1,149 @@
-from execution.login.constants import LoginStatusCode
+import time
+from typing import Callable
+
+from dataAccess.database.database import SuccessUrlMatch
+from execution.login.constants import (
+    LoginStatusCode,
+    ELEMENT_TIMEOUT_MS,
+    VALUE_COMMIT_TIMEOUT_MS,
+    NETWORK_IDLE_QUIET_MS,
+)
 from execution.login.custom_login.custom_login_methods_interfaces import CustomLoginMethodsInterface
 from execution.login.dom_interaction.interfaces.dom_interaction_interface import DomInteractionInterface
 from execution.login.find_form_automatically import XPaths
+from execution.login.success_criteria import get_url_matcher
 from utils.exceptions import ScriptExecutionStopped
 
+type StepCallback = Callable[[str, float], None]
+
 
 class CustomLoginMethodsDriver(CustomLoginMethodsInterface):
-    def __init__(self, driver: DomInteractionInterface, x_paths: XPaths, username: str, password: str):
+    """
+    Executes the steps of a login script with the driver. Instead of pausing for a fixed time, each step waits
+    until its element can be interacted with and a filled in value is committed to the field. Each wait has
+    an upper bound. Clicks do not wait for their requests, the next step waits for its element instead and
+    scripts that depend on the page being loaded use waitForNetworkIdle.
+    :param on_step: Is called with the name of the step and the seconds it took, including its waits.
+    """
+
+    def __init__(
+        self,
+        driver: DomInteractionInterface,
+        x_paths: XPaths,
+        username: str,
+        password: str,
+        on_step: StepCallback | None = None,
+    ):
         self._driver = driver
         self._x_paths = x_paths
         self._username = username
         self._password = password
+        self._on_step = on_step
 
     def click_submit_button(self, xpath=None):
+        started = time.perf_counter()
         if xpath is None:
             xpath = self._x_paths.submit_button if self._x_paths is not None else None
             if xpath is None:
                 raise ScriptExecutionStopped(LoginStatusCode.SUBMIT_BUTTON_NOT_FOUND, None)
-        try:
-            self._driver.click_button(xpath)
-        except Exception:
-            raise ScriptExecutionStopped(LoginStatusCode.SUBMIT_BUTTON_NOT_FOUND, f"XPath \"{xpath}\" not found on page.")
-        self._driver.wait(500)
+        self._click(xpath, LoginStatusCode.SUBMIT_BUTTON_NOT_FOUND)
+        self._record_step("clickSubmitButton", started)
 
     def fill_username(self, xpath=None):
+        started = time.perf_counter()
         if xpath is None:
             xpath = self._x_paths.username if self._x_paths is not None else None
             if xpath is None:
                 raise ScriptExecutionStopped(LoginStatusCode.USERNAME_FIELD_NOT_FOUND, None)
-        try:
-            self._driver.fill_text(xpath, self._username)
-        except Exception:
-            raise ScriptExecutionStopped(LoginStatusCode.USERNAME_FIELD_NOT_FOUND, f"XPath \"{xpath}\" not found on page.")
-        self._driver.wait(500)
+        self._fill(xpath, self._username, LoginStatusCode.USERNAME_FIELD_NOT_FOUND)
+        self._record_step("fillUsername", started)
 
     def fill_password(self, xpath=None):
+        started = time.perf_counter()
         if xpath is None:
             xpath = self._x_paths.password if self._x_paths is not None else None
             if xpath is None:
                 raise ScriptExecutionStopped(LoginStatusCode.PASSWORD_FIELD_NOT_FOUND, None)
-        try:
-            self._driver.fill_text(xpath, self._password)
-        except Exception:
-            raise ScriptExecutionStopped(LoginStatusCode.PASSWORD_FIELD_NOT_FOUND, f"XPath \"{xpath}\" not found on page.")
-        self._driver.wait(500)
+        self._fill(xpath, self._password, LoginStatusCode.PASSWORD_FIELD_NOT_FOUND)
+        self._record_step("fillPassword", started)
 
     def fill_text(self, xpath, value):
-        try:
-            self._driver.fill_text(xpath, value)
-        except Exception:
-            raise ScriptExecutionStopped(LoginStatusCode.TEXT_FIELD_NOT_FOUND, f"XPath \"{xpath}\" not found on page.")
-        self._driver.wait(500)
+        started = time.perf_counter()
+        self._fill(xpath, value, LoginStatusCode.TEXT_FIELD_NOT_FOUND)
+        self._record_step("fillText", started)
 
     def click_button(self, xpath):
-        try:
-            self._driver.click_button(xpath)
-        except Exception:
-            raise ScriptExecutionStopped(LoginStatusCode.BUTTON_NOT_FOUND, f"XPath \"{xpath}\" not found on page.")
-        self._driver.wait(500)
+        started = time.perf_counter()
+        self._click(xpath, LoginStatusCode.BUTTON_NOT_FOUND)
+        self._record_step("clickButton", started)
 
     def open_url(self, url):
+        started = time.perf_counter()
         self._driver.open_url(url)
+        self._record_step("openUrl", started)
 
     def wait(self, ms):
+        started = time.perf_counter()
         self._driver.wait(ms)
+        self._record_step("wait", started)
+
+    def wait_for_element(self, xpath, timeout_ms):
+        started = time.perf_counter()
+        visible = self._driver.wait_for_element(xpath, timeout_ms)
+        self._record_step("waitForElement", started)
+        if not visible:
+            raise ScriptExecutionStopped(
+                LoginStatusCode.WAIT_TIMEOUT, f'waitForElement("{xpath}", {timeout_ms}) timed out.'
+            )
+
+    def wait_for_url(self, url, timeout_ms):
+        started = time.perf_counter()
+        url_match = SuccessUrlMatch.GLOB if "*" in url else SuccessUrlMatch.EXACT
+        matched = self._driver.wait_for_url(get_url_matcher(url_match, url), timeout_ms)
+        self._record_step("waitForUrl", started)
+        if not matched:
+            raise ScriptExecutionStopped(
+                LoginStatusCode.WAIT_TIMEOUT,
+                f'waitForUrl("{url}", {timeout_ms}) timed out on "{self._driver.get_current_url()}".',
+            )
+
+    def wait_for_network_idle(self, timeout_ms):
+        started = time.perf_counter()
+        # Pages that keep polling never go idle, the script continues after the timeout
+        self._driver.wait_for_network_idle(NETWORK_IDLE_QUIET_MS, timeout_ms)
+        self._record_step("waitForNetworkIdle", started)
+
+    def _fill(self, xpath: str, value: str, status: LoginStatusCode):
+        # The fill reports a missing element itself
+        self._driver.wait_for_element(xpath, ELEMENT_TIMEOUT_MS)
+        try:
+            self._driver.fill_text(xpath, value)
+        except Exception:
+            raise ScriptExecutionStopped(status, f"XPath \"{xpath}\" not found on page.")
+        self._wait_for_value(xpath, value)
+
+    def _wait_for_value(self, xpath: str, value: str):
+        """
+        Waits until the field holds the value. Fields that format their value, e.g. with an input mask,
+        never hold exactly the value and are only waited for until the timeout.
+        """
+        deadline = time.monotonic() + VALUE_COMMIT_TIMEOUT_MS / 1000
+        while time.monotonic() < deadline:
+            try:
+                if self._driver.get_input_value(xpath) == value:
+                    return
+            except Exception:
+                # The page navigated away, e.g. a value ending with a newline submitted the form
+                return
+            self._driver.wait(50)
+
+    def _click(self, xpath: str, status: LoginStatusCode):
+        self._driver.wait_for_element(xpath, ELEMENT_TIMEOUT_MS)
+        try:
+            self._driver.click_button(xpath)
+        except Exception:
+            raise ScriptExecutionStopped(status, f"XPath \"{xpath}\" not found on page.")
+
+    def _record_step(self, name: str, started: float):
+        if self._on_step is not None:
+            self._on_step(name, time.perf_counter() - started)
@@ -58,3 +58,29 @@ class CustomLoginMethodsInterface(ABC):
         :param ms: Time in milliseconds.
         """
         pass
+
+    @abstractmethod
+    def wait_for_element(self, xpath: str, timeout_ms: int):
+        """
+        Pauses the execution until an element is visible or the timeout is reached.
+        :param xpath: The xpath to reference the element.
+        :param timeout_ms: Time to wait at most in milliseconds.
+        """
+        pass
+
+    @abstractmethod
+    def wait_for_url(self, url: str, timeout_ms: int):
+        """
+        Pauses the execution until the page URL matches or the timeout is reached.
+        :param url: The URL to wait for, * matches any characters.
+        :param timeout_ms: Time to wait at most in milliseconds.
+        """
+        pass
+
+    @abstractmethod
+    def wait_for_network_idle(self, timeout_ms: int):
+        """
+        Pauses the execution until the page does not load anything anymore or the timeout is reached.
+        :param timeout_ms: Time to wait at most in milliseconds.
+        """
+        pass
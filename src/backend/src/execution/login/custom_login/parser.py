@@ -20,6 +20,9 @@ stmt: click_submit_button
     | click_button
     | open_url
     | wait
+    | wait_for_element
+    | wait_for_url
+    | wait_for_network_idle
 
 // Commands with optional string argument
 click_submit_button : "clickSubmitButton" "(" [STRING] ")"
@@ -36,6 +39,11 @@ open_url            : "openUrl" "(" STRING ")"
 // Command with required integer argument: wait(200)
 wait                : "wait" "(" INT ")"
 
+// Commands that wait for a condition with a timeout in milliseconds: waitForElement("some xpath", 5000)
+wait_for_element      : "waitForElement" "(" STRING "," INT ")"
+wait_for_url          : "waitForUrl" "(" STRING "," INT ")"
+wait_for_network_idle : "waitForNetworkIdle" "(" INT ")"
+
 // Terminals
 STRING              : "\"" _STRING_ESC_INNER "\"" | "'" _STRING_ESC_INNER "'"
 %import common._STRING_ESC_INNER
@@ -87,6 +95,18 @@ class Executor(Transformer):
         (ms,) = items
         self._custom_login_methods.wait(ms)
 
+    def wait_for_element(self, items):
+        xpath, timeout_ms = items
+        self._custom_login_methods.wait_for_element(xpath, timeout_ms)
+
+    def wait_for_url(self, items):
+        url, timeout_ms = items
+        self._custom_login_methods.wait_for_url(url, timeout_ms)
+
+    def wait_for_network_idle(self, items):
+        (timeout_ms,) = items
+        self._custom_login_methods.wait_for_network_idle(timeout_ms)
+
 
 class CustomLoginScriptParser:
     def __init__(self, custom_login_methods: CustomLoginMethodsInterface):
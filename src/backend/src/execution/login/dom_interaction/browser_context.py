@@ -0,0 +1,261 @@
+import asyncio
+import threading
+import traceback
+from typing import Any, Callable
+
+import mycdp
+from seleniumbase.core.sb_cdp import CDPMethods
+
+from execution.login.dom_interaction.browser_pool import (
+    Browser,
+    BrowserRecyclePolicy,
+    RecycleReason,
+)
+from execution.login.dom_interaction.display_pool import DisplayPool
+
+# Seconds to wait until a page that was created in a browser context is attached
+PAGE_ATTACH_TIMEOUT_SECONDS = 5
+# CDP methods that only wait without running the event loop of the browser
+_UNLOCKED_METHODS = frozenset({"sleep"})
+
+
+class _LockedCDPMethods:
+    """
+    CDP methods of a page in the shared browser. All pages use the event loop of the shared browser,
+    which can only be run by one thread at a time, so only one call is executed at a time.
+    This is a deliberate limit: long calls like open or solve_captcha hold back the other pages, the contexts
+    only save the launch and memory of a browser per login. Waits for navigations run the event loop in short
+    slices, so the pages take turns during them.
+    """
+
+    def __init__(self, cdp_methods: CDPMethods, lock: threading.Lock):
+        self._cdp_methods = cdp_methods
+        self._lock = lock
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._cdp_methods, name)
+        if not callable(attribute) or name in _UNLOCKED_METHODS:
+            return attribute
+
+        def locked(*args, **kwargs):
+            with self._lock:
+                return attribute(*args, **kwargs)
+
+        return locked
+
+    def call(self, function: Callable[[CDPMethods], Any]) -> Any:
+        """
+        Calls the function with the CDP methods of the page while no other page executes a call.
+        """
+        with self._lock:
+            return function(self._cdp_methods)
+
+
+class BrowserContext:
+    """
+    Isolated browser context with its own cookies, storage and cache, like an incognito window.
+    """
+
+    def __init__(
+        self,
+        shared_browser: "SharedBrowser",
+        browser: Browser,
+        context_id: Any,
+        cdp: _LockedCDPMethods,
+    ):
+        self.cdp = cdp
+        self._shared_browser = shared_browser
+        self._browser = browser
+        self._context_id = context_id
+
+    def close(self):
+        """
+        Disposes the context with all its pages.
+        """
+        self._shared_browser.dispose_context(self._browser, self._context_id)
+
+
+class SharedBrowser:
+    """
+    One browser that hosts isolated browser contexts, so concurrent logins do not need a browser process each.
+    The browser is launched with the first context and launched again if it was killed.
+    When the browser exceeds the limits of the recycle policy, new contexts wait until the running ones are
+    disposed and the browser is replaced.
+    """
+
+    def __init__(
+        self,
+        recycle_policy: BrowserRecyclePolicy | None = None,
+        on_recycle: Callable[[RecycleReason], None] | None = None,
+        display_pool: DisplayPool | None = None,
+    ):
+        # Serializes all CDP calls, they share the event loop of the browser
+        self._lock = threading.Lock()
+        self._condition = threading.Condition()
+        self._browser: Browser | None = None
+        # A browser is being launched outside the condition, new contexts wait for it
+        self._launching = False
+        self._active_contexts = 0
+        self._retiring = False
+        self._kills = 0
+        self._recycle_policy = recycle_policy if recycle_policy is not None else BrowserRecyclePolicy()
+        self._on_recycle = on_recycle
+        self._display_pool = display_pool
+
+    def new_context(self) -> BrowserContext:
+        browser = self._get_browser()
+        cdp = browser.sb.cdp
+        context_id = None
+        try:
+            with self._lock:
+                context_id = cdp.loop.run_until_complete(
+                    cdp.page.send(mycdp.target.create_browser_context())
+                )
+                page = cdp.loop.run_until_complete(
+                    SharedBrowser._create_page(cdp, context_id)
+                )
+        except Exception:
+            if context_id is None:
+                # The browser does not answer anymore, the next context launches a new one
+                self.kill()
+            else:
+                # Only the page of this context failed, the contexts of the other logins keep running
+                self.dispose_context(browser, context_id)
+            raise
+        return BrowserContext(
+            shared_browser=self,
+            browser=browser,
+            context_id=context_id,
+            cdp=_LockedCDPMethods(CDPMethods(cdp.loop, page, cdp.driver), self._lock),
+        )
+
+    def _get_browser(self) -> Browser:
+        """
+        Returns the shared browser for a new context and launches it if needed. The launch takes seconds,
+        so it runs outside the condition and does not block kill, close_if_idle and dispose_context.
+        """
+        with self._condition:
+            while self._retiring or self._launching:
+                self._condition.wait()
+            if self._browser is not None:
+                self._active_contexts += 1
+                return self._browser
+            self._launching = True
+        try:
+            browser = Browser(pooled=False, display_pool=self._display_pool)
+        except Exception:
+            with self._condition:
+                self._launching = False
+                self._condition.notify_all()
+            raise
+        with self._condition:
+            self._launching = False
+            self._browser = browser
+            self._active_contexts += 1
+            self._condition.notify_all()
+        return browser
+
+    def dispose_context(self, browser: Browser, context_id: Any):
+        with self._condition:
+            # Contexts of a killed browser are already gone
+            if browser is not self._browser:
+                return
+        cdp = browser.sb.cdp
+        try:
+            with self._lock:
+                cdp.loop.run_until_complete(
+                    cdp.page.send(mycdp.target.dispose_browser_context(context_id))
+                )
+        except Exception:
+            traceback.print_exc()
+        browser.jobs_executed += 1
+        self._finish_context(browser)
+
+    def kill(self):
+        """
+        Kills the shared browser. All logins that use one of its contexts fail.
+        """
+        with self._condition:
+            self._kills += 1
+        browser = self._release_browser()
+        if browser is not None:
+            browser.kill()
+
+    @property
+    def kills(self) -> int:
+        """
+        Number of times the shared browser was killed, a login can compare it to tell whether its context failed
+        because of another login.
+        """
+        with self._condition:
+            return self._kills
+
+    def close_if_idle(self):
+        """
+        Closes the shared browser if no context is running. The next context launches it again.
+        """
+        with self._condition:
+            if self._active_contexts > 0 or self._retiring:
+                return
+            # Detached in the same locked section, a new context launches a new browser instead
+            browser = self._detach_browser()
+        if browser is not None:
+            browser.quit()
+
+    def close(self):
+        browser = self._release_browser()
+        if browser is not None:
+            browser.quit()
+
+    def _release_browser(self) -> Browser | None:
+        with self._condition:
+            return self._detach_browser()
+
+    def _detach_browser(self) -> Browser | None:
+        """
+        Must be called with the condition held.
+        """
+        browser = self._browser
+        self._browser = None
+        self._active_contexts = 0
+        self._retiring = False
+        self._condition.notify_all()
+        return browser
+
+    def _finish_context(self, browser: Browser):
+        with self._condition:
+            if browser is not self._browser:
+                return
+            self._active_contexts -= 1
+            if not self._retiring:
+                try:
+                    reason = self._recycle_policy.get_reason(browser)
+                except Exception:
+                    traceback.print_exc()
+                    reason = None
+                if reason is not None:
+                    print(f"Recycling shared browser after {browser.jobs_executed} logins, {reason.value} limit reached")
+                    self._retiring = True
+                    if self._on_recycle is not None:
+                        self._on_recycle(reason)
+            if not self._retiring or self._active_contexts > 0:
+                return
+            # The last running context is disposed, waiting contexts get a new browser
+            retired = self._detach_browser()
+        if retired is not None:
+            retired.quit()
+
+    @staticmethod
+    async def _create_page(cdp: CDPMethods, context_id: Any):
+        driver = getattr(cdp.driver, "cdp_base", cdp.driver)
+        target_id = await driver.connection.send(
+            mycdp.target.create_target("about:blank", browser_context_id=context_id)
+        )
+        # The page is attached by the browser when it receives the target created event
+        for _ in range(int(PAGE_ATTACH_TIMEOUT_SECONDS / 0.05)):
+            for target in driver.targets:
+                if target.type_ == "page" and target.target_id == target_id:
+                    target.browser = driver
+                    return target
+            await asyncio.sleep(0.05)
+        raise TimeoutError(f"Page {target_id} of browser context was not attached")
@@ -0,0 +1,477 @@
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, List, Set, Tuple
+from urllib.parse import urlparse
+
+import mycdp
+from seleniumbase import SB
+
+from execution.login.dom_interaction.display_pool import DisplayPool, use_display
+from execution.login.dom_interaction.resource_blocking import ResourceBlocker
+from utils.process import get_process_tree_memory, kill_process_tree
+
+
+class RecycleReason(Enum):
+    JOBS = "jobs"
+    MEMORY = "memory"
+
+
+@dataclass
+class BrowserRecyclePolicy:
+    """
+    Limits after which a browser is replaced by a new one between two logins. 0 disables a limit.
+    """
+
+    max_jobs: int = 0
+    max_memory_mb: int = 0
+
+    def get_reason(self, browser: "Browser") -> RecycleReason | None:
+        if 0 < self.max_jobs <= browser.jobs_executed:
+            return RecycleReason.JOBS
+        if self.max_memory_mb > 0 and browser.get_memory_usage() > self.max_memory_mb * 1024 * 1024:
+            return RecycleReason.MEMORY
+        return None
+
+
+@dataclass
+class BrowserPoolStats:
+    size: int
+    idle: int
+    busy: int
+    launched: int
+    recycled: int
+    prewarmed: int
+    prewarm_hits: int
+    suspended: bool
+
+
+def _get_origin(url: str) -> str | None:
+    parsed_url = urlparse(url)
+    if parsed_url.scheme not in ("http", "https") or not parsed_url.netloc:
+        return None
+    return f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+
+class Browser:
+    """
+    Undetected Chrome in CDP mode. Pooled browsers execute one login after another.
+    :param url: The URL the browser opens when CDP mode is activated.
+    :param display_pool: Pool the browser takes its own virtual display from.
+    :param user_data_dir: Persistent profile directory, by default the browser uses a temporary profile.
+    :param disk_cache_mb: Size limit of the HTTP cache of the profile. 0 uses the default of Chrome.
+    """
+
+    def __init__(
+        self,
+        pooled: bool = True,
+        url: str = "about:blank",
+        display_pool: DisplayPool | None = None,
+        user_data_dir: str | None = None,
+        disk_cache_mb: int = 0,
+    ):
+        self.pooled = pooled
+        self.jobs_executed = 0
+        self._visited_origins: Set[str] = set()
+        self._display_pool = display_pool
+        self.display = display_pool.acquire() if display_pool is not None else None
+        try:
+            with use_display(self.display):
+                self._sb_instance = SB(
+                    uc=True,
+                    headed=True,
+                    window_size="1920,953",
+                    user_data_dir=user_data_dir,
+                    chromium_arg=f"--disk-cache-size={disk_cache_mb * 1024 * 1024}" if disk_cache_mb else None,
+                )
+                self.sb = self._sb_instance.__enter__()
+        except Exception:
+            self._release_display()
+            raise
+        try:
+            with use_display(self.display):
+                self.sb.activate_cdp_mode(url)
+            self._watch_origins()
+        except Exception:
+            self.quit()
+            raise
+
+    def gui_handle_captcha(self):
+        with use_display(self.display):
+            self.sb.uc_gui_handle_captcha()
+
+    def gui_click_captcha(self):
+        with use_display(self.display):
+            self.sb.uc_gui_click_captcha()
+
+    def open(self, url: str):
+        self._add_visited_origin(url)
+        self.sb.cdp.open(url)
+
+    def reset(self):
+        """
+        Removes everything the last login left behind: tabs, cookies, storage and cache.
+        Storage is cleared for every origin a frame of the login navigated to, e.g. the origins of single
+        sign-on pages and redirects. The next login starts on a blank tab like in a new browser.
+        """
+        cdp = self.sb.cdp
+        self._add_visited_origin(cdp.get_current_url())
+
+        cdp.open_new_tab("about:blank")
+        for tab in cdp.get_tabs():
+            if tab is not cdp.page:
+                # Popups, e.g. of a single sign-on, are not watched
+                self._add_visited_origin(getattr(tab, "url", None) or "")
+                cdp.loop.run_until_complete(tab.close())
+        cdp.clear_cookies()
+        for origin in list(self._visited_origins):
+            cdp.loop.run_until_complete(
+                cdp.page.send(
+                    mycdp.storage.clear_data_for_origin(origin=origin, storage_types="all")
+                )
+            )
+        cdp.loop.run_until_complete(cdp.page.send(mycdp.network.clear_browser_cache()))
+        self._visited_origins.clear()
+        self._watch_origins()
+
+    def _watch_origins(self):
+        """
+        Records the origins the frames of the current tab navigate to. Storage is only created by documents,
+        so the origins of the frames are all origins that can have stored something.
+        """
+        cdp = self.sb.cdp
+        cdp.add_handler(mycdp.page.FrameNavigated, self._on_frame_navigated)
+        cdp.loop.run_until_complete(cdp.page.send(mycdp.page.enable()))
+
+    # Events are delivered with the connection as second argument
+    def _on_frame_navigated(self, event: mycdp.page.FrameNavigated, *_):
+        self._add_visited_origin(event.frame.url)
+
+    def _add_visited_origin(self, url: str):
+        origin = _get_origin(url)
+        if origin is not None:
+            self._visited_origins.add(origin)
+
+    def quit(self):
+        try:
+            self._sb_instance.__exit__(None, None, None)
+        except Exception:
+            traceback.print_exc()
+        self._release_display()
+
+    def get_memory_usage(self) -> int:
+        """
+        Returns the resident memory of the browser with all its renderer processes in bytes.
+        """
+        browser_pid = getattr(getattr(self.sb, "driver", None), "browser_pid", None)
+        if not browser_pid:
+            return 0
+        return get_process_tree_memory(browser_pid)
+
+    def kill(self):
+        """
+        Kills the browser and the driver process with all their child processes.
+        Can be called from another thread while the browser hangs.
+        """
+        driver = getattr(self.sb, "driver", None)
+        service_process = getattr(getattr(driver, "service", None), "process", None)
+        for pid in (
+            getattr(driver, "browser_pid", None),
+            getattr(service_process, "pid", None),
+        ):
+            if pid:
+                kill_process_tree(pid)
+        self._release_display()
+
+    def _release_display(self):
+        if self._display_pool is not None:
+            self._display_pool.release(self.display)
+            self._display_pool = None
+
+
+class BrowserPool:
+    """
+    Keeps up to size browsers launched, so logins do not have to wait for a browser to start.
+    A login borrows a browser and gives it back when it is finished. Browsers are reset before they are
+    reused, browsers that broke during a login are replaced. When all pooled browsers are in use,
+    an additional browser is launched that is closed after the login.
+    Browsers that exceed the limits of the recycle policy are replaced after their login.
+
+    Up to max_prewarmed additional browsers can be prewarmed for logins that are due soon. They are launched
+    in advance and handed to the next login that finds no idle pooled browser, then closed like any additional
+    browser. The website itself is only opened by the login, so prewarming adds no request to the per host
+    limits of the login queue.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        recycle_policy: BrowserRecyclePolicy | None = None,
+        on_recycle: Callable[[RecycleReason], None] | None = None,
+        display_pool: DisplayPool | None = None,
+        max_prewarmed: int = 0,
+    ):
+        self._size = size
+        self._max_prewarmed = max_prewarmed
+        self._display_pool = display_pool
+        self._recycle_policy = recycle_policy if recycle_policy is not None else BrowserRecyclePolicy()
+        self._on_recycle = on_recycle
+        self._condition = threading.Condition()
+        self._idle: List[Browser] = []
+        self._busy = 0
+        # Pooled browsers that are launched, idle or busy
+        self._pooled = 0
+        self._launched = 0
+        self._recycled = 0
+        self._launching = 0
+        # Prewarmed browsers with the time they were ready
+        self._prewarmed: List[Tuple[Browser, float]] = []
+        self._prewarming = 0
+        self._prewarm_hits = 0
+        self._suspended = False
+        self._closed = False
+
+    def start(self):
+        """
+        Launches the browsers of the pool in the background.
+        """
+        for _ in range(self._size):
+            self._launch_in_background()
+
+    def borrow(self, url: str | None = None, resource_blocker: ResourceBlocker | None = None) -> Browser:
+        """
+        :param url: The URL the browser opens.
+        :param resource_blocker: Blocks resources from the first request on.
+        """
+        with self._condition:
+            # Pooled browsers are kept after the login, so they are used before a prewarmed one
+            prewarmed = self._prewarmed.pop(0) if self._prewarmed and not self._idle else None
+            if prewarmed is not None:
+                self._busy += 1
+                self._prewarm_hits += 1
+        browser = prewarmed[0] if prewarmed is not None else self._borrow()
+        try:
+            if resource_blocker is not None:
+                resource_blocker.attach(browser.sb.cdp)
+            if url is not None:
+                browser.open(url)
+        except Exception:
+            self.give_back(browser, reusable=False)
+            raise
+        return browser
+
+    def prewarm(self, count: int):
+        """
+        Launches browsers in the background until count browsers are ready for the next logins, so the logins
+        do not have to wait for a browser to start. Idle and starting pooled browsers count as ready.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            ready = len(self._idle) + self._launching + len(self._prewarmed) + self._prewarming
+            launches = min(count - ready, self._max_prewarmed - len(self._prewarmed) - self._prewarming)
+            if launches <= 0:
+                return
+            self._prewarming += launches
+
+        def launch():
+            try:
+                browser = Browser(pooled=False, display_pool=self._display_pool)
+            except Exception:
+                traceback.print_exc()
+                browser = None
+            with self._condition:
+                self._prewarming -= 1
+                if browser is not None:
+                    self._launched += 1
+                    if not self._closed:
+                        self._prewarmed.append((browser, time.monotonic()))
+                        return
+            if browser is not None:
+                browser.quit()
+
+        for _ in range(launches):
+            threading.Thread(target=launch, name="browser-prewarmer", daemon=True).start()
+
+    def expire_prewarmed(self, max_age: float):
+        """
+        Closes prewarmed browsers that were not used by a login within max_age seconds.
+        """
+        with self._condition:
+            now = time.monotonic()
+            expired = [browser for browser, ready_at in self._prewarmed if now - ready_at > max_age]
+            self._prewarmed = [
+                (browser, ready_at) for browser, ready_at in self._prewarmed if now - ready_at <= max_age
+            ]
+        for browser in expired:
+            browser.quit()
+
+    def _borrow(self) -> Browser:
+        with self._condition:
+            # A browser that is already starting is ready sooner than a new one
+            while not self._idle and self._launching > 0:
+                self._condition.wait()
+            if self._idle:
+                self._busy += 1
+                return self._idle.pop()
+            pooled = self._pooled < self._size and self._keeps_browsers()
+            if pooled:
+                self._pooled += 1
+            self._busy += 1
+        try:
+            return self._launch(pooled)
+        except Exception:
+            with self._condition:
+                self._busy -= 1
+                if pooled:
+                    self._pooled -= 1
+            raise
+
+    def give_back(self, browser: Browser, reusable: bool = True):
+        """
+        Returns a borrowed browser. Browsers that are not reusable are closed and replaced.
+        """
+        browser.jobs_executed += 1
+        reusable = reusable and browser.pooled and self._keeps_browsers()
+        if reusable and self._recycle(browser):
+            reusable = False
+        elif reusable:
+            try:
+                browser.reset()
+            except Exception:
+                traceback.print_exc()
+                reusable = False
+        if reusable:
+            with self._condition:
+                self._busy -= 1
+                self._idle.append(browser)
+                self._condition.notify_all()
+            return
+        browser.quit()
+        self._remove(browser)
+
+    def discard(self, browser: Browser):
+        """
+        Removes a borrowed browser that was killed.
+        """
+        self._remove(browser)
+
+    def suspend(self):
+        """
+        Closes the idle pooled browsers and stops keeping browsers until the pool is resumed.
+        Logins can still borrow browsers in the meantime, they are closed after the login.
+        """
+        with self._condition:
+            if self._suspended or self._closed:
+                return
+            self._suspended = True
+            idle = self._idle
+            self._idle = []
+            self._pooled -= len(idle)
+        for browser in idle:
+            browser.quit()
+
+    def resume(self):
+        """
+        Launches the browsers of a suspended pool again.
+        """
+        with self._condition:
+            if not self._suspended:
+                return
+            self._suspended = False
+        self.start()
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            self._pooled -= len(idle)
+            prewarmed = [browser for browser, _ in self._prewarmed]
+            self._prewarmed = []
+        for browser in idle + prewarmed:
+            browser.quit()
+
+    def get_stats(self) -> BrowserPoolStats:
+        with self._condition:
+            return BrowserPoolStats(
+                size=self._size,
+                idle=len(self._idle),
+                busy=self._busy,
+                launched=self._launched,
+                recycled=self._recycled,
+                prewarmed=len(self._prewarmed),
+                prewarm_hits=self._prewarm_hits,
+                suspended=self._suspended,
+            )
+
+    def _keeps_browsers(self) -> bool:
+        return not self._closed and not self._suspended
+
+    def _recycle(self, browser: Browser) -> bool:
+        """
+        :return: True if the browser exceeds the recycle policy and has to be replaced.
+        """
+        try:
+            reason = self._recycle_policy.get_reason(browser)
+        except Exception:
+            traceback.print_exc()
+            return False
+        if reason is None:
+            return False
+        print(f"Recycling browser after {browser.jobs_executed} logins, {reason.value} limit reached")
+        with self._condition:
+            self._recycled += 1
+        if self._on_recycle is not None:
+            self._on_recycle(reason)
+        return True
+
+    def _remove(self, browser: Browser):
+        with self._condition:
+            self._busy -= 1
+            if not browser.pooled:
+                return
+            self._pooled -= 1
+            replace = self._keeps_browsers() and self._pooled < self._size
+            if replace:
+                self._pooled += 1
+        if replace:
+            self._launch_in_background(reserved=True)
+
+    def _launch(self, pooled: bool) -> Browser:
+        browser = Browser(pooled=pooled, display_pool=self._display_pool)
+        with self._condition:
+            self._launched += 1
+        return browser
+
+    def _launch_in_background(self, reserved: bool = False):
+        """
+        Launches a pooled browser and adds it to the idle browsers.
+        :param reserved: True if the slot of the browser was already reserved in the pool.
+        """
+        with self._condition:
+            if not reserved:
+                if not self._keeps_browsers() or self._pooled >= self._size:
+                    return
+                self._pooled += 1
+            self._launching += 1
+
+        def launch():
+            try:
+                browser = self._launch(pooled=True)
+            except Exception:
+                traceback.print_exc()
+                browser = None
+            with self._condition:
+                self._launching -= 1
+                self._condition.notify_all()
+                if browser is not None and self._keeps_browsers():
+                    self._idle.append(browser)
+                    return
+                self._pooled -= 1
+            if browser is not None:
+                browser.quit()
+
+        threading.Thread(target=launch, name="browser-launcher", daemon=True).start()
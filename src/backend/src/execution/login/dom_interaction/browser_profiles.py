@@ -0,0 +1,132 @@
+import os
+import shutil
+import threading
+import traceback
+from dataclasses import dataclass
+from typing import Collection, List, Set, Tuple
+
+# Files and directories of a Chrome profile that hold cookies and site data. They are removed before the
+# launch unless the website keeps its cookies. The HTTP cache and the service worker caches are kept.
+_COOKIE_PATHS = [
+    os.path.join("Default", "Cookies"),
+    os.path.join("Default", "Cookies-journal"),
+    os.path.join("Default", "Network", "Cookies"),
+    os.path.join("Default", "Network", "Cookies-journal"),
+    os.path.join("Default", "Local Storage"),
+    os.path.join("Default", "Session Storage"),
+    os.path.join("Default", "IndexedDB"),
+]
+# Touched whenever a profile is used, the garbage collection removes the least recently used profiles first
+_LAST_USED_FILE = "last_used"
+
+
+def _get_directory_size(path: str) -> int:
+    size = 0
+    for directory, _, files in os.walk(path):
+        for file in files:
+            try:
+                size += os.lstat(os.path.join(directory, file)).st_size
+            except OSError:
+                pass
+    return size
+
+
+@dataclass
+class BrowserProfile:
+    user_data_dir: str
+    # Size limit of the HTTP cache, 0 uses the default of Chrome
+    disk_cache_mb: int = 0
+
+
+class BrowserProfiles:
+    """
+    Persistent Chrome profile directory per website, so repeat logins load static assets from the HTTP cache.
+    A profile is used by one browser at a time. The profiles of all websites share a disk budget.
+    :param root: Directory the profiles are stored in.
+    :param max_size_mb: Disk budget of all profiles, the least recently used profiles are removed when exceeded.
+    :param disk_cache_mb: Size limit of the HTTP cache of each profile.
+    """
+
+    def __init__(self, root: str, max_size_mb: int, disk_cache_mb: int = 0):
+        self._root = root
+        self._max_size = max_size_mb * 1024 * 1024
+        self._disk_cache_mb = disk_cache_mb
+        self._lock = threading.Lock()
+        self._in_use: Set[int] = set()
+
+    def acquire(self, website_id: int, keep_cookies: bool) -> BrowserProfile | None:
+        """
+        :param keep_cookies: Keep the cookies and site data of the last login, otherwise only the caches are kept.
+        :return: The profile of the website or None if the profile is used by another browser.
+        """
+        with self._lock:
+            if website_id in self._in_use:
+                return None
+            self._in_use.add(website_id)
+        profile_dir = self._get_profile_dir(website_id)
+        try:
+            os.makedirs(profile_dir, exist_ok=True)
+            if not keep_cookies:
+                for path in _COOKIE_PATHS:
+                    path = os.path.join(profile_dir, path)
+                    if os.path.isdir(path):
+                        shutil.rmtree(path, ignore_errors=True)
+                    elif os.path.exists(path):
+                        os.remove(path)
+            with open(os.path.join(profile_dir, _LAST_USED_FILE), "w"):
+                pass
+        except OSError:
+            traceback.print_exc()
+            self.release(website_id)
+            return None
+        return BrowserProfile(user_data_dir=profile_dir, disk_cache_mb=self._disk_cache_mb)
+
+    def release(self, website_id: int):
+        with self._lock:
+            self._in_use.discard(website_id)
+
+    def collect_garbage(self, website_ids: Collection[int]):
+        """
+        Removes the profiles of websites that do not exist anymore and, while the profiles exceed the
+        disk budget, the least recently used profiles. Profiles that are in use are kept.
+        :param website_ids: Ids of the existing websites that use a profile.
+        """
+        profiles: List[Tuple[float, int, int]] = []
+        try:
+            entries = os.listdir(self._root)
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            website_id = int(entry)
+            with self._lock:
+                if website_id in self._in_use:
+                    continue
+            profile_dir = self._get_profile_dir(website_id)
+            if website_id not in website_ids:
+                self._remove(website_id, "its website does not use a profile anymore")
+                continue
+            try:
+                last_used = os.path.getmtime(os.path.join(profile_dir, _LAST_USED_FILE))
+            except OSError:
+                last_used = 0
+            profiles.append((last_used, website_id, _get_directory_size(profile_dir)))
+
+        total_size = sum(size for _, _, size in profiles)
+        for _, website_id, size in sorted(profiles):
+            if total_size <= self._max_size:
+                break
+            self._remove(website_id, "the profiles exceed their disk budget")
+            total_size -= size
+
+    def _get_profile_dir(self, website_id: int) -> str:
+        return os.path.join(self._root, str(website_id))
+
+    def _remove(self, website_id: int, reason: str):
+        with self._lock:
+            # Might have been acquired in the meantime
+            if website_id in self._in_use:
+                return
+            print(f"Removing browser profile of website {website_id}, {reason}")
+            shutil.rmtree(self._get_profile_dir(website_id), ignore_errors=True)
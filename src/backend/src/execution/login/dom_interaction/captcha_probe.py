@@ -0,0 +1,33 @@
+import json
+from dataclasses import dataclass, field
+
+# Challenge iframes and widgets of the captchas the GUI solver of SeleniumBase can handle
+CAPTCHA_SELECTORS = [
+    # Cloudflare Turnstile and the Cloudflare challenge page
+    'iframe[src*="challenges.cloudflare.com"]',
+    'script[src*="/challenge-platform/"]',
+    '[class*="cf-turnstile"]',
+    'input[name="cf-turnstile-response"]',
+    '[id^="challenge-widget-"]',
+    "#challenge-form",
+    # reCAPTCHA
+    'iframe[title="reCAPTCHA"]',
+    'iframe[src*="/recaptcha/"]',
+    # hCaptcha and Incapsula
+    "iframe[data-hcaptcha-widget-id]",
+    'iframe[src*="hcaptcha.com"]',
+    'iframe[src*="_Incapsula_Resource?"]',
+    # DataDome slider
+    'iframe[src*="captcha-delivery.com/captcha/"]',
+]
+
+CAPTCHA_PROBE_SCRIPT = f"document.querySelector({json.dumps(', '.join(CAPTCHA_SELECTORS))}) !== null"
+
+
+@dataclass
+class CaptchaStats:
+    # Number of times the page was checked for a captcha
+    probes: int = 0
+    # Number of checks that found a captcha, only these ran the solver
+    hits: int = 0
+    solve_seconds: list[float] = field(default_factory=list)
@@ -0,0 +1,161 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from seleniumbase import config as sb_config
+
+# Seconds to wait until a started Xvfb accepts connections
+XVFB_START_TIMEOUT_SECONDS = 10
+XVFB_SCREEN = "1920x1080x24"
+
+# Held while DISPLAY of the process points to a virtual display. DISPLAY and the display connection of pyautogui
+# are global to the process, so browser launches and GUI captcha solves on virtual displays run one at a time.
+_display_lock = threading.Lock()
+
+
+class Display:
+    """
+    Virtual Xvfb display with its own screen and mouse.
+    """
+
+    def __init__(self, number: int):
+        self.number = number
+        self.name = f":{number}"
+        self._process: subprocess.Popen | None = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self):
+        self._process = subprocess.Popen(
+            ["Xvfb", "-ac", self.name, "-screen", "0", XVFB_SCREEN, "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + XVFB_START_TIMEOUT_SECONDS
+        while not os.path.exists(f"/tmp/.X11-unix/X{self.number}"):
+            if self._process.poll() is not None or time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError(f"Xvfb could not be started on display {self.name}")
+            time.sleep(0.05)
+
+    def stop(self):
+        if self._process is None:
+            return
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+
+
+class DisplayPool:
+    """
+    Gives every browser its own virtual display, so concurrent headed browsers do not fight over one screen
+    and mouse. Displays are started on demand and reused by the next browser once released.
+    Own displays do not make browser launches and GUI captcha solves run in parallel, see use_display.
+    Without Xvfb all browsers use the display of the process.
+    :param first_display: Number of the first display, the following displays use the next free numbers.
+    """
+
+    def __init__(self, first_display: int = 100):
+        self._lock = threading.Lock()
+        self._next_number = first_display
+        self._idle: List[Display] = []
+        self._displays: List[Display] = []
+        self._available = shutil.which("Xvfb") is not None
+        if not self._available:
+            print("Xvfb is not installed, all browsers share the display of the process")
+
+    def acquire(self) -> Display | None:
+        """
+        :return: An unused display or None if virtual displays are not available.
+        """
+        if not self._available:
+            return None
+        with self._lock:
+            while self._idle:
+                display = self._idle.pop()
+                if display.alive:
+                    return display
+                self._displays.remove(display)
+            display = Display(self._get_free_number())
+            self._displays.append(display)
+        try:
+            display.start()
+        except Exception:
+            traceback.print_exc()
+            with self._lock:
+                self._displays.remove(display)
+            return None
+        return display
+
+    def release(self, display: Display | None):
+        if display is None:
+            return
+        with self._lock:
+            if display in self._displays:
+                self._idle.append(display)
+
+    def close_idle(self):
+        """
+        Stops the displays that are not used by a browser. They are started again on demand.
+        """
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+            for display in idle:
+                self._displays.remove(display)
+        for display in idle:
+            display.stop()
+
+    def close(self):
+        with self._lock:
+            displays = self._displays
+            self._displays = []
+            self._idle = []
+        for display in displays:
+            display.stop()
+
+    def _get_free_number(self) -> int:
+        # Displays of other processes, e.g. the default display, have a lock file
+        while os.path.exists(f"/tmp/.X{self._next_number}-lock"):
+            self._next_number += 1
+        number = self._next_number
+        self._next_number += 1
+        return number
+
+
+@contextmanager
+def use_display(display: Display | None) -> Iterator[None]:
+    """
+    Points DISPLAY of the process to the display while the block runs. Chrome reads DISPLAY when it is launched
+    and pyautogui connects to DISPLAY for GUI actions, so both have to run inside this block.
+    DISPLAY is global to the process, so the blocks of all browsers run one at a time: a slow captcha solve
+    delays the launches and solves of the other browsers. Everything else a browser does runs in parallel.
+    Without a display the block runs on the display of the process and is not serialized.
+    """
+    if display is None:
+        yield
+        return
+    with _display_lock:
+        previous_display = os.environ.get("DISPLAY")
+        os.environ["DISPLAY"] = display.name
+        # SeleniumBase keeps the connection of pyautogui until it is reset
+        sb_config._pyautogui_x11_display = None
+        try:
+            yield
+        finally:
+            if previous_display is None:
+                os.environ.pop("DISPLAY", None)
+            else:
+                os.environ["DISPLAY"] = previous_display
+            sb_config._pyautogui_x11_display = None
@@ -1,35 +1,197 @@
+import json
 import os
-
-from seleniumbase import SB
+import threading
+import time
+from typing import Any, Callable
+
+import mycdp
+from seleniumbase.core.sb_cdp import CDPMethods
+
+from execution.login.dom_interaction.browser_context import BrowserContext, SharedBrowser
+from execution.login.dom_interaction.browser_pool import Browser, BrowserPool
+from execution.login.dom_interaction.browser_profiles import BrowserProfile
+from execution.login.dom_interaction.captcha_probe import CAPTCHA_PROBE_SCRIPT, CaptchaStats
+from execution.login.dom_interaction.display_pool import DisplayPool
+from execution.login.dom_interaction.navigation_watcher import NavigationWatcher
 from execution.login.dom_interaction.interfaces.dom_interaction_interface import DomInteractionInterface
+from execution.login.dom_interaction.resource_blocking import ResourceBlocker
 
 
 class DomInteractionDriver(DomInteractionInterface):
+    """
+    Executes the login in a browser of the browser pool or, without pool, in a new browser.
+    With a shared browser the login runs in its own isolated browser context of the shared browser instead.
+    :param resource_blocker: Blocks resources the login does not need, e.g. images and trackers.
+    :param profile: Persistent profile of the website. The login then runs in a new browser with this profile.
+
+    Captchas are only solved after a quick check found one on the page, the solvers take seconds even when
+    there is no captcha. The checks and solves of the login are counted in captcha_stats.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        browser_pool: BrowserPool | None = None,
+        shared_browser: SharedBrowser | None = None,
+        display_pool: DisplayPool | None = None,
+        resource_blocker: ResourceBlocker | None = None,
+        profile: BrowserProfile | None = None,
+    ):
+        super().__init__(url)
+        self.resource_blocker = resource_blocker
+        self._profile = profile
+        # Pooled browsers use temporary profiles
+        self._browser_pool = browser_pool if profile is None else None
+        self._shared_browser = shared_browser
+        self._display_pool = display_pool
+        self._gui_browser: Browser | None = None
+        self._browser: Browser | None = None
+        self._context: BrowserContext | None = None
+        self._browser_lock = threading.Lock()
+        self._disconnected = False
+        self._navigation = NavigationWatcher()
+        self.captcha_stats = CaptchaStats()
 
     def __enter__(self):
-        self._sb_instance = SB(uc=True, headed=True, window_size="1920,953")
-        self._sb = self._sb_instance.__enter__()
+        if self._shared_browser is not None:
+            return self._enter_context()
+        if self._browser_pool is not None:
+            browser = self._browser_pool.borrow(self._url, self.resource_blocker)
+        elif self.resource_blocker is not None:
+            # Blocking has to be set up before the URL is opened
+            browser = self._launch_browser()
+            try:
+                self.resource_blocker.attach(browser.sb.cdp)
+                browser.open(self._url)
+            except Exception:
+                browser.quit()
+                raise
+        else:
+            browser = self._launch_browser(self._url)
+        with self._browser_lock:
+            self._browser = browser
+        self._sb = browser.sb
+        self._cdp = browser.sb.cdp
+        self._gui_browser = browser
+        try:
+            self._navigation.attach(self._cdp)
+            self._solve_captcha_if_present(browser.gui_handle_captcha)
+        except Exception as e:
+            # The browser is not handed back to the pool
+            self.__exit__(type(e), e, e.__traceback__)
+            raise
+        return self
 
-        self._sb.activate_cdp_mode(self._url)
-        self._sb.uc_gui_handle_captcha()
+    def _launch_browser(self, url: str = "about:blank") -> Browser:
+        if self._profile is None:
+            return Browser(pooled=False, url=url, display_pool=self._display_pool)
+        return Browser(
+            pooled=False,
+            url=url,
+            display_pool=self._display_pool,
+            user_data_dir=self._profile.user_data_dir,
+            disk_cache_mb=self._profile.disk_cache_mb,
+        )
+
+    def _enter_context(self):
+        context = self._shared_browser.new_context()
+        with self._browser_lock:
+            self._context = context
+        self._sb = None
+        self._gui_browser = None
+        self._cdp = context.cdp
+        try:
+            if self.resource_blocker is not None:
+                self._cdp.call(self.resource_blocker.attach)
+            self._cdp.call(self._navigation.attach)
+            self._cdp.open(self._url)
+            # The GUI captcha handling of SeleniumBase only works on the active tab of a browser
+            self._solve_captcha_if_present(self._cdp.solve_captcha)
+        except Exception:
+            self.__exit__(None, None, None)
+            raise
         return self
 
     def __exit__(self, exc_type, exc, tb):
-        self._sb_instance.__exit__(exc_type, exc, tb)
+        with self._browser_lock:
+            context = self._context
+            self._context = None
+        if context is not None:
+            context.close()
+            return False
+        with self._browser_lock:
+            browser = self._browser
+            self._browser = None
+        if browser is None:
+            return False
+        if self._browser_pool is not None:
+            self._browser_pool.give_back(
+                browser, reusable=exc_type is None and not self._disconnected
+            )
+        else:
+            browser.quit()
         return False
 
     def disconnect_driver(self):
+        self._disconnected = True
+        if self._sb is None:
+            # The shared browser keeps running, only the context of this login is closed
+            with self._browser_lock:
+                context = self._context
+                self._context = None
+            if context is not None:
+                context.close()
+            return
         self._sb.reconnect()
         self._sb.driver.quit()
 
+    def kill(self):
+        """
+        Kills the browser and the driver process with all their child processes.
+        Can be called from another thread while the driver hangs.
+        """
+        with self._browser_lock:
+            browser = self._browser
+            self._browser = None
+            context = self._context
+            self._context = None
+        if context is not None:
+            # A hanging context blocks the shared browser for all other contexts
+            self._shared_browser.kill()
+            return
+        if browser is None:
+            return
+        browser.kill()
+        if self._browser_pool is not None:
+            self._browser_pool.discard(browser)
+
     def get_current_url(self) -> str:
-        return self._sb.cdp.get_current_url()
+        return self._cdp.get_current_url()
+
+    def has_cookie(self, name: str) -> bool:
+        # Cookies of the page, a browser context has its own cookies
+        cookies = self._call_cdp(
+            lambda cdp: cdp.loop.run_until_complete(cdp.page.send(mycdp.network.get_cookies()))
+        )
+        return any(cookie.name == name for cookie in cookies)
+
+    def wait_for_url(self, matches: Callable[[str], bool], timeout_ms: int) -> bool:
+        return self._navigation.wait_for_url(self._call_cdp, matches, timeout_ms / 1000)
+
+    def wait_for_network_idle(self, quiet_ms: int, timeout_ms: int) -> bool:
+        return self._navigation.wait_for_network_idle(self._call_cdp, quiet_ms / 1000, timeout_ms / 1000)
+
+    def _call_cdp(self, function: Callable[[CDPMethods], Any]) -> Any:
+        if self._sb is None:
+            # Pages of the shared browser take turns on its event loop
+            return self._cdp.call(function)
+        return function(self._cdp)
 
     def get_page_html(self) -> str:
-        return self._sb.cdp.get_element_html("html")
+        return self._cdp.get_element_html("html")
 
     def is_element_visible(self, xpath: str) -> bool:
-        return self._sb.cdp.is_element_visible(xpath)
+        return self._cdp.is_element_visible(xpath)
 
     def save_screenshot(self, screenshot_id: str):
         if screenshot_id is None:
@@ -40,23 +202,53 @@ class DomInteractionDriver(DomInteractionInterface):
             path = f"../config/images"
         else:
             path = f"/config/images"
-        self._sb.cdp.save_screenshot(os.path.join(path, f"{screenshot_id}.png"), selector="body")
+        self._cdp.save_screenshot(os.path.join(path, f"{screenshot_id}.png"), selector="body")
 
     def find_element(self, xpath: str) -> bool:
-        return self._sb.cdp.find_element(xpath) is not None
-
-    def solve_captcha(self):
-        self._sb.uc_gui_click_captcha()
+        return self._cdp.find_element(xpath) is not None
+
+    def is_element_present(self, xpath: str) -> bool:
+        # find_element waits for the element and raises if it does not appear
+        return self._cdp.is_element_present(xpath)
+
+    def get_input_value(self, xpath: str) -> str | None:
+        # The value property, the value attribute is not updated by typing
+        return self._cdp.evaluate(
+            "document.evaluate(%s, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null)"
+            ".singleNodeValue?.value ?? null" % json.dumps(xpath)
+        )
+
+    def solve_captcha(self) -> bool:
+        if self._gui_browser is None:
+            return self._solve_captcha_if_present(self._cdp.solve_captcha)
+        return self._solve_captcha_if_present(self._gui_browser.gui_click_captcha)
+
+    def has_captcha(self) -> bool:
+        try:
+            return self._cdp.evaluate(CAPTCHA_PROBE_SCRIPT) is True
+        except Exception:
+            # The page is not ready to be checked, the solver checks it itself
+            return True
+
+    def _solve_captcha_if_present(self, solve: Callable[[], Any]) -> bool:
+        self.captcha_stats.probes += 1
+        if not self.has_captcha():
+            return False
+        self.captcha_stats.hits += 1
+        started = time.perf_counter()
+        solve()
+        self.captcha_stats.solve_seconds.append(time.perf_counter() - started)
+        return True
 
     def fill_text(self, xpath: str, value: str):
-        self._sb.cdp.send_keys(xpath, value)
+        self._cdp.send_keys(xpath, value)
 
     def click_button(self, xpath: str):
-        self._sb.cdp.click(xpath)
+        self._cdp.click(xpath)
 
     def open_url(self, url: str):
-        self._sb.cdp.open(url)
+        self._cdp.open(url)
 
     def wait(self, ms: int):
-        self._sb.sleep(ms / 1000)
+        time.sleep(ms / 1000)
 
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Callable
 
 
 class DomInteractionDriverInterface(ABC):
@@ -15,7 +16,19 @@ class DomInteractionDriverInterface(ABC):
         pass
 
     @abstractmethod
-    def solve_captcha(self):
+    def is_element_present(self, xpath: str) -> bool:
+        """
+        Checks the page once without waiting for the element to appear.
+        :return: True if the page contains the element.
+        """
+        pass
+
+    @abstractmethod
+    def solve_captcha(self) -> bool:
+        """
+        Solves the captcha of the page, if the page shows one.
+        :return: True if the page showed a captcha.
+        """
         pass
 
     @abstractmethod
@@ -29,3 +42,54 @@ class DomInteractionDriverInterface(ABC):
     @abstractmethod
     def get_current_url(self) -> str:
         pass
+
+    @abstractmethod
+    def has_cookie(self, name: str) -> bool:
+        """
+        :return: True if a cookie with the name is set for the URL of the page.
+        """
+        pass
+
+    @abstractmethod
+    def get_input_value(self, xpath: str) -> str | None:
+        """
+        :return: Current value of the input element, None if there is no such element.
+        """
+        pass
+
+    def wait_for_element(self, xpath: str, timeout_ms: int) -> bool:
+        """
+        Waits until the element is visible and can be interacted with.
+        This implementation checks the element every 100 milliseconds until the timeout.
+        :param timeout_ms: Time to wait at most in milliseconds.
+        :return: True if the element is visible.
+        """
+        for _ in range(max(timeout_ms // 100, 1)):
+            if self.is_element_visible(xpath):
+                return True
+            self.wait(100)
+        return self.is_element_visible(xpath)
+
+    def wait_for_network_idle(self, quiet_ms: int, timeout_ms: int) -> bool:
+        """
+        Waits until the page did not send or receive anything for the quiet period.
+        This implementation can not observe the network and only waits for the quiet period.
+        :param quiet_ms: Time the network has to be idle in milliseconds.
+        :param timeout_ms: Time to wait at most in milliseconds.
+        :return: True if the network went idle.
+        """
+        self.wait(min(quiet_ms, timeout_ms))
+        return True
+
+    def wait_for_url(self, matches: Callable[[str], bool], timeout_ms: int) -> bool:
+        """
+        Waits until the URL of the page matches or the page settled on another URL.
+        This implementation checks the URL every second until the timeout.
+        :param timeout_ms: Time to wait at most in milliseconds.
+        :return: True if the URL matched.
+        """
+        for _ in range(max(timeout_ms // 1000, 1)):
+            if matches(self.get_current_url()):
+                return True
+            self.wait(1000)
+        return matches(self.get_current_url())
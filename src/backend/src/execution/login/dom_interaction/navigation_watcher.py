@@ -0,0 +1,144 @@
+import asyncio
+import time
+from typing import Any, Callable
+
+import mycdp
+from seleniumbase.core.sb_cdp import CDPMethods
+
+# Seconds the page has to stay idle without navigating or sending requests before it counts as settled.
+# Redirects by scripts, e.g. after a captcha was solved, are often preceded by a moment without events.
+SETTLE_QUIET_SECONDS = 3
+# Longest time the event loop of the browser is run at once, other pages of a shared browser run in between
+_EVENT_SLICE_SECONDS = 0.25
+
+type CDPCall = Callable[[Callable[[CDPMethods], Any]], Any]
+
+
+class NavigationWatcher:
+    """
+    Follows the URL and the loading state of the main frame of a page with CDP events, so a wait returns as
+    soon as the page navigated to the expected URL or settled on another one, instead of polling the URL.
+    Events are only delivered while the event loop of the browser runs, i.e. during CDP calls and waits.
+    """
+
+    def __init__(self):
+        self._url: str | None = None
+        self._main_frame_id: Any = None
+        self._loader_id: Any = None
+        self._settled = False
+        self._last_change = time.monotonic()
+        self._changed = asyncio.Event()
+        self._pending_requests: set[Any] = set()
+        self._last_network_activity = time.monotonic()
+
+    def attach(self, cdp: CDPMethods):
+        cdp.add_handler(mycdp.page.FrameNavigated, self._on_frame_navigated)
+        cdp.add_handler(mycdp.page.NavigatedWithinDocument, self._on_navigated_within_document)
+        cdp.add_handler(mycdp.page.LifecycleEvent, self._on_lifecycle_event)
+        cdp.add_handler(mycdp.network.RequestWillBeSent, self._on_request_will_be_sent)
+        cdp.add_handler(mycdp.network.LoadingFinished, self._on_request_done)
+        cdp.add_handler(mycdp.network.LoadingFailed, self._on_request_done)
+        cdp.loop.run_until_complete(cdp.page.send(mycdp.page.enable()))
+        cdp.loop.run_until_complete(cdp.page.send(mycdp.network.enable()))
+        cdp.loop.run_until_complete(cdp.page.send(mycdp.page.set_lifecycle_events_enabled(enabled=True)))
+
+    def wait_for_url(self, call: CDPCall, matches: Callable[[str], bool], timeout: float) -> bool:
+        """
+        Waits until the URL of the page matches or the page settled on another URL.
+        :param call: Executes a function with the CDP methods of the page.
+        :param timeout: Seconds to wait at most.
+        :return: True if the URL matched.
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        if self._url is None:
+            self._url = call(lambda cdp: cdp.get_current_url())
+        while True:
+            if matches(self._url):
+                return True
+            now = time.monotonic()
+            if now >= deadline:
+                return False
+            quiet_since = max(started, self._last_change)
+            if self._settled and now - quiet_since >= SETTLE_QUIET_SECONDS:
+                return False
+            wait_seconds = min(deadline - now, _EVENT_SLICE_SECONDS)
+            if self._settled:
+                wait_seconds = min(wait_seconds, quiet_since + SETTLE_QUIET_SECONDS - now)
+            call(lambda cdp: cdp.loop.run_until_complete(self._wait_for_change(wait_seconds)))
+
+    def wait_for_network_idle(self, call: CDPCall, quiet: float, timeout: float) -> bool:
+        """
+        Waits until no request of the page is pending and no request was started or finished for the quiet
+        period. The quiet period starts with the wait at the earliest, so requests caused by an action right
+        before the wait, e.g. a click, are awaited as well.
+        :param call: Executes a function with the CDP methods of the page.
+        :param quiet: Seconds the network has to be idle.
+        :param timeout: Seconds to wait at most.
+        :return: True if the network went idle.
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        while True:
+            now = time.monotonic()
+            quiet_since = max(started, self._last_network_activity)
+            if not self._pending_requests and now - quiet_since >= quiet:
+                return True
+            if now >= deadline:
+                return False
+            wait_seconds = min(deadline - now, _EVENT_SLICE_SECONDS)
+            if not self._pending_requests:
+                wait_seconds = min(wait_seconds, quiet_since + quiet - now)
+            call(lambda cdp: cdp.loop.run_until_complete(self._wait_for_change(wait_seconds)))
+
+    async def _wait_for_change(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except TimeoutError:
+            pass
+        self._changed.clear()
+
+    def _change(self):
+        self._last_change = time.monotonic()
+        self._changed.set()
+
+    # Events are delivered with the connection as second argument
+    def _on_frame_navigated(self, event: mycdp.page.FrameNavigated, *_):
+        frame = event.frame
+        if frame.parent_id is not None:
+            return
+        self._main_frame_id = frame.id_
+        self._loader_id = frame.loader_id
+        self._url = frame.url + (frame.url_fragment or "")
+        self._settled = False
+        self._change()
+
+    def _on_navigated_within_document(self, event: mycdp.page.NavigatedWithinDocument, *_):
+        if event.frame_id != self._main_frame_id:
+            return
+        self._url = event.url
+        self._change()
+
+    def _on_lifecycle_event(self, event: mycdp.page.LifecycleEvent, *_):
+        if self._main_frame_id is not None and event.frame_id != self._main_frame_id:
+            return
+        if event.name == "init":
+            # A new document starts loading
+            self._settled = False
+            self._change()
+        elif event.name == "networkIdle" and event.loader_id == self._loader_id:
+            self._settled = True
+            self._change()
+
+    def _on_request_will_be_sent(self, event: mycdp.network.RequestWillBeSent, *_):
+        # Requests of a settled page, e.g. to verify a captcha, can lead to a navigation
+        self._last_change = time.monotonic()
+        self._pending_requests.add(event.request_id)
+        self._last_network_activity = self._last_change
+
+    def _on_request_done(self, event: mycdp.network.LoadingFinished | mycdp.network.LoadingFailed, *_):
+        if event.request_id not in self._pending_requests:
+            return
+        self._pending_requests.discard(event.request_id)
+        self._last_network_activity = time.monotonic()
+        self._changed.set()
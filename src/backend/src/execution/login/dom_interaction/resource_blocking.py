@@ -0,0 +1,134 @@
+import threading
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, List
+
+import mycdp
+from seleniumbase.core.sb_cdp import CDPMethods
+
+
+class BlockedResource(Enum):
+    IMAGE = "image"
+    FONT = "font"
+    MEDIA = "media"
+    TRACKER = "tracker"
+
+
+def _extension_patterns(*extensions: str) -> List[str]:
+    return [f"*://*/*.{extension}" for extension in extensions]
+
+
+def _host_patterns(*hosts: str) -> List[str]:
+    return [f"*://{{*.}}?{host}/*" for host in hosts]
+
+
+# URL patterns in the URLPattern syntax of Chrome, a request is blocked if it matches one of them
+_RESOURCE_URL_PATTERNS: Dict[BlockedResource, List[str]] = {
+    BlockedResource.IMAGE: _extension_patterns("png", "jpg", "jpeg", "gif", "webp", "avif", "bmp", "ico"),
+    BlockedResource.FONT: _extension_patterns("woff", "woff2", "ttf", "otf", "eot"),
+    BlockedResource.MEDIA: _extension_patterns("mp4", "webm", "ogg", "ogv", "mp3", "m4a", "wav", "mov"),
+    BlockedResource.TRACKER: _host_patterns(
+        "google-analytics.com",
+        "googletagmanager.com",
+        "googleadservices.com",
+        "googlesyndication.com",
+        "doubleclick.net",
+        "connect.facebook.net",
+        "hotjar.com",
+        "clarity.ms",
+        "segment.io",
+        "segment.com",
+        "scorecardresearch.com",
+        "nr-data.net",
+    ),
+}
+
+# Captcha challenges need their images and scripts, they are never blocked
+CAPTCHA_URL_PATTERNS = [
+    "*://{*.}?google.com/recaptcha/*",
+    "*://{*.}?gstatic.com/recaptcha/*",
+    "*://{*.}?recaptcha.net/*",
+    "*://{*.}?hcaptcha.com/*",
+    "*://challenges.cloudflare.com/*",
+]
+
+
+def parse_blocked_resources(entries: Iterable[str]) -> List[BlockedResource]:
+    """
+    Parses the configured resource types, invalid types are skipped.
+    """
+    resources = []
+    for entry in entries:
+        try:
+            resources.append(BlockedResource(entry))
+        except ValueError:
+            print(f"Invalid resource type {entry} in BLOCKED_RESOURCE_TYPES")
+    return resources
+
+
+def get_block_patterns(
+    resources: Iterable[BlockedResource], allowed_url_patterns: Iterable[str] = ()
+) -> List[mycdp.network.BlockPattern]:
+    """
+    :param allowed_url_patterns: URLs that are loaded even if they match a blocked resource type.
+    :return: The patterns in the order Chrome evaluates them, the first matching pattern decides.
+        Empty if no resources are blocked.
+    """
+    resources = list(resources)
+    if not resources:
+        return []
+    patterns = [
+        mycdp.network.BlockPattern(url_pattern=pattern, block=False)
+        for pattern in [*CAPTCHA_URL_PATTERNS, *allowed_url_patterns]
+    ]
+    for resource in resources:
+        patterns.extend(
+            mycdp.network.BlockPattern(url_pattern=pattern, block=True)
+            for pattern in _RESOURCE_URL_PATTERNS[resource]
+        )
+    return patterns
+
+
+@dataclass
+class ResourceBlockingStats:
+    blocked_requests: int = 0
+    # Bytes of the requests that were not blocked, as transferred over the network
+    loaded_bytes: int = 0
+
+
+class ResourceBlocker:
+    """
+    Blocks requests of a page inside Chrome, so the blocked requests never reach the network, and counts
+    the blocked requests and the loaded bytes of one login.
+    Blocking applies to the page it is attached to until the page is closed.
+    """
+
+    def __init__(self, block_patterns: List[mycdp.network.BlockPattern]):
+        self._block_patterns = block_patterns
+        self._lock = threading.Lock()
+        self._stats = ResourceBlockingStats()
+
+    def attach(self, cdp: CDPMethods):
+        cdp.add_handler(mycdp.network.LoadingFailed, self._on_loading_failed)
+        cdp.add_handler(mycdp.network.LoadingFinished, self._on_loading_finished)
+        cdp.loop.run_until_complete(cdp.page.send(mycdp.network.enable()))
+        cdp.loop.run_until_complete(
+            cdp.page.send(mycdp.network.set_blocked_urls(url_patterns=self._block_patterns))
+        )
+
+    def get_stats(self) -> ResourceBlockingStats:
+        with self._lock:
+            return ResourceBlockingStats(
+                blocked_requests=self._stats.blocked_requests,
+                loaded_bytes=self._stats.loaded_bytes,
+            )
+
+    # Events are delivered with the connection as second argument
+    def _on_loading_failed(self, event: mycdp.network.LoadingFailed, *_):
+        if event.blocked_reason == mycdp.network.BlockedReason.INSPECTOR:
+            with self._lock:
+                self._stats.blocked_requests += 1
+
+    def _on_loading_finished(self, event: mycdp.network.LoadingFinished, *_):
+        with self._lock:
+            self._stats.loaded_bytes += int(event.encoded_data_length)
@@ -0,0 +1,223 @@
+import asyncio
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Collection, Dict, List, Optional, Type
+from urllib.parse import urlencode, urljoin
+
+import httpx
+from lxml.etree import _Element as Element, HTML
+
+from execution.login.dom_interaction.interfaces.dom_interaction_interface import DomInteractionInterface
+from execution.login.find_form_automatically import LoginFormFinder, XPaths
+from execution.login.success_criteria import SuccessCriteria
+
+# Seconds a single request of the HTTP login may take
+HTTP_LOGIN_TIMEOUT_SECONDS = 30
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36"
+)
+# Input types that are not sent with the form or only when they are the clicked button
+_SKIPPED_INPUT_TYPES = ("submit", "button", "image", "reset", "file")
+
+
+@dataclass
+class FormSubmission:
+    method: str
+    action: str
+    data: List[tuple[str, str]]
+
+
+class StaticHtmlPage(DomInteractionInterface):
+    """
+    Fetched HTML page that the LoginFormFinder can search without a browser. Visibility is derived from the markup,
+    elements hidden by stylesheets or scripts count as visible. Interactions require a browser and are not supported.
+    """
+
+    def __init__(self, url: str, html: str, cookies: Collection[str] = ()):
+        super().__init__(url)
+        self._html = html
+        self._cookies = cookies
+        self.dom = HTML(html)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc: Optional[BaseException], tb) -> Optional[bool]:
+        return False
+
+    def get_page_html(self) -> str:
+        return self._html
+
+    def get_current_url(self) -> str:
+        return self._url
+
+    def find_element(self, xpath: str) -> bool:
+        return len(self.dom.xpath(xpath)) > 0
+
+    def is_element_present(self, xpath: str) -> bool:
+        return self.find_element(xpath)
+
+    def has_cookie(self, name: str) -> bool:
+        return name in self._cookies
+
+    def get_input_value(self, xpath: str) -> str | None:
+        # Nothing can be typed into the page, so the value is the one of the markup
+        elements = self.dom.xpath(xpath)
+        if len(elements) == 0:
+            return None
+        return elements[0].get("value") or ""
+
+    def is_element_visible(self, xpath: str) -> bool:
+        elements = self.dom.xpath(xpath)
+        return len(elements) > 0 and not _is_hidden(elements[0])
+
+    def save_screenshot(self, screenshot_id: str):
+        pass
+
+    def solve_captcha(self) -> bool:
+        return False
+
+    def disconnect_driver(self):
+        pass
+
+    def fill_text(self, xpath: str, value: str):
+        raise NotImplementedError("Filling text requires a browser")
+
+    def click_button(self, xpath: str):
+        raise NotImplementedError("Clicking buttons requires a browser")
+
+    def open_url(self, url: str):
+        raise NotImplementedError("Opening URLs requires a browser")
+
+    def wait(self, ms: int):
+        time.sleep(ms / 1000)
+
+
+def _is_hidden(element: Element) -> bool:
+    if element.tag == "input" and (element.get("type") or "").lower() == "hidden":
+        return True
+    for node in [element, *element.iterancestors()]:
+        style = (node.get("style") or "").replace(" ", "").lower()
+        if node.get("hidden") is not None or "display:none" in style or "visibility:hidden" in style:
+            return True
+    return False
+
+
+def get_form_submission(
+    page: StaticHtmlPage, xpaths: XPaths, username: str, password: str
+) -> FormSubmission | None:
+    """
+    Fills the login form of the page like a browser would submit it.
+    :return: The request that submits the form or None if the fields are not inside a form.
+    """
+    password_field = page.dom.xpath(xpaths.password)[0]
+    form = next(password_field.iterancestors("form"), None)
+    if form is None:
+        return None
+    username_field = page.dom.xpath(xpaths.username)[0]
+    submit_button = page.dom.xpath(xpaths.submit_button)[0] if xpaths.submit_button else None
+
+    data = []
+    for field in form.iter("input", "select", "textarea"):
+        name = field.get("name")
+        if not name or field.get("disabled") is not None:
+            continue
+        if field is username_field:
+            data.append((name, username))
+        elif field is password_field:
+            data.append((name, password))
+        elif field.tag == "select":
+            options = field.xpath(".//option")
+            selected = [option for option in options if option.get("selected") is not None]
+            option = selected[0] if selected else (options[0] if options else None)
+            if option is not None:
+                data.append((name, option.get("value", option.text or "")))
+        elif field.tag == "textarea":
+            data.append((name, field.text or ""))
+        else:
+            field_type = (field.get("type") or "text").lower()
+            if field_type in ("checkbox", "radio"):
+                if field.get("checked") is not None:
+                    data.append((name, field.get("value", "on")))
+            elif field_type in _SKIPPED_INPUT_TYPES:
+                if field is submit_button:
+                    data.append((name, field.get("value", "")))
+            else:
+                data.append((name, field.get("value", "")))
+    if submit_button is not None and submit_button.tag == "button" and submit_button.get("name"):
+        data.append((submit_button.get("name"), submit_button.get("value", "")))
+
+    return FormSubmission(
+        method=(form.get("method") or "get").upper(),
+        action=urljoin(page.get_current_url(), form.get("action") or ""),
+        data=data,
+    )
+
+
+def _meets_criteria(response: httpx.Response, cookies: httpx.Cookies, success_criteria: SuccessCriteria) -> bool:
+    if response.is_error or not success_criteria.matches_url(str(response.url)):
+        return False
+    if success_criteria.selector is None and success_criteria.cookie is None:
+        return True
+    page = StaticHtmlPage(str(response.url), response.text or "<html></html>", cookies=list(cookies.keys()))
+    return success_criteria.is_met(page)
+
+
+async def _http_login(url: str, success_criteria: SuccessCriteria, username: str, password: str) -> bool:
+    async with httpx.AsyncClient(
+        follow_redirects=True,
+        timeout=HTTP_LOGIN_TIMEOUT_SECONDS,
+        headers={"User-Agent": USER_AGENT},
+    ) as client:
+        response = await client.get(url)
+        if response.is_error or "html" not in response.headers.get("content-type", ""):
+            return False
+        page = StaticHtmlPage(str(response.url), response.text)
+        xpaths = LoginFormFinder(driver=page).find_login_automatically()
+        if xpaths is None or xpaths.username is None or xpaths.password is None:
+            return False
+        submission = get_form_submission(page, xpaths, username, password)
+        if submission is None:
+            return False
+
+        headers: Dict[str, str] = {"Referer": page.get_current_url()}
+        if submission.method == "POST":
+            # Encoded manually, fields can occur multiple times
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+            response = await client.post(
+                submission.action, content=urlencode(submission.data), headers=headers
+            )
+        else:
+            response = await client.get(submission.action, params=submission.data, headers=headers)
+        if response.is_error:
+            return False
+        if _meets_criteria(response, client.cookies, success_criteria):
+            return True
+        if not success_criteria.can_open_success_url:
+            return False
+
+        # Like the browser login, the success URL must stay reachable after the login
+        response = await client.get(success_criteria.success_url)
+        return _meets_criteria(response, client.cookies, success_criteria)
+
+
+def http_login(
+    url: str,
+    success_url: str,
+    username: str,
+    password: str,
+    success_criteria: SuccessCriteria | None = None,
+) -> bool:
+    """
+    Logs in with plain HTTP requests. Only works for login forms that are submitted without scripts.
+    :param success_criteria: Conditions of a successful login, by default the URL has to be the success URL.
+    :return: True if the login succeeded, False if the login has to be executed in a browser.
+    """
+    if success_criteria is None:
+        success_criteria = SuccessCriteria(success_url)
+    try:
+        return asyncio.run(_http_login(url, success_criteria, username, password))
+    except Exception:
+        traceback.print_exc()
+        return False
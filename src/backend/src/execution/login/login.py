@@ -1,14 +1,22 @@
+import time
 import traceback
 from typing import Tuple
-from utils.utils import compare_urls
-from .constants import LoginStatusCode, CustomFailedDetailsMessage, TIMEOUT
-from .custom_login.custom_login_methods_driver import CustomLoginMethodsDriver
+from .constants import (
+    LoginStatusCode,
+    CustomFailedDetailsMessage,
+    TIMEOUT,
+    POST_SUBMIT_TIMEOUT,
+    MAX_CAPTCHA_ATTEMPTS,
+    SUCCESS_CONDITIONS_TIMEOUT,
+)
+from .custom_login.custom_login_methods_driver import CustomLoginMethodsDriver, StepCallback
 from .custom_login.parser import CustomLoginScriptParser
 from execution.login.dom_interaction.interfaces.dom_interaction_interface import (
     DomInteractionInterface,
 )
 from .dom_interaction.dom_interaction_driver import DomInteractionDriver
 from .find_form_automatically import XPaths, LoginFormFinder
+from .success_criteria import SuccessCriteria
 
 
 def login(
@@ -18,28 +26,28 @@ def login(
     password: str,
     custom_login_script: str | None = None,
     screenshot_id: str | None = None,
+    driver: DomInteractionInterface | None = None,
+    success_criteria: SuccessCriteria | None = None,
+    on_step: StepCallback | None = None,
 ) -> Tuple[LoginStatusCode, CustomFailedDetailsMessage]:
+    if driver is None:
+        driver = DomInteractionDriver(url=url)
+    if success_criteria is None:
+        success_criteria = SuccessCriteria(success_url)
     try:
-        with DomInteractionDriver(url=url) as driver:
+        with driver:
             try:
                 status = _execute_interaction(
-                    driver, custom_login_script, username, password
+                    driver, custom_login_script, username, password, on_step
                 )
 
                 if status is not None:
                     driver.save_screenshot(screenshot_id)
                     return status
 
-                # Redirect to success url
-                driver.open_url(success_url)
-
-                # Wait for expected url
-                for i in range(TIMEOUT):
-                    driver.solve_captcha()
-                    driver.wait(1000)
-                    if compare_urls(driver.get_current_url(), success_url):
-                        driver.save_screenshot(screenshot_id)
-                        return LoginStatusCode.SUCCESS, None
+                if _wait_for_success(driver, success_criteria):
+                    driver.save_screenshot(screenshot_id)
+                    return LoginStatusCode.SUCCESS, None
                 driver.save_screenshot(screenshot_id)
 
             except Exception:
@@ -61,11 +69,60 @@ def login(
         return LoginStatusCode.UNKNOWN_EXECUTION_ERROR, None
 
 
+def _wait_for_success(driver: DomInteractionInterface, success_criteria: SuccessCriteria) -> bool:
+    """
+    Most logins redirect to the success page after the submit, so the success url is only opened
+    if the page after the submit does not meet the success criteria. Pages that never settle would use up
+    the whole timeout, so the page after the submit only gets a short wait if the success url can be opened.
+    """
+    if not success_criteria.can_open_success_url:
+        return _wait_for_success_page(driver, success_criteria, time.monotonic() + TIMEOUT)
+    if _wait_for_success_page(driver, success_criteria, time.monotonic() + POST_SUBMIT_TIMEOUT):
+        return True
+    # Redirect to success url
+    driver.open_url(success_criteria.success_url)
+    return _wait_for_success_page(driver, success_criteria, time.monotonic() + TIMEOUT)
+
+
+def _wait_for_success_page(
+    driver: DomInteractionInterface, success_criteria: SuccessCriteria, deadline: float
+) -> bool:
+    """
+    Waits until the page reaches a matching url. A captcha can hold back the redirect,
+    so when the page settles on another url that shows a captcha, the captcha is solved and the page gets another chance.
+    """
+    captcha_attempts = 0
+    while True:
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            return False
+        if driver.wait_for_url(success_criteria.matches_url, remaining_ms):
+            return _wait_for_success_conditions(driver, success_criteria, deadline)
+        if captcha_attempts >= MAX_CAPTCHA_ATTEMPTS or not driver.solve_captcha():
+            return False
+        captcha_attempts += 1
+
+
+def _wait_for_success_conditions(
+    driver: DomInteractionInterface, success_criteria: SuccessCriteria, deadline: float
+) -> bool:
+    """
+    Elements and cookies can appear shortly after the page reached the success url.
+    """
+    conditions_deadline = min(deadline, time.monotonic() + SUCCESS_CONDITIONS_TIMEOUT)
+    while not success_criteria.is_met(driver):
+        if time.monotonic() >= conditions_deadline:
+            return False
+        driver.wait(500)
+    return True
+
+
 def _execute_interaction(
     driver: DomInteractionInterface,
     custom_login_script: str | None,
     username: str,
     password: str,
+    on_step: StepCallback | None = None,
 ) -> Tuple[LoginStatusCode, CustomFailedDetailsMessage] | None:
     xpaths = None
     xpath_not_found_error = None
@@ -88,7 +145,7 @@ def _execute_interaction(
     else:
         xpaths = _find_elements(driver=driver)
     custom_login_seleniumbase = CustomLoginMethodsDriver(
-        driver=driver, x_paths=xpaths, username=username, password=password
+        driver=driver, x_paths=xpaths, username=username, password=password, on_step=on_step
     )
     parser = CustomLoginScriptParser(custom_login_seleniumbase)
     exception = parser.execute(custom_login_script)
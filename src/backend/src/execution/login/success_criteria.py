@@ -0,0 +1,91 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+from urllib.parse import urlsplit
+
+from dataAccess.database.database import SuccessUrlMatch, Website
+from execution.login.dom_interaction.interfaces.dom_interaction_interface import DomInteractionInterface
+from utils.utils import compare_urls
+
+
+@lru_cache(maxsize=256)
+def get_url_matcher(url_match: SuccessUrlMatch, pattern: str) -> Callable[[str], bool]:
+    """
+    Compiles the pattern once, the matcher is reused by every login of the website.
+    :raises re.error: If the regular expression is invalid.
+    """
+    if url_match == SuccessUrlMatch.PREFIX:
+        return _prefix_matcher(pattern)
+    if url_match == SuccessUrlMatch.GLOB:
+        # Only * is a wildcard, ? and [ are common in URLs and match themselves
+        return re.compile(".*".join(map(re.escape, pattern.split("*")))).fullmatch
+    if url_match == SuccessUrlMatch.REGEX:
+        return re.compile(pattern).fullmatch
+    return lambda url: compare_urls(url, pattern)
+
+
+def _prefix_matcher(prefix: str) -> Callable[[str], bool]:
+    """
+    Matches URLs with the same scheme and host whose path starts with the path segments of the prefix,
+    so https://example.com/app matches https://example.com/app/1 but not https://example.com.evil/app
+    or https://example.com/apple.
+    """
+    parsed_prefix = urlsplit(prefix)
+    scheme = parsed_prefix.scheme.lower()
+    host = parsed_prefix.netloc.lower()
+    path = parsed_prefix.path.rstrip("/")
+
+    def matches(url: str) -> bool:
+        parsed_url = urlsplit(url)
+        if parsed_url.scheme.lower() != scheme or parsed_url.netloc.lower() != host:
+            return False
+        return parsed_url.path == path or parsed_url.path.startswith(path + "/")
+
+    return matches
+
+
+@dataclass(frozen=True)
+class SuccessCriteria:
+    """
+    Conditions a page has to meet after a successful login. All configured conditions have to be met.
+    :param success_url: URL or, depending on url_match, pattern the URL of the page has to match.
+    :param selector: XPath of an element that has to be present, e.g. a logout button.
+    :param cookie: Name of a cookie that has to be set, e.g. the session cookie.
+    """
+
+    success_url: str
+    url_match: SuccessUrlMatch = SuccessUrlMatch.EXACT
+    selector: str | None = None
+    cookie: str | None = None
+
+    @staticmethod
+    def from_website(website: Website) -> "SuccessCriteria":
+        return SuccessCriteria(
+            success_url=website.success_url,
+            url_match=website.success_url_match,
+            selector=website.success_selector,
+            cookie=website.success_cookie,
+        )
+
+    @property
+    def can_open_success_url(self) -> bool:
+        """
+        Glob and regex patterns are no URL that could be opened.
+        """
+        return self.url_match in (SuccessUrlMatch.EXACT, SuccessUrlMatch.PREFIX)
+
+    def matches_url(self, url: str) -> bool:
+        return get_url_matcher(self.url_match, self.success_url)(url)
+
+    def is_met(self, driver: DomInteractionInterface) -> bool:
+        """
+        Checks the page the driver is on.
+        """
+        if not self.matches_url(driver.get_current_url()):
+            return False
+        if self.selector is not None and not driver.is_element_present(self.selector):
+            return False
+        if self.cookie is not None and not driver.has_cookie(self.cookie):
+            return False
+        return True
@@ -0,0 +1,251 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List
+
+# Number of recent wait times that are kept per user
+WAIT_TIME_WINDOW = 100
+
+
+@dataclass
+class LoginJob:
+    website_id: int
+    host: str
+    user_id: int
+    # Time the account of the website expires without a successful login
+    deadline: datetime | None = None
+    # Next schedule of the website when the login was queued
+    scheduled_at: datetime | None = None
+    enqueued_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+
+
+@dataclass
+class WaitTimeStats:
+    jobs: int
+    average_seconds: float
+    max_seconds: float
+
+
+class LoginQueue:
+    """
+    Thread safe queue of login jobs that are due and wait for a free login worker.
+    Every website is queued at most once.
+
+    To be polite to the websites, only max_per_host logins run against the same host at the same time
+    and consecutive logins to the same host are started at least host_min_interval seconds apart.
+    Jobs of a saturated host keep waiting while jobs of other hosts are executed.
+
+    Users share the workers with weighted fair queuing, so a user with many websites can not starve
+    a user with only a few. Each user gets a share proportional to its weight and at most max_per_user
+    of its logins run at the same time (0 disables the limit).
+
+    Jobs whose deadline is within the danger window are urgent and run before all other jobs,
+    earliest deadline first. Otherwise the jobs of a user are executed earliest deadline first,
+    jobs without deadline last.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = 1,
+        host_min_interval: float = 0,
+        max_per_user: int = 0,
+        user_weights: Dict[int, float] | None = None,
+        danger_window: timedelta = timedelta(0),
+    ):
+        self._condition = threading.Condition()
+        self._jobs: List[LoginJob] = []
+        self._closed = False
+        self._max_per_host = max_per_host
+        self._host_min_interval = host_min_interval
+        self._running_per_host: Dict[str, int] = {}
+        self._last_start_per_host: Dict[str, float] = {}
+        self._max_per_user = max_per_user
+        self._user_weights = user_weights if user_weights is not None else {}
+        self._running_per_user: Dict[int, int] = {}
+        # Virtual finish time of the last started job per user and virtual time of the queue
+        self._user_virtual_time: Dict[int, float] = {}
+        self._virtual_time = 0.0
+        self._wait_times: Dict[int, Deque[float]] = {}
+        self._danger_window = danger_window
+
+    def put(self, job: LoginJob) -> bool:
+        """
+        Adds a job to the queue.
+        :return: False if a job for the same website is already waiting or the queue is closed.
+        """
+        with self._condition:
+            if self._closed:
+                return False
+            if any(queued.website_id == job.website_id for queued in self._jobs):
+                return False
+            self._jobs.append(job)
+            self._condition.notify_all()
+            return True
+
+    def get(self) -> LoginJob | None:
+        """
+        Blocks until a job can be executed and removes it from the queue.
+        Every job returned must be marked as finished with task_done.
+        :return: The next job or None when the queue was closed.
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                now = time.monotonic()
+                job = self._select_next(now)
+                if job is not None:
+                    self._start_job(job, now)
+                    return job
+                self._condition.wait(timeout=self._next_eligible_in(now))
+
+    def task_done(self, job: LoginJob):
+        """
+        Marks a job returned by get as finished and frees its host and user slot.
+        """
+        with self._condition:
+            running = self._running_per_host.get(job.host, 0) - 1
+            if running > 0:
+                self._running_per_host[job.host] = running
+            else:
+                self._running_per_host.pop(job.host, None)
+            running = self._running_per_user.get(job.user_id, 0) - 1
+            if running > 0:
+                self._running_per_user[job.user_id] = running
+            else:
+                self._running_per_user.pop(job.user_id, None)
+            self._condition.notify_all()
+
+    def remove(self, website_id: int) -> bool:
+        """
+        Removes a waiting job of a website.
+        :return: True if a job was removed.
+        """
+        with self._condition:
+            for job in self._jobs:
+                if job.website_id == website_id:
+                    self._jobs.remove(job)
+                    return True
+            return False
+
+    def close(self):
+        """
+        Drops all waiting jobs and wakes up all consumers.
+        """
+        with self._condition:
+            self._closed = True
+            self._jobs.clear()
+            self._condition.notify_all()
+
+    def throttled(self) -> int:
+        """
+        Returns the number of waiting jobs that are held back by the per host or per user limits.
+        """
+        with self._condition:
+            now = time.monotonic()
+            return sum(1 for job in self._jobs if not self._available(job, now))
+
+    def get_wait_times(self) -> Dict[int, WaitTimeStats]:
+        """
+        Returns statistics of the recent time jobs waited in the queue per user.
+        """
+        with self._condition:
+            return {
+                user_id: WaitTimeStats(
+                    jobs=len(wait_times),
+                    average_seconds=sum(wait_times) / len(wait_times),
+                    max_seconds=max(wait_times),
+                )
+                for user_id, wait_times in self._wait_times.items()
+            }
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._jobs)
+
+    def _select_next(self, now: float) -> LoginJob | None:
+        """
+        Selects the available urgent job with the earliest deadline. Without urgent jobs, the available job
+        with the smallest virtual finish time is selected, ties are broken by the earliest deadline.
+        """
+        danger_deadline = datetime.now(timezone.utc) + self._danger_window
+        urgent_job = None
+        next_job = None
+        next_key = None
+        for job in self._jobs:
+            if not self._available(job, now):
+                continue
+            if job.deadline is not None and job.deadline <= danger_deadline:
+                if urgent_job is None or job.deadline < urgent_job.deadline:
+                    urgent_job = job
+                continue
+            finish_time = self._virtual_start_time(job.user_id) + self._virtual_cost(
+                job.user_id
+            )
+            key = (finish_time, job.deadline or datetime.max.replace(tzinfo=timezone.utc))
+            if next_key is None or key < next_key:
+                next_job = job
+                next_key = key
+        return urgent_job if urgent_job is not None else next_job
+
+    def _start_job(self, job: LoginJob, now: float):
+        self._jobs.remove(job)
+        self._running_per_host[job.host] = self._running_per_host.get(job.host, 0) + 1
+        self._last_start_per_host[job.host] = now
+        self._running_per_user[job.user_id] = (
+            self._running_per_user.get(job.user_id, 0) + 1
+        )
+
+        start_time = self._virtual_start_time(job.user_id)
+        self._user_virtual_time[job.user_id] = start_time + self._virtual_cost(
+            job.user_id
+        )
+        self._virtual_time = start_time
+
+        job.started_at = datetime.now(timezone.utc)
+        wait_time = (job.started_at - job.enqueued_at).total_seconds()
+        self._wait_times.setdefault(
+            job.user_id, deque(maxlen=WAIT_TIME_WINDOW)
+        ).append(wait_time)
+
+    def _virtual_start_time(self, user_id: int) -> float:
+        # Users that were idle do not get credit for the time they did not use
+        return max(self._user_virtual_time.get(user_id, 0.0), self._virtual_time)
+
+    def _virtual_cost(self, user_id: int) -> float:
+        return 1 / self._user_weights.get(user_id, 1.0)
+
+    def _available(self, job: LoginJob, now: float) -> bool:
+        return self._host_available(job.host, now) and self._user_available(job.user_id)
+
+    def _user_available(self, user_id: int) -> bool:
+        if self._max_per_user <= 0:
+            return True
+        return self._running_per_user.get(user_id, 0) < self._max_per_user
+
+    def _host_available(self, host: str, now: float) -> bool:
+        if self._running_per_host.get(host, 0) >= self._max_per_host:
+            return False
+        last_start = self._last_start_per_host.get(host)
+        return last_start is None or now - last_start >= self._host_min_interval
+
+    def _next_eligible_in(self, now: float) -> float | None:
+        """
+        Returns the seconds until a host that is only blocked by the minimum spacing becomes available.
+        None if no waiting job becomes available without another job finishing.
+        """
+        wait_times = []
+        for job in self._jobs:
+            if self._running_per_host.get(job.host, 0) >= self._max_per_host:
+                continue
+            if not self._user_available(job.user_id):
+                continue
+            last_start = self._last_start_per_host.get(job.host)
+            if last_start is not None:
+                wait_times.append(last_start + self._host_min_interval - now)
+        if not wait_times:
+            return None
+        return max(min(wait_times), 0)
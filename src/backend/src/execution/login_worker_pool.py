@@ -0,0 +1,337 @@
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from execution.login.dom_interaction.browser_context import SharedBrowser
+from execution.login.dom_interaction.browser_pool import BrowserPool, BrowserPoolStats
+from execution.login.dom_interaction.browser_profiles import BrowserProfile
+from execution.login.dom_interaction.display_pool import DisplayPool
+from execution.login.dom_interaction.dom_interaction_driver import DomInteractionDriver
+from execution.login.dom_interaction.resource_blocking import ResourceBlocker
+from execution.login_queue import LoginJob, LoginQueue, WaitTimeStats
+
+# Seconds stop waits for each worker to return after its browser was killed
+STOP_TIMEOUT_SECONDS = 10
+
+
+@dataclass
+class LoginWorkerStatus:
+    worker_id: int
+    busy: bool
+    website_id: int | None
+    jobs_executed: int
+    utilisation: float
+
+
+@dataclass
+class LoginWorkerPoolStatus:
+    queue_depth: int
+    throttled_jobs: int
+    workers: List[LoginWorkerStatus]
+    wait_times: Dict[int, WaitTimeStats]
+    timed_out_jobs: int
+    browser_pool: BrowserPoolStats | None
+
+
+class LoginWorker(threading.Thread):
+    """
+    Worker thread that takes login jobs from the queue and executes them one after another.
+    Every worker owns the browser driver of the job it is currently executing.
+    """
+
+    def __init__(
+        self,
+        worker_id: int,
+        queue: LoginQueue,
+        execute: Callable[["LoginWorker", LoginJob], None],
+        browser_pool: BrowserPool | None = None,
+        shared_browser: SharedBrowser | None = None,
+        display_pool: DisplayPool | None = None,
+    ):
+        super().__init__(name=f"login-worker-{worker_id}", daemon=True)
+        self.worker_id = worker_id
+        self.driver: DomInteractionDriver | None = None
+        self._browser_pool = browser_pool
+        self._shared_browser = shared_browser
+        self._display_pool = display_pool
+        self._queue = queue
+        self._execute = execute
+        self._lock = threading.Lock()
+        self._current_job: LoginJob | None = None
+        self._jobs_executed = 0
+        self._busy_seconds = 0.0
+        self._busy_since: float | None = None
+        self._started_at = time.monotonic()
+        self._abandoned = False
+
+    def create_driver(
+        self,
+        url: str,
+        isolated: bool = False,
+        resource_blocker: ResourceBlocker | None = None,
+        profile: BrowserProfile | None = None,
+    ) -> DomInteractionDriver:
+        """
+        Creates the browser driver for the job that is currently executed by this worker.
+        :param url: The URL the browser should open.
+        :param isolated: Run the login in an isolated context of the shared browser instead of a dedicated browser.
+        :param resource_blocker: Blocks resources the login does not need.
+        :param profile: Persistent profile of the website, the login then runs in a browser of its own.
+        """
+        self.driver = DomInteractionDriver(
+            url=url,
+            browser_pool=self._browser_pool,
+            shared_browser=self._shared_browser if isolated else None,
+            display_pool=self._display_pool,
+            resource_blocker=resource_blocker,
+            profile=profile,
+        )
+        return self.driver
+
+    @property
+    def abandoned(self) -> bool:
+        """
+        True if the worker was replaced because its job timed out. The results of the job must be discarded.
+        """
+        with self._lock:
+            return self._abandoned
+
+    def run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                self._current_job = job
+                self._busy_since = time.monotonic()
+            try:
+                self._execute(self, job)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                with self._lock:
+                    abandoned = self._abandoned
+                    if not abandoned:
+                        self._finish_job()
+                        self.driver = None
+            if abandoned:
+                return
+            self._queue.task_done(job)
+
+    def busy_for(self) -> float:
+        """
+        Returns the seconds the current job is running, 0 if the worker is idle.
+        """
+        with self._lock:
+            if self._busy_since is None:
+                return 0.0
+            return time.monotonic() - self._busy_since
+
+    def abandon(self) -> LoginJob | None:
+        """
+        Gives up the current job, so a new worker can take over. The worker thread exits as soon as the job returns.
+        :return: The job that was running or None if the worker was idle.
+        """
+        with self._lock:
+            job = self._current_job
+            if job is None or self._abandoned:
+                return None
+            self._abandoned = True
+            self._finish_job()
+            return job
+
+    def _finish_job(self):
+        self._busy_seconds += time.monotonic() - self._busy_since
+        self._busy_since = None
+        self._current_job = None
+        self._jobs_executed += 1
+
+    def get_status(self) -> LoginWorkerStatus:
+        with self._lock:
+            now = time.monotonic()
+            busy_seconds = self._busy_seconds
+            if self._busy_since is not None:
+                busy_seconds += now - self._busy_since
+            uptime = now - self._started_at
+            return LoginWorkerStatus(
+                worker_id=self.worker_id,
+                busy=self._current_job is not None,
+                website_id=(
+                    self._current_job.website_id
+                    if self._current_job is not None
+                    else None
+                ),
+                jobs_executed=self._jobs_executed,
+                utilisation=busy_seconds / uptime if uptime > 0 else 0.0,
+            )
+
+
+class LoginWorkerPool:
+    """
+    Fixed size pool of login workers that share one queue of due login jobs.
+
+    If a timeout is set, a watchdog abandons jobs that run longer than timeout seconds. on_timeout is called
+    with the hung worker to clean up, then a new worker takes over its slot.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        execute: Callable[[LoginWorker, LoginJob], None],
+        queue: LoginQueue | None = None,
+        timeout: float = 0,
+        on_timeout: Callable[[LoginWorker, LoginJob], None] | None = None,
+        browser_pool: BrowserPool | None = None,
+        shared_browser: SharedBrowser | None = None,
+        display_pool: DisplayPool | None = None,
+    ):
+        self.queue = queue if queue is not None else LoginQueue()
+        self.browser_pool = browser_pool
+        self.shared_browser = shared_browser
+        self.display_pool = display_pool
+        self._size = size
+        self._execute = execute
+        self._workers: List[LoginWorker] = []
+        self._timeout = timeout
+        self._on_timeout = on_timeout
+        self._timed_out_jobs = 0
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        self._stopped.clear()
+        if self.browser_pool is not None:
+            self.browser_pool.start()
+        for worker_id in range(self._size):
+            worker = LoginWorker(
+                worker_id,
+                self.queue,
+                self._execute,
+                self.browser_pool,
+                self.shared_browser,
+                self.display_pool,
+            )
+            self._workers.append(worker)
+            worker.start()
+        if self._timeout > 0:
+            self._watchdog = threading.Thread(
+                target=self._watch, name="login-watchdog", daemon=True
+            )
+            self._watchdog.start()
+
+    def stop(self):
+        """
+        Drops all waiting jobs and aborts the running jobs by killing their browsers.
+        A worker that does not return within STOP_TIMEOUT_SECONDS, e.g. because its job hangs outside the browser,
+        is left behind, so a hung login can not block the shutdown.
+        """
+        self.queue.close()
+        workers = list(self._workers)
+        for worker in workers:
+            driver = worker.driver
+            if driver is not None:
+                try:
+                    driver.kill()
+                except Exception:
+                    traceback.print_exc()
+        deadline = time.monotonic() + STOP_TIMEOUT_SECONDS
+        for worker in workers:
+            worker.join(max(0.0, deadline - time.monotonic()))
+            if worker.is_alive():
+                print(f"Login worker {worker.worker_id} did not stop in time and is left behind")
+        # The watchdog keeps watching the workers until they returned
+        self._stopped.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+        self._workers.clear()
+        if self.browser_pool is not None:
+            self.browser_pool.close()
+        if self.shared_browser is not None:
+            self.shared_browser.close()
+        if self.display_pool is not None:
+            self.display_pool.close()
+
+    def submit(self, job: LoginJob) -> bool:
+        """
+        Queues a login job.
+        :return: False if the website is already waiting for execution.
+        """
+        return self.queue.put(job)
+
+    def discard(self, website_id: int):
+        """
+        Removes a waiting job of a website. Running jobs are not affected.
+        """
+        self.queue.remove(website_id)
+
+    def is_idle(self) -> bool:
+        """
+        True if no job is waiting or running.
+        """
+        return len(self.queue) == 0 and all(
+            not worker.get_status().busy for worker in list(self._workers)
+        )
+
+    def suspend_browsers(self):
+        """
+        Closes the browsers and virtual displays that are kept running between logins.
+        """
+        if self.browser_pool is not None:
+            self.browser_pool.suspend()
+        if self.shared_browser is not None:
+            self.shared_browser.close_if_idle()
+        if self.display_pool is not None:
+            self.display_pool.close_idle()
+
+    def resume_browsers(self):
+        if self.browser_pool is not None:
+            self.browser_pool.resume()
+
+    def get_status(self) -> LoginWorkerPoolStatus:
+        return LoginWorkerPoolStatus(
+            queue_depth=len(self.queue),
+            throttled_jobs=self.queue.throttled(),
+            workers=[worker.get_status() for worker in list(self._workers)],
+            wait_times=self.queue.get_wait_times(),
+            timed_out_jobs=self._timed_out_jobs,
+            browser_pool=(
+                self.browser_pool.get_stats() if self.browser_pool is not None else None
+            ),
+        )
+
+    def _watch(self):
+        interval = min(1.0, self._timeout / 10)
+        while not self._stopped.wait(interval):
+            for index, worker in enumerate(list(self._workers)):
+                if worker.busy_for() > self._timeout:
+                    self._replace_worker(index, worker)
+
+    def _replace_worker(self, index: int, worker: LoginWorker):
+        job = worker.abandon()
+        if job is None:
+            return
+        self._timed_out_jobs += 1
+        print(
+            f"Login of website {job.website_id} exceeded {self._timeout:.0f} seconds "
+            f"and was aborted on login worker {worker.worker_id}"
+        )
+        try:
+            if self._on_timeout is not None:
+                self._on_timeout(worker, job)
+        except Exception:
+            traceback.print_exc()
+        finally:
+            replacement = LoginWorker(
+                worker.worker_id,
+                self.queue,
+                self._execute,
+                self.browser_pool,
+                self.shared_browser,
+                self.display_pool,
+            )
+            self._workers[index] = replacement
+            replacement.start()
+            self.queue.task_done(job)
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta, timezone
 import apprise
 from enum import Enum
+from typing import Dict
 from dataAccess.data_access_internal import DataAccessInternal
 from dataAccess.database.database import (
     ActionHistory,
@@ -29,6 +30,7 @@ class NotificationManager:
     def __init__(self, data_access: DataAccessInternal):
         self.notifier = apprise.Apprise()
         self.data_access = data_access
+        self._apprise_tokens: Dict[int, str] = {}
         self._init_notifications()
 
     def _init_notifications(self):
@@ -37,6 +39,7 @@ class NotificationManager:
 
     def add_notification(self, notification: Notification):
         self.notifier.add(notification.apprise_token, tag=str(notification.id))
+        self._apprise_tokens[notification.id] = notification.apprise_token
 
     def test_notification(self, notification: Notification):
         self.notifier.add(notification.apprise_token, tag=str(notification.id))
@@ -47,10 +50,18 @@ class NotificationManager:
 
     def updated_notifications(self):
         self.notifier.clear()
+        self._apprise_tokens.clear()
         self._init_notifications()
 
     def notify(self, action_history: ActionHistory):
-        for notification in self.data_access.get_notifications_for_user(action_history):
+        notifications = self.data_access.get_notifications_for_user(action_history)
+        # Notifications can be changed by another process, when the logins run in the scheduler worker
+        if any(
+            self._apprise_tokens.get(notification.id) != notification.apprise_token
+            for notification in notifications
+        ):
+            self.updated_notifications()
+        for notification in notifications:
             title = NotificationManager._replace_variables(
                 notification.title, action_history
             )
@@ -87,6 +98,9 @@ class NotificationManager:
             ActionFailedDetails.SUBMIT_BUTTON_NOT_FOUND: "Submit button not found",
             ActionFailedDetails.SUCCESS_URL_DID_NOT_MATCH: "The success URL did not match after login attempt",
             ActionFailedDetails.UNKNOWN_EXECUTION_ERROR: "An unknown error occurred while executing task",
+            ActionFailedDetails.EXECUTION_TIMEOUT: "The login did not finish in time and was aborted",
+            ActionFailedDetails.SITE_UNREACHABLE: "The website was not reachable",
+            ActionFailedDetails.WAIT_TIMEOUT: "A wait of the custom login script timed out",
         }
 
         main_message = failed_details_messages.get(
@@ -1,38 +1,227 @@
+import math
+import time
+import traceback
 import uuid
-from datetime import datetime, timezone
-from apscheduler.events import EVENT_JOB_ERROR, JobExecutionEvent
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Set, Tuple
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_MISSED, JobExecutionEvent
 from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.jobstores.base import JobLookupError
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.util import datetime_to_utc_timestamp
 from pytz import utc
 
 from dataAccess.data_access_internal import DataAccessInternal
-from dataAccess.database.database import ActionHistory, ActionStatusCode
+from dataAccess.database.change_database import ScheduleEntry
+from dataAccess.database.database import (
+    ActionFailedDetails,
+    ActionHistory,
+    ActionStatusCode,
+    BrowserProfileMode,
+    ExecutionEngine,
+    Website,
+    engine,
+)
 from endpoints.webhooks.webhook_endpoints import WebhookEndpoints
+from execution.constants import (
+    LOGIN_WORKERS,
+    LOGIN_TIMEOUT_SECONDS,
+    PREFLIGHT_CHECK,
+    BROWSER_PROFILES_DIR,
+    BROWSER_PROFILES_MAX_MB,
+    BROWSER_PROFILE_CACHE_MB,
+    BROWSER_PROFILES_GC_INTERVAL_MINUTES,
+    BLOCKED_RESOURCE_TYPES,
+    RESOURCE_BLOCKING_ALLOWLIST,
+    SITE_UNREACHABLE_RETRY_MINUTES,
+    BROWSER_POOL_SIZE,
+    BROWSER_PREWARM_SECONDS,
+    BROWSER_PREWARM_INTERVAL_SECONDS,
+    IDLE_TEARDOWN_MINUTES,
+    IDLE_CHECK_INTERVAL_SECONDS,
+    BROWSER_ISOLATION,
+    BROWSER_ISOLATION_CONTEXT,
+    BROWSER_CONTEXT_FALLBACK_HOURS,
+    BROWSER_RECYCLE_JOBS,
+    BROWSER_RECYCLE_MEMORY_MB,
+    LOGIN_MAX_PER_HOST,
+    LOGIN_HOST_MIN_INTERVAL_SECONDS,
+    LOGIN_MAX_PER_USER,
+    LOGIN_USER_WEIGHTS,
+    CATCH_UP_WINDOW_MINUTES,
+    EXPIRATION_DANGER_WINDOW_HOURS,
+    ESTIMATED_LOGIN_SECONDS,
+    SCHEDULER_PERSISTENT_JOBS,
+    VIRTUAL_DISPLAYS,
+    VIRTUAL_DISPLAY_START,
+)
+from execution.login.dom_interaction.browser_context import SharedBrowser
+from execution.login.dom_interaction.display_pool import DisplayPool
+from execution.login.dom_interaction.browser_profiles import BrowserProfiles
+from execution.login.dom_interaction.browser_pool import (
+    BrowserPool,
+    BrowserRecyclePolicy,
+    RecycleReason,
+)
+from execution.login.dom_interaction.resource_blocking import (
+    ResourceBlocker,
+    get_block_patterns,
+    parse_blocked_resources,
+)
+from execution.login.http_login import http_login
 from execution.login.login import LoginStatusCode, login
+from execution.login.preflight import check_reachability
+from execution.login.success_criteria import SuccessCriteria
+from execution.login_queue import LoginJob, LoginQueue
+from execution.login_worker_pool import LoginWorker, LoginWorkerPool, LoginWorkerPoolStatus
+from execution.scheduler_job_store import SchedulerJobStore
+from execution.scheduler_metrics import SchedulerMetrics, SchedulerMetricsSnapshot
+from utils.exceptions import NotFoundException
+from utils.utils import get_url_host
+
+
+# Job store of the internal jobs, which are not persisted
+INTERNAL_JOB_STORE = "internal"
 
 
 class Scheduler:
+    # Scheduler that executes the persisted jobs
+    _instance: "Scheduler | None" = None
+
     def __init__(
         self,
         data_access_internal: DataAccessInternal,
         webhook_endpoints: WebhookEndpoints,
+        persistent_jobs: bool = SCHEDULER_PERSISTENT_JOBS,
     ):
         self.data_access = data_access_internal
         self.webhook_endpoints = webhook_endpoints
+        self._job_store = SchedulerJobStore(engine=engine) if persistent_jobs else None
+        self.metrics = SchedulerMetrics()
+        self._resources_suspended = False
+        # Websites whose login failed in a browser context and succeeded in a dedicated browser, with the
+        # monotonic time until which they use a dedicated browser. Kept in memory only, a restart tries
+        # all websites in a browser context again
+        self._dedicated_browser_websites: Dict[int, float] = {}
+        # Websites whose login failed in a browser context, their next login is tried in a dedicated browser
+        self._dedicated_browser_trials: Set[int] = set()
+        self._browser_profiles = BrowserProfiles(
+            BROWSER_PROFILES_DIR, BROWSER_PROFILES_MAX_MB, BROWSER_PROFILE_CACHE_MB
+        )
+        # Blocked during the logins of websites with resource blocking
+        self._block_patterns = get_block_patterns(
+            parse_blocked_resources(BLOCKED_RESOURCE_TYPES), RESOURCE_BLOCKING_ALLOWLIST
+        )
+        # Scheduled jobs only queue the login, the login itself is executed by the worker pool
         self.scheduler = AsyncIOScheduler(
-            executors={"default": ThreadPoolExecutor(1)}, timezone=utc
+            executors={"default": ThreadPoolExecutor(1)},
+            jobstores={
+                **({"default": self._job_store} if self._job_store else {}),
+                INTERNAL_JOB_STORE: MemoryJobStore(),
+            },
+            timezone=utc,
+        )
+        recycle_policy = BrowserRecyclePolicy(
+            max_jobs=BROWSER_RECYCLE_JOBS, max_memory_mb=BROWSER_RECYCLE_MEMORY_MB
+        )
+        display_pool = DisplayPool(VIRTUAL_DISPLAY_START) if VIRTUAL_DISPLAYS else None
+        self.worker_pool = LoginWorkerPool(
+            size=LOGIN_WORKERS,
+            execute=self._execute_job,
+            queue=LoginQueue(
+                max_per_host=LOGIN_MAX_PER_HOST,
+                host_min_interval=LOGIN_HOST_MIN_INTERVAL_SECONDS,
+                max_per_user=LOGIN_MAX_PER_USER,
+                user_weights=LOGIN_USER_WEIGHTS,
+                danger_window=timedelta(hours=EXPIRATION_DANGER_WINDOW_HOURS),
+            ),
+            timeout=LOGIN_TIMEOUT_SECONDS,
+            on_timeout=self._on_job_timeout,
+            browser_pool=(
+                BrowserPool(
+                    BROWSER_POOL_SIZE,
+                    recycle_policy=recycle_policy,
+                    on_recycle=self._on_browser_recycle,
+                    display_pool=display_pool,
+                    max_prewarmed=LOGIN_WORKERS,
+                )
+                if BROWSER_POOL_SIZE > 0 or BROWSER_PREWARM_SECONDS > 0
+                else None
+            ),
+            shared_browser=(
+                SharedBrowser(
+                    recycle_policy=recycle_policy,
+                    on_recycle=self._on_browser_recycle,
+                    display_pool=display_pool,
+                )
+                if BROWSER_ISOLATION == BROWSER_ISOLATION_CONTEXT
+                else None
+            ),
+            display_pool=display_pool,
         )
 
     def start(self):
-        self._init_tasks()
+        Scheduler._instance = self
         self.scheduler.add_listener(self._scheduler_event, EVENT_JOB_ERROR)
-        self.scheduler.start()
+        self.scheduler.add_listener(self._job_missed_event, EVENT_JOB_MISSED)
+        self.worker_pool.start()
+        # Jobs are reconciled with the websites before any job is executed
+        self.scheduler.start(paused=True)
+        self._init_tasks()
+        if BROWSER_PREWARM_SECONDS > 0 and self.worker_pool.browser_pool is not None:
+            self.scheduler.add_job(
+                self._prewarm_browsers,
+                trigger=IntervalTrigger(seconds=BROWSER_PREWARM_INTERVAL_SECONDS),
+                id="prewarm_browsers",
+                jobstore=INTERNAL_JOB_STORE,
+                coalesce=True,
+            )
+        self.scheduler.add_job(
+            self._collect_browser_profiles,
+            trigger=IntervalTrigger(minutes=BROWSER_PROFILES_GC_INTERVAL_MINUTES),
+            id="collect_browser_profiles",
+            jobstore=INTERNAL_JOB_STORE,
+            coalesce=True,
+        )
+        if IDLE_TEARDOWN_MINUTES > 0:
+            self.scheduler.add_job(
+                self._manage_idle_resources,
+                trigger=IntervalTrigger(seconds=IDLE_CHECK_INTERVAL_SECONDS),
+                id="manage_idle_resources",
+                jobstore=INTERNAL_JOB_STORE,
+                coalesce=True,
+            )
+        self.scheduler.resume()
 
     def stop(self):
         if self.scheduler.running:
             self.scheduler.shutdown(wait=True)
+        self.worker_pool.stop()
+
+    def get_status(self) -> LoginWorkerPoolStatus:
+        return self.worker_pool.get_status()
+
+    def get_metrics(self) -> SchedulerMetricsSnapshot:
+        return self.metrics.get_snapshot()
+
+    @staticmethod
+    def get_danger_window_websites() -> Dict[int, int]:
+        """
+        Returns the number of active websites per user whose account expires within the danger window
+        or already expired.
+        """
+        danger_deadline = datetime.now(timezone.utc) + timedelta(
+            hours=EXPIRATION_DANGER_WINDOW_HOURS
+        )
+        websites = {}
+        for entry in DataAccessInternal.get_expiration_entries_all_users():
+            if not entry.paused and entry.deadline <= danger_deadline:
+                websites[entry.user] = websites.get(entry.user, 0) + 1
+        return websites
 
     def _scheduler_event(self, event: JobExecutionEvent):
         if event.exception:
@@ -40,12 +229,317 @@ class Scheduler:
                 website_id=event.job_id, execution_started=event.scheduled_run_time
             )
 
+    def _job_missed_event(self, event: JobExecutionEvent):
+        print(f"Login of website {event.job_id} missed its schedule {event.scheduled_run_time}")
+        self.metrics.record_misfire()
+
     def _init_tasks(self):
-        for website in DataAccessInternal.get_websites_all_users():
-            self.add_task(website.id)
+        """
+        Reconciles the scheduled jobs with the websites. Only the scheduling columns are loaded in one streamed
+        query. Persisted jobs that still match the next schedule of their website are kept, all other jobs are
+        registered again in one transaction.
+        """
+        bootstrap_started = time.perf_counter()
+        now_utc = datetime.now(timezone.utc)
+        persisted_run_times = self._job_store.get_run_times() if self._job_store else {}
+        stale_job_ids = set(persisted_run_times)
+        websites = 0
+        unchanged = 0
+        new_jobs = []
+        overdue_entries = []
+        for entry in DataAccessInternal.get_schedule_entries_all_users():
+            websites += 1
+            next_schedule = Scheduler._get_next_schedule(entry, now_utc)
+            if next_schedule is None:
+                continue
+            if next_schedule <= now_utc:
+                overdue_entries.append(entry)
+                continue
+            persisted_run_time = persisted_run_times.get(str(entry.id))
+            if persisted_run_time is not None and math.isclose(
+                persisted_run_time,
+                datetime_to_utc_timestamp(next_schedule),
+                abs_tol=0.001,
+            ):
+                stale_job_ids.discard(str(entry.id))
+                unchanged += 1
+                continue
+            new_jobs.append((entry.id, next_schedule))
+
+        with self._job_store.batch() if self._job_store else nullcontext():
+            if self._job_store:
+                self._job_store.remove_jobs(stale_job_ids)
+            for website_id, next_schedule in new_jobs:
+                self._add_job(website_id, next_schedule)
+            self._schedule_catch_up(overdue_entries, now_utc)
+
+        bootstrap_duration = time.perf_counter() - bootstrap_started
+        print(
+            f"Scheduler bootstrap: {unchanged + len(new_jobs) + len(overdue_entries)} of {websites} websites "
+            f"scheduled ({unchanged} unchanged, {len(new_jobs)} registered, {len(overdue_entries)} overdue) "
+            f"in {bootstrap_duration * 1000:.0f} ms."
+        )
+
+    def _schedule_catch_up(self, websites: List[ScheduleEntry], now_utc: datetime):
+        """
+        Spreads the logins that became overdue while the application was not running over the catch-up window,
+        so they do not all start at the same time. The logins of the accounts that expire first are executed first.
+        """
+        if not websites:
+            return
+        website_ids = {website.id for website in websites}
+        # One streamed query for all overdue websites instead of one per website
+        deadlines = {
+            entry.id: entry.deadline
+            for entry in DataAccessInternal.get_expiration_entries_all_users()
+            if entry.id in website_ids
+        }
+        websites = sorted(
+            websites,
+            key=lambda website: Scheduler._catch_up_order(website, deadlines.get(website.id), now_utc),
+        )
+        window = timedelta(minutes=CATCH_UP_WINDOW_MINUTES)
+        spacing = window / len(websites)
+        for i, website in enumerate(websites):
+            self._add_job(website.id, now_utc + spacing * i)
+
+        # Workers might not be able to keep up with the spacing
+        execution_time = timedelta(
+            seconds=math.ceil(len(websites) / LOGIN_WORKERS) * ESTIMATED_LOGIN_SECONDS
+        )
+        projected_end = now_utc + max(spacing * (len(websites) - 1), execution_time)
+        print(
+            f"Catching up {len(websites)} overdue logins within {window}. "
+            f"Projected to be finished at {projected_end.isoformat(timespec='seconds')}."
+        )
+
+    @staticmethod
+    def _catch_up_order(
+        website: ScheduleEntry, deadline: datetime | None, now_utc: datetime
+    ) -> Tuple[bool, float]:
+        """
+        Logins whose account expires first, counted from the last successful login, are more urgent.
+        Logins without expiration interval follow, ordered by how long they are overdue.
+        """
+        if deadline is not None:
+            return False, deadline.timestamp()
+        if website.next_schedule is None:
+            overdue = timedelta(0)
+        else:
+            overdue = now_utc - website.next_schedule.replace(tzinfo=timezone.utc)
+        return True, -overdue.total_seconds()
+
+    @staticmethod
+    def _get_next_schedule(website: Website | ScheduleEntry, now_utc: datetime) -> datetime | None:
+        """
+        Returns the time the next login of a website is due. None if no login should be scheduled.
+        """
+        if website.next_schedule is None:
+            if website.paused:
+                return None
+            return now_utc
+        return website.next_schedule.replace(tzinfo=timezone.utc)
+
+    @staticmethod
+    def _run_scheduled_login(website_id: int):
+        """
+        Target of all scheduled jobs. Persisted jobs reference their target by name,
+        so it can not be a method bound to the scheduler instance.
+        """
+        Scheduler._instance._enqueue_login(website_id)
+
+    def _enqueue_login(self, website_id: int):
+        website = DataAccessInternal.get_website_all_users(website_id)
+        expiration_entry = DataAccessInternal.get_expiration_entry(website_id)
+        self.worker_pool.submit(
+            LoginJob(
+                website_id=website_id,
+                host=get_url_host(website.url),
+                user_id=website.user,
+                deadline=(
+                    expiration_entry.deadline if expiration_entry is not None else None
+                ),
+                scheduled_at=(
+                    website.next_schedule.replace(tzinfo=timezone.utc)
+                    if website.next_schedule is not None
+                    else None
+                ),
+            )
+        )
+        self.metrics.queue_depth.add(len(self.worker_pool.queue))
+
+    def _execute_job(self, worker: LoginWorker, job: LoginJob):
+        if job.scheduled_at is not None:
+            self.metrics.start_lag.add(
+                max((job.started_at - job.scheduled_at).total_seconds(), 0)
+            )
+        execution_started = time.perf_counter()
+        try:
+            self._login_task(job.website_id, worker)
+        except Exception:
+            traceback.print_exc()
+            if worker.abandoned:
+                return
+            self.data_access.unexpected_execution_failure(
+                website_id=job.website_id, execution_started=job.started_at
+            )
+        if not worker.abandoned:
+            self.metrics.duration.add(time.perf_counter() - execution_started)
+
+    def _on_browser_recycle(self, reason: RecycleReason):
+        self.metrics.record_browser_recycle(reason.value)
+
+    def _on_job_timeout(self, worker: LoginWorker, job: LoginJob):
+        """
+        Kills the browser of a login that exceeded its time budget and marks the login as timed out.
+        """
+        if worker.driver is not None:
+            worker.driver.kill()
+        self.data_access.unexpected_execution_failure(
+            website_id=job.website_id,
+            execution_started=job.started_at,
+            failed_details=ActionFailedDetails.EXECUTION_TIMEOUT,
+        )
+
+    def _uses_browser_context(self, website_id: int) -> bool:
+        if self.worker_pool.shared_browser is None or website_id in self._dedicated_browser_trials:
+            return False
+        dedicated_until = self._dedicated_browser_websites.get(website_id)
+        if dedicated_until is None:
+            return True
+        if time.monotonic() < dedicated_until:
+            return False
+        self._dedicated_browser_websites.pop(website_id, None)
+        return True
+
+    def _update_browser_isolation(
+        self, website_id: int, isolated: bool, status: LoginStatusCode, shared_browser_kills: int | None
+    ):
+        """
+        Only execution errors can be caused by a browser context. Wrong credentials or a website that is down
+        fail in a dedicated browser as well, and a killed shared browser fails all of its contexts.
+        So a failed context login only leads to a trial in a dedicated browser, and only a successful trial
+        moves the website to dedicated browsers, for BROWSER_CONTEXT_FALLBACK_HOURS.
+        :param isolated: The login ran in a browser context.
+        :param shared_browser_kills: Kills of the shared browser before the login, if it ran in a context.
+        """
+        if isolated:
+            if (
+                status == LoginStatusCode.UNKNOWN_EXECUTION_ERROR
+                and self.worker_pool.shared_browser.kills == shared_browser_kills
+            ):
+                print(f"Login of website {website_id} failed in a browser context, trying a dedicated browser")
+                self._dedicated_browser_trials.add(website_id)
+            return
+        if website_id not in self._dedicated_browser_trials:
+            return
+        self._dedicated_browser_trials.discard(website_id)
+        if status == LoginStatusCode.SUCCESS:
+            print(
+                f"Login of website {website_id} succeeded in a dedicated browser, "
+                f"using a dedicated browser for {BROWSER_CONTEXT_FALLBACK_HOURS} hours"
+            )
+            self._dedicated_browser_websites[website_id] = (
+                time.monotonic() + BROWSER_CONTEXT_FALLBACK_HOURS * 3600
+            )
+
+    @staticmethod
+    def _uses_http_login(website: Website) -> bool:
+        """
+        Custom login scripts interact with the page, so they always run in the browser.
+        """
+        return (
+            website.execution_engine == ExecutionEngine.HTTP
+            and website.custom_login_script is None
+        )
+
+    @staticmethod
+    def _check_reachability(url: str) -> str | None:
+        """
+        The preflight check only saves the launch of a browser, so the login continues if the check fails itself.
+        """
+        try:
+            return check_reachability(url)
+        except Exception:
+            traceback.print_exc()
+            return None
 
-    def _login_task(self, website_id: int):
-        self.data_access.set_next_schedule(website_id)
+    def _prewarm_browsers(self):
+        """
+        Prewarms a browser for each login that is due within the prewarm window.
+        Prewarmed browsers that were not used in time, e.g. because the website was removed, are closed.
+        """
+        browser_pool = self.worker_pool.browser_pool
+        browser_pool.expire_prewarmed(2 * BROWSER_PREWARM_SECONDS)
+        prewarm_until = datetime.now(timezone.utc) + timedelta(seconds=BROWSER_PREWARM_SECONDS)
+        browsers = 0
+        for website_id in self._get_upcoming_website_ids(prewarm_until):
+            if self._uses_browser_context(website_id):
+                continue
+            try:
+                website = DataAccessInternal.get_website_all_users(website_id)
+            except NotFoundException:
+                continue
+            # A prewarmed browser uses a temporary profile
+            if (
+                not Scheduler._uses_http_login(website)
+                and website.browser_profile == BrowserProfileMode.NONE
+            ):
+                browsers += 1
+        browser_pool.prewarm(browsers)
+
+    def _collect_browser_profiles(self):
+        """
+        Removes the browser profiles of websites that do not use one anymore and enforces the disk budget.
+        """
+        website_ids = {
+            website.id
+            for website in DataAccessInternal.get_websites_all_users()
+            if website.browser_profile != BrowserProfileMode.NONE
+        }
+        self._browser_profiles.collect_garbage(website_ids)
+
+    def _manage_idle_resources(self):
+        """
+        Closes the kept browsers and virtual displays while nothing runs and the next login is far away,
+        and starts them again in time for the next login.
+        """
+        next_run_time = self._get_next_run_time()
+        wake_up_time = datetime.now(timezone.utc) + timedelta(minutes=IDLE_TEARDOWN_MINUTES)
+        idle = self.worker_pool.is_idle() and (
+            next_run_time is None or next_run_time > wake_up_time
+        )
+        if idle and not self._resources_suspended:
+            print("No login due soon, closing kept browsers and displays")
+            self.worker_pool.suspend_browsers()
+            self._resources_suspended = True
+        elif not idle and self._resources_suspended:
+            print("Logins due soon, starting kept browsers")
+            self.worker_pool.resume_browsers()
+            self._resources_suspended = False
+
+    def _get_next_run_time(self) -> datetime | None:
+        if self._job_store:
+            return self._job_store.get_next_run_time()
+        run_times = [
+            job.next_run_time
+            for job in self.scheduler.get_jobs(jobstore="default")
+            if job.next_run_time is not None
+        ]
+        return min(run_times, default=None)
+
+    def _get_upcoming_website_ids(self, until: datetime) -> List[int]:
+        if self._job_store:
+            jobs = self._job_store.get_due_jobs(until)
+        else:
+            jobs = [
+                job
+                for job in self.scheduler.get_jobs(jobstore="default")
+                if job.next_run_time is not None and job.next_run_time <= until
+            ]
+        return [int(job.id) for job in jobs if job.id.isdigit()]
+
+    def _login_task(self, website_id: int, worker: LoginWorker):
         screenshot_id = None
         website = DataAccessInternal.get_website_all_users(website_id)
         if website.take_screenshot:
@@ -53,9 +547,21 @@ class Scheduler:
         start_time = datetime.now(timezone.utc)
         url = website.url
         success_url = website.success_url
+        success_criteria = SuccessCriteria.from_website(website)
         username = website.username
         password = website.password
 
+        unreachable_message = Scheduler._check_reachability(url) if PREFLIGHT_CHECK else None
+        # Scheduled once the preflight check decided whether the login is retried early
+        self.data_access.set_next_schedule(
+            website_id,
+            retry_after=(
+                timedelta(minutes=SITE_UNREACHABLE_RETRY_MINUTES)
+                if unreachable_message is not None
+                else None
+            ),
+        )
+
         action_history = ActionHistory(
             execution_started=start_time,
             execution_status=ActionStatusCode.IN_PROGRESS,
@@ -64,20 +570,78 @@ class Scheduler:
             website_id=website.id, action_history=action_history
         )
 
-        # login
-        status, custom_failed_details_message = login(
+        isolated = False
+        shared_browser_kills = None
+        resource_blocker = None
+        driver = None
+        if unreachable_message is not None:
+            print(f"Website {website_id} is unreachable: {unreachable_message}")
+            status, custom_failed_details_message = LoginStatusCode.SITE_UNREACHABLE, unreachable_message
+            screenshot_id = None
+        elif Scheduler._uses_http_login(website) and http_login(
             url=url,
             success_url=success_url,
             username=username,
             password=password,
-            custom_login_script=website.custom_login_script,
-            screenshot_id=screenshot_id,
-        )
+            success_criteria=success_criteria,
+        ):
+            status, custom_failed_details_message = LoginStatusCode.SUCCESS, None
+            # No page was rendered that a screenshot could be taken of
+            screenshot_id = None
+        else:
+            if Scheduler._uses_http_login(website):
+                print(f"HTTP login of website {website_id} failed, logging in with the browser")
+            profile = None
+            if website.browser_profile != BrowserProfileMode.NONE:
+                profile = self._browser_profiles.acquire(
+                    website_id,
+                    keep_cookies=website.browser_profile == BrowserProfileMode.CACHE_AND_COOKIES,
+                )
+            # A persistent profile needs a browser of its own
+            isolated = profile is None and self._uses_browser_context(website_id)
+            shared_browser_kills = self.worker_pool.shared_browser.kills if isolated else None
+            resource_blocker = (
+                ResourceBlocker(self._block_patterns)
+                if website.block_resources and self._block_patterns
+                else None
+            )
+            # login
+            try:
+                driver = worker.create_driver(
+                    url, isolated=isolated, resource_blocker=resource_blocker, profile=profile
+                )
+                status, custom_failed_details_message = login(
+                    driver=driver,
+                    url=url,
+                    success_url=success_url,
+                    username=username,
+                    password=password,
+                    custom_login_script=website.custom_login_script,
+                    screenshot_id=screenshot_id,
+                    success_criteria=success_criteria,
+                    on_step=self.metrics.record_login_step,
+                )
+            finally:
+                if profile is not None:
+                    self._browser_profiles.release(website_id)
+        # The login timed out and was already marked as failed
+        if worker.abandoned:
+            return
+        if resource_blocker is not None:
+            stats = resource_blocker.get_stats()
+            self.metrics.record_resource_blocking(stats.blocked_requests, stats.loaded_bytes)
+        if driver is not None:
+            captcha_stats = driver.captcha_stats
+            self.metrics.record_captchas(
+                website_id, captcha_stats.probes, captcha_stats.hits, captcha_stats.solve_seconds
+            )
         executions_status = LoginStatusCode.SUCCESS
         failed_details = None
         if status != LoginStatusCode.SUCCESS:
             executions_status = LoginStatusCode.FAILED
             failed_details = status.value
+        if driver is not None:
+            self._update_browser_isolation(website_id, isolated, status, shared_browser_kills)
         self.data_access.action_history_finish_execution(
             action_history_id=action_history_id,
             execution_status=ActionStatusCode(executions_status.value),
@@ -90,19 +654,14 @@ class Scheduler:
         website = DataAccessInternal.get_website_all_users(website_id)
 
         now_utc = datetime.now(timezone.utc)
-        if website.next_schedule is None:
-            if website.paused:
-                return
-            next_schedule = now_utc
-        else:
-            next_schedule = website.next_schedule.replace(tzinfo=timezone.utc)
+        next_schedule = Scheduler._get_next_schedule(website, now_utc)
+        if next_schedule is None:
+            return
+        self._add_job(website_id, max(next_schedule, now_utc))
 
-        if next_schedule < now_utc:
-            run_date = now_utc
-        else:
-            run_date = next_schedule
+    def _add_job(self, website_id: int, run_date: datetime):
         self.scheduler.add_job(
-            self._login_task,
+            Scheduler._run_scheduled_login,
             trigger=DateTrigger(run_date=run_date),
             args=[website_id],
             id=f"{website_id}",
@@ -112,6 +671,7 @@ class Scheduler:
         )
 
     def remove_task(self, website_id: int):
+        self.worker_pool.discard(website_id)
         try:
             self.scheduler.remove_job(job_id=f"{website_id}")
         except JobLookupError:
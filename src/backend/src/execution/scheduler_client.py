@@ -0,0 +1,169 @@
+import threading
+from enum import Enum
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection
+from typing import Any, Dict
+
+from endpoints.webhooks.webhook_endpoints import WebhookEndpoints
+from execution.constants import SCHEDULER_WORKER_SOCKET
+from execution.login_worker_pool import LoginWorkerPoolStatus
+from execution.scheduler_metrics import SchedulerMetricsSnapshot
+from utils.exceptions import SchedulerUnavailableException
+from utils.security import get_scheduler_worker_authkey
+
+# Seconds between two attempts to reach the scheduler worker
+RECONNECT_INTERVAL_SECONDS = 5
+# Seconds to wait for the answer of the scheduler worker, a hanging worker must not block the API
+REQUEST_TIMEOUT_SECONDS = 10
+
+
+class SchedulerRequest(Enum):
+    ADD_TASK = "add_task"
+    REMOVE_TASK = "remove_task"
+    GET_STATUS = "get_status"
+    GET_METRICS = "get_metrics"
+    GET_DANGER_WINDOW_WEBSITES = "get_danger_window_websites"
+    # Turns the connection into a stream of webhook events
+    SUBSCRIBE = "subscribe"
+
+
+# Webhook events the scheduler worker is allowed to emit through the API process
+WEBHOOK_EVENTS = ("login_data_changed", "action_history_changed", "notifications_changed")
+
+
+class SchedulerClient:
+    """
+    Scheduler of the API process when the logins are executed by a separate scheduler worker process.
+    Calls are forwarded to the worker over a local socket and the webhook events of the worker are sent
+    to the connected clients. Tasks that change while the worker is not reachable are forwarded once it is back.
+    """
+
+    def __init__(
+        self,
+        webhook_endpoints: WebhookEndpoints,
+        address: str = SCHEDULER_WORKER_SOCKET,
+        authkey: bytes | None = None,
+    ):
+        self.webhook_endpoints = webhook_endpoints
+        self._address = address
+        self._authkey = authkey if authkey is not None else get_scheduler_worker_authkey()
+        self._lock = threading.Lock()
+        self._connection: Connection | None = None
+        self._pending_lock = threading.Lock()
+        self._pending_tasks: Dict[int, SchedulerRequest] = {}
+        self._stopped = threading.Event()
+        self._connected = threading.Event()
+        self._event_thread: threading.Thread | None = None
+
+    def start(self):
+        self._stopped.clear()
+        self._event_thread = threading.Thread(
+            target=self._receive_events, name="scheduler-events", daemon=True
+        )
+        self._event_thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._event_thread is not None:
+            self._event_thread.join()
+            self._event_thread = None
+        with self._lock:
+            self._close()
+
+    @property
+    def connected(self) -> bool:
+        """
+        :return: Whether the webhook event subscription to the scheduler worker is currently open
+        """
+        return self._connected.is_set()
+
+    def add_task(self, website_id: int):
+        self._send_task(SchedulerRequest.ADD_TASK, website_id)
+
+    def remove_task(self, website_id: int):
+        self._send_task(SchedulerRequest.REMOVE_TASK, website_id)
+
+    def get_status(self) -> LoginWorkerPoolStatus:
+        return self._request(SchedulerRequest.GET_STATUS)
+
+    def get_metrics(self) -> SchedulerMetricsSnapshot:
+        return self._request(SchedulerRequest.GET_METRICS)
+
+    def get_danger_window_websites(self) -> Dict[int, int]:
+        return self._request(SchedulerRequest.GET_DANGER_WINDOW_WEBSITES)
+
+    def _send_task(self, request: SchedulerRequest, website_id: int):
+        try:
+            self._request(request, website_id)
+        except SchedulerUnavailableException:
+            print(f"Scheduler worker not reachable, {request.value} of website {website_id} is sent later")
+            with self._pending_lock:
+                self._pending_tasks[website_id] = request
+
+    def _send_pending_tasks(self):
+        with self._pending_lock:
+            pending_tasks = self._pending_tasks
+            self._pending_tasks = {}
+        for website_id, request in pending_tasks.items():
+            self._send_task(request, website_id)
+
+    def _request(self, request: SchedulerRequest, *args) -> Any:
+        """
+        Sends a request to the scheduler worker and waits for the result.
+        A broken connection is reopened once, so a restarted worker is picked up transparently.
+        A worker that does not answer in time is treated as unavailable, its connection is dropped
+        so a late answer can not be mistaken for the answer of the next request.
+        """
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._connection is None:
+                        self._connection = self._connect()
+                    self._connection.send((request.value, args))
+                    if not self._connection.poll(REQUEST_TIMEOUT_SECONDS):
+                        self._close()
+                        raise SchedulerUnavailableException()
+                    succeeded, result = self._connection.recv()
+                    break
+                except (OSError, EOFError, AuthenticationError) as e:
+                    self._close()
+                    if attempt == 1:
+                        raise SchedulerUnavailableException() from e
+        if not succeeded:
+            raise RuntimeError(f"Scheduler worker failed to execute {request.value}: {result}")
+        return result
+
+    def _connect(self) -> Connection:
+        return Client(self._address, authkey=self._authkey)
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _receive_events(self):
+        """
+        Keeps a subscription to the webhook events of the scheduler worker and reconnects when it is lost.
+        """
+        while not self._stopped.is_set():
+            try:
+                connection = self._connect()
+            except (OSError, AuthenticationError):
+                self._stopped.wait(RECONNECT_INTERVAL_SECONDS)
+                continue
+            try:
+                connection.send((SchedulerRequest.SUBSCRIBE.value, ()))
+                self._connected.set()
+                self._send_pending_tasks()
+                while not self._stopped.is_set():
+                    if not connection.poll(1):
+                        continue
+                    event, kwargs = connection.recv()
+                    if event in WEBHOOK_EVENTS:
+                        getattr(self.webhook_endpoints, event)(**kwargs)
+            except (OSError, EOFError):
+                print("Lost connection to the scheduler worker")
+                self._stopped.wait(RECONNECT_INTERVAL_SECONDS)
+            finally:
+                self._connected.clear()
+                connection.close()
@@ -0,0 +1,101 @@
+import pickle
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterable
+
+from apscheduler.jobstores.base import ConflictingIdError, JobLookupError
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.util import datetime_to_utc_timestamp
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+# Created and migrated by APScheduler, not by alembic
+SCHEDULER_JOB_TABLE = "scheduler_job"
+
+
+class SchedulerJobStore(SQLAlchemyJobStore):
+    """
+    Persists the scheduled login jobs in the application database, so they survive restarts.
+    In addition to the default job store, the run times of all jobs can be read without loading the jobs
+    and many changes can be written in one transaction.
+    """
+
+    def __init__(self, engine: Engine):
+        super().__init__(engine=engine, tablename=SCHEDULER_JOB_TABLE)
+        self._batch_connection = None
+        self._batch_thread = None
+
+    @contextmanager
+    def batch(self):
+        """
+        Writes all job changes of the current thread inside the context in one transaction.
+        """
+        with self.engine.begin() as connection:
+            self._batch_connection = connection
+            self._batch_thread = threading.get_ident()
+            try:
+                yield
+            finally:
+                self._batch_connection = None
+                self._batch_thread = None
+
+    def get_run_times(self) -> Dict[str, float | None]:
+        """
+        Returns the next run time of all stored jobs as UTC timestamp by job id.
+        """
+        selectable = select(self.jobs_t.c.id, self.jobs_t.c.next_run_time)
+        with self._begin() as connection:
+            return {row.id: row.next_run_time for row in connection.execute(selectable)}
+
+    def remove_jobs(self, job_ids: Iterable[str]):
+        """
+        Removes multiple jobs at once. Unknown job ids are ignored.
+        """
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        delete = self.jobs_t.delete().where(self.jobs_t.c.id.in_(job_ids))
+        with self._begin() as connection:
+            connection.execute(delete)
+
+    def add_job(self, job):
+        insert = self.jobs_t.insert().values(
+            id=job.id,
+            next_run_time=datetime_to_utc_timestamp(job.next_run_time),
+            job_state=pickle.dumps(job.__getstate__(), self.pickle_protocol),
+        )
+        with self._begin() as connection:
+            try:
+                connection.execute(insert)
+            except IntegrityError:
+                raise ConflictingIdError(job.id)
+
+    def update_job(self, job):
+        update = (
+            self.jobs_t.update()
+            .values(
+                next_run_time=datetime_to_utc_timestamp(job.next_run_time),
+                job_state=pickle.dumps(job.__getstate__(), self.pickle_protocol),
+            )
+            .where(self.jobs_t.c.id == job.id)
+        )
+        with self._begin() as connection:
+            result = connection.execute(update)
+            if result.rowcount == 0:
+                raise JobLookupError(job.id)
+
+    def remove_job(self, job_id):
+        delete = self.jobs_t.delete().where(self.jobs_t.c.id == job_id)
+        with self._begin() as connection:
+            result = connection.execute(delete)
+            if result.rowcount == 0:
+                raise JobLookupError(job_id)
+
+    def _begin(self):
+        if (
+            self._batch_connection is not None
+            and self._batch_thread == threading.get_ident()
+        ):
+            return nullcontext(self._batch_connection)
+        return self.engine.begin()
@@ -0,0 +1,160 @@
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict
+
+# Number of recent samples the percentiles are calculated from
+METRICS_WINDOW = 1000
+
+
+@dataclass
+class PercentileStats:
+    samples: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+class RollingPercentiles:
+    """
+    Thread safe percentiles over the most recent samples.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self._lock = threading.Lock()
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, value: float):
+        with self._lock:
+            self._samples.append(value)
+
+    def get(self) -> PercentileStats | None:
+        """
+        Returns the nearest-rank percentiles of the recent samples. None if there are no samples yet.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return PercentileStats(
+            samples=len(samples),
+            p50=RollingPercentiles._percentile(samples, 50),
+            p90=RollingPercentiles._percentile(samples, 90),
+            p99=RollingPercentiles._percentile(samples, 99),
+            max=samples[-1],
+        )
+
+    @staticmethod
+    def _percentile(sorted_samples: list[float], percentile: float) -> float:
+        rank = math.ceil(percentile / 100 * len(sorted_samples))
+        return sorted_samples[max(rank, 1) - 1]
+
+
+@dataclass
+class CaptchaMetricsSnapshot:
+    probes: int
+    hits: int
+    solve_seconds: PercentileStats | None
+
+
+@dataclass
+class SchedulerMetricsSnapshot:
+    start_lag_seconds: PercentileStats | None
+    queue_depth: PercentileStats | None
+    duration_seconds: PercentileStats | None
+    misfires: int
+    browser_recycles: Dict[str, int]
+    blocked_requests: int
+    loaded_bytes_with_blocking: PercentileStats | None
+    login_step_seconds: Dict[str, PercentileStats]
+    captchas: Dict[int, CaptchaMetricsSnapshot]
+
+
+class SchedulerMetrics:
+    """
+    Records how the scheduler keeps up with the logins:
+    - start lag: seconds between the scheduled time of a login and the time a worker started it
+    - queue depth: number of waiting logins whenever a login is queued
+    - duration: seconds a login took to execute
+    - misfires: number of scheduled logins that were dropped because they were too late
+    - browser recycles: number of browsers that were replaced between logins by reason
+    - blocked requests: number of requests that resource blocking kept from loading
+    - loaded bytes with blocking: bytes a login with resource blocking transferred
+    - login step seconds: seconds each step of a login script took including its waits, by step
+    - captchas: checks for a captcha, checks that found one and seconds the solver took, by website
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        self._window = window
+        self.start_lag = RollingPercentiles(window)
+        self.queue_depth = RollingPercentiles(window)
+        self.duration = RollingPercentiles(window)
+        self.loaded_bytes_with_blocking = RollingPercentiles(window)
+        self._lock = threading.Lock()
+        self._misfires = 0
+        self._browser_recycles: Dict[str, int] = {}
+        self._blocked_requests = 0
+        self._login_steps: Dict[str, RollingPercentiles] = {}
+        self._captcha_probes: Dict[int, int] = {}
+        self._captcha_hits: Dict[int, int] = {}
+        self._captcha_solve_seconds: Dict[int, RollingPercentiles] = {}
+
+    def record_misfire(self):
+        with self._lock:
+            self._misfires += 1
+
+    def record_browser_recycle(self, reason: str):
+        with self._lock:
+            self._browser_recycles[reason] = self._browser_recycles.get(reason, 0) + 1
+
+    def record_resource_blocking(self, blocked_requests: int, loaded_bytes: int):
+        self.loaded_bytes_with_blocking.add(loaded_bytes)
+        with self._lock:
+            self._blocked_requests += blocked_requests
+
+    def record_login_step(self, step: str, seconds: float):
+        with self._lock:
+            percentiles = self._login_steps.get(step)
+            if percentiles is None:
+                percentiles = self._login_steps[step] = RollingPercentiles(self._window)
+        percentiles.add(seconds)
+
+    def record_captchas(self, website_id: int, probes: int, hits: int, solve_seconds: list[float]):
+        with self._lock:
+            self._captcha_probes[website_id] = self._captcha_probes.get(website_id, 0) + probes
+            self._captcha_hits[website_id] = self._captcha_hits.get(website_id, 0) + hits
+            percentiles = self._captcha_solve_seconds.get(website_id)
+            if percentiles is None:
+                percentiles = self._captcha_solve_seconds[website_id] = RollingPercentiles(self._window)
+        for seconds in solve_seconds:
+            percentiles.add(seconds)
+
+    def get_snapshot(self) -> SchedulerMetricsSnapshot:
+        with self._lock:
+            misfires = self._misfires
+            browser_recycles = dict(self._browser_recycles)
+            blocked_requests = self._blocked_requests
+            login_steps = dict(self._login_steps)
+            captcha_probes = dict(self._captcha_probes)
+            captcha_hits = dict(self._captcha_hits)
+            captcha_solve_seconds = dict(self._captcha_solve_seconds)
+        return SchedulerMetricsSnapshot(
+            start_lag_seconds=self.start_lag.get(),
+            queue_depth=self.queue_depth.get(),
+            duration_seconds=self.duration.get(),
+            misfires=misfires,
+            browser_recycles=browser_recycles,
+            blocked_requests=blocked_requests,
+            loaded_bytes_with_blocking=self.loaded_bytes_with_blocking.get(),
+            login_step_seconds={step: percentiles.get() for step, percentiles in login_steps.items()},
+            captchas={
+                website_id: CaptchaMetricsSnapshot(
+                    probes=probes,
+                    hits=captcha_hits[website_id],
+                    solve_seconds=captcha_solve_seconds[website_id].get(),
+                )
+                for website_id, probes in captcha_probes.items()
+            },
+        )
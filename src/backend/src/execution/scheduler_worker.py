@@ -0,0 +1,176 @@
+import asyncio
+import os
+import signal
+import threading
+import traceback
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Connection, Listener
+from typing import Any, Callable, Dict, List
+
+from dotenv import load_dotenv
+
+from dataAccess.data_access_internal import DataAccessInternal
+from dataAccess.database.database import init_db
+from dataAccess.database.database_events import register_database_events
+from execution.constants import SCHEDULER_WORKER_SOCKET
+from execution.notifications.notification_manager import NotificationManager
+from execution.scheduler import Scheduler
+from execution.scheduler_client import SchedulerRequest
+from utils.security import get_scheduler_worker_authkey
+
+
+class WebhookEventForwarder:
+    """
+    Replaces the WebhookEndpoints in the scheduler worker process. The events are forwarded to all
+    subscribed API processes, which send them to their connected clients.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: List[Connection] = []
+
+    def subscribe(self, connection: Connection):
+        with self._lock:
+            self._subscribers.append(connection)
+
+    def close(self):
+        with self._lock:
+            for connection in self._subscribers:
+                connection.close()
+            self._subscribers.clear()
+
+    def login_data_changed(self):
+        self._emit("login_data_changed", {})
+
+    def action_history_changed(self, action_history_id: int, website_id: int):
+        self._emit(
+            "action_history_changed",
+            {"action_history_id": action_history_id, "website_id": website_id},
+        )
+
+    def notifications_changed(self):
+        self._emit("notifications_changed", {})
+
+    def _emit(self, event: str, kwargs: Dict[str, Any]):
+        with self._lock:
+            for connection in list(self._subscribers):
+                try:
+                    connection.send((event, kwargs))
+                except OSError:
+                    connection.close()
+                    self._subscribers.remove(connection)
+
+
+class SchedulerWorkerServer:
+    """
+    Serves the requests of the SchedulerClient in the API process over a local socket.
+    Every connection is served by its own thread.
+    """
+
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        events: WebhookEventForwarder,
+        address: str = SCHEDULER_WORKER_SOCKET,
+        authkey: bytes | None = None,
+    ):
+        self._scheduler = scheduler
+        self._events = events
+        self._address = address
+        self._authkey = authkey if authkey is not None else get_scheduler_worker_authkey()
+        self._listener: Listener | None = None
+        self._stopped = threading.Event()
+        self._handlers: Dict[str, Callable[..., Any]] = {
+            SchedulerRequest.ADD_TASK.value: scheduler.add_task,
+            SchedulerRequest.REMOVE_TASK.value: scheduler.remove_task,
+            SchedulerRequest.GET_STATUS.value: scheduler.get_status,
+            SchedulerRequest.GET_METRICS.value: scheduler.get_metrics,
+            SchedulerRequest.GET_DANGER_WINDOW_WEBSITES.value: scheduler.get_danger_window_websites,
+        }
+
+    def start(self):
+        self._stopped.clear()
+        # A socket left behind by a worker that was killed would block the address
+        if os.path.exists(self._address):
+            os.remove(self._address)
+        self._listener = Listener(self._address, authkey=self._authkey)
+        threading.Thread(
+            target=self._accept, name="scheduler-worker-server", daemon=True
+        ).start()
+        print(f"Scheduler worker listening on {self._address}")
+
+    def stop(self):
+        self._stopped.set()
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        self._events.close()
+
+    def _accept(self):
+        while not self._stopped.is_set():
+            try:
+                connection = self._listener.accept()
+            except AuthenticationError:
+                print("Rejected scheduler worker connection with invalid authentication")
+                continue
+            except OSError:
+                if self._stopped.is_set():
+                    return
+                traceback.print_exc()
+                continue
+            threading.Thread(
+                target=self._serve, args=(connection,), daemon=True
+            ).start()
+
+    def _serve(self, connection: Connection):
+        while not self._stopped.is_set():
+            try:
+                request, args = connection.recv()
+            except (OSError, EOFError):
+                connection.close()
+                return
+            if request == SchedulerRequest.SUBSCRIBE.value:
+                self._events.subscribe(connection)
+                return
+            handler = self._handlers.get(request)
+            try:
+                if handler is None:
+                    raise ValueError(f"Unknown request {request}")
+                response = (True, handler(*args))
+            except Exception as e:
+                traceback.print_exc()
+                response = (False, str(e))
+            try:
+                connection.send(response)
+            except OSError:
+                connection.close()
+                return
+
+
+async def _run_worker():
+    load_dotenv()
+    init_db()
+
+    events = WebhookEventForwarder()
+    data_access_internal = DataAccessInternal(webhook_endpoints=events)
+    notification_manager = NotificationManager(data_access=data_access_internal)
+    scheduler = Scheduler(data_access_internal=data_access_internal, webhook_endpoints=events)
+    register_database_events(scheduler=scheduler, notification_manager=notification_manager)
+    server = SchedulerWorkerServer(scheduler=scheduler, events=events)
+
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(stop_signal, stopped.set)
+
+    scheduler.start()
+    server.start()
+    try:
+        await stopped.wait()
+    finally:
+        server.stop()
+        scheduler.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(_run_worker())
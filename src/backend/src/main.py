@@ -17,7 +17,9 @@ from dotenv import load_dotenv
 from dataAccess.database.database_events import register_database_events
 from endpoints.api.rest_endpoints import register_rest_endpoints
 from endpoints.webhooks.webhook_endpoints import WebhookEndpoints
+from execution.constants import SCHEDULER_MODE, SCHEDULER_MODE_WORKER
 from execution.scheduler import Scheduler
+from execution.scheduler_client import SchedulerClient
 
 load_dotenv()
 dev_mode = os.getenv("RUN_MODE") != "production"
@@ -32,11 +34,14 @@ webhook_endpoints = WebhookEndpoints(event_loop=event_loop)
 data_access = DataAccess(webhook_endpoints=webhook_endpoints)
 data_access_internal = DataAccessInternal(webhook_endpoints=webhook_endpoints)
 notification_manager = NotificationManager(data_access=data_access_internal)
+if SCHEDULER_MODE == SCHEDULER_MODE_WORKER:
+    scheduler = SchedulerClient(webhook_endpoints=webhook_endpoints)
+else:
+    scheduler = Scheduler(data_access_internal=data_access_internal, webhook_endpoints=webhook_endpoints)
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
-    scheduler = Scheduler(data_access_internal=data_access_internal, webhook_endpoints=webhook_endpoints)
     register_database_events(
         scheduler=scheduler, notification_manager=notification_manager
     )
@@ -66,7 +71,10 @@ app.add_route("/socket.io/", route=sio_asgi_app, methods=["GET", "POST"])
 app.add_websocket_route("/socket.io/", sio_asgi_app)
 
 register_rest_endpoints(
-    app=app, data_access=data_access, notification_manager=notification_manager
+    app=app,
+    data_access=data_access,
+    notification_manager=notification_manager,
+    scheduler=scheduler,
 )
 
 add_pagination(app)
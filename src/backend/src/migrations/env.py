@@ -4,6 +4,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from dataAccess.database.database import Base, get_database_uri, engine as db_engine
+from execution.scheduler_job_store import SCHEDULER_JOB_TABLE
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -25,6 +26,13 @@ target_metadata = Base.metadata
 config.set_main_option("sqlalchemy.url", get_database_uri())
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # The job store creates its table itself, autogenerate must not drop it
+    if type_ == "table" and name == SCHEDULER_JOB_TABLE:
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -41,6 +49,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -58,7 +67,9 @@ def run_migrations_online() -> None:
     """
     # Use the existing engine instead of creating a new one
     with db_engine.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection, target_metadata=target_metadata, include_object=include_object
+        )
 
         with context.begin_transaction():
             context.run_migrations()
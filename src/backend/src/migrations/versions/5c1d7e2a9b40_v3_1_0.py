@@ -0,0 +1,74 @@
+"""v3_1_0
+
+Revision ID: 5c1d7e2a9b40
+Revises: ec08ca6514ef
+Create Date: 2026-10-18 09:12:31.482913
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c1d7e2a9b40"
+down_revision: Union[str, None] = "ec08ca6514ef"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "website",
+        sa.Column(
+            "execution_engine",
+            sa.String(),
+            nullable=False,
+            server_default="BROWSER",
+        ),
+    )
+    op.add_column(
+        "website",
+        sa.Column(
+            "block_resources",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.false(),
+        ),
+    )
+    op.add_column(
+        "website",
+        sa.Column(
+            "browser_profile",
+            sa.String(),
+            nullable=False,
+            server_default="NONE",
+        ),
+    )
+    op.add_column(
+        "website",
+        sa.Column(
+            "success_url_match",
+            sa.String(),
+            nullable=False,
+            server_default="EXACT",
+        ),
+    )
+    op.add_column("website", sa.Column("success_selector", sa.String(), nullable=True))
+    op.add_column("website", sa.Column("success_cookie", sa.String(), nullable=True))
+    op.create_index(
+        "ix_action_history_website_execution_started",
+        "action_history",
+        ["website", "execution_started"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_action_history_website_execution_started", table_name="action_history")
+    op.drop_column("website", "success_cookie")
+    op.drop_column("website", "success_selector")
+    op.drop_column("website", "success_url_match")
+    op.drop_column("website", "browser_profile")
+    op.drop_column("website", "block_resources")
+    op.drop_column("website", "execution_engine")
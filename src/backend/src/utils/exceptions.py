@@ -19,6 +19,17 @@ class ScriptExecutionStopped(Exception):
         self.message = message
 
 
+class SchedulerUnavailableException(Exception):
+    """Raised when the scheduler worker process can not be reached"""
+
+    def __init__(self, message="Scheduler worker is not reachable"):
+        super().__init__(message)
+        self.message = message
+
+
 class RequestValidationError(Exception):
     """Raised when validation for request failed"""
-    pass
+
+    def __init__(self, message="Invalid request"):
+        super().__init__(message)
+        self.message = message
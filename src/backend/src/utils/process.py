@@ -0,0 +1,68 @@
+import os
+import signal
+from typing import Dict, List
+
+
+def _get_parent_pids() -> Dict[int, int]:
+    """
+    Returns the parent pid of all running processes by pid. Reads /proc, so it is only supported on Linux.
+    """
+    parent_pids = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat_file:
+                stat = stat_file.read()
+        except OSError:
+            continue
+        # The process name is in parentheses and can contain spaces
+        fields = stat[stat.rfind(")") + 2 :].split()
+        parent_pids[int(entry)] = int(fields[1])
+    return parent_pids
+
+
+def get_process_tree(pid: int) -> List[int]:
+    """
+    Returns the pid and the pids of all descendants of a process, parents before their children.
+    """
+    if not os.path.isdir("/proc"):
+        return [pid]
+    children: Dict[int, List[int]] = {}
+    for child_pid, parent_pid in _get_parent_pids().items():
+        children.setdefault(parent_pid, []).append(child_pid)
+    tree = [pid]
+    for tree_pid in tree:
+        tree.extend(children.get(tree_pid, []))
+    return tree
+
+
+def kill_process_tree(pid: int) -> int:
+    """
+    Kills a process and all its descendants.
+    :return: The number of processes that were killed.
+    """
+    killed = 0
+    for tree_pid in get_process_tree(pid):
+        try:
+            os.kill(tree_pid, signal.SIGKILL)
+            killed += 1
+        except (ProcessLookupError, PermissionError):
+            pass
+    return killed
+
+
+def get_process_tree_memory(pid: int) -> int:
+    """
+    Returns the resident memory of a process and all its descendants in bytes.
+    Memory shared between the processes is counted once per process, so the result is an upper bound.
+    """
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    memory = 0
+    for tree_pid in get_process_tree(pid):
+        try:
+            with open(f"/proc/{tree_pid}/statm") as statm_file:
+                memory += int(statm_file.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            continue
+    return memory
@@ -28,6 +28,10 @@ def get_jwt_secret():
     return _get_secret_key("WBVCLH2EL7UZECXR")
 
 
+def get_scheduler_worker_authkey() -> bytes:
+    return _get_secret_key("K7QHT2XW4MB8RJ3D").encode()
+
+
 JWT_ALGORITHM = "HS256"
 
 
@@ -1,6 +1,8 @@
+import os
 from collections import namedtuple
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from urllib.parse import urlparse
 
 
 def to_utc_time(dt: Optional[datetime]) -> Optional[datetime]:
@@ -42,3 +44,39 @@ def compare_urls(url1: str, url2: str) -> bool:
     if url2.endswith("/"):
         url2 = url2[:-1]
     return url1 == url2
+
+
+def get_url_host(url: str) -> str:
+    """
+    Returns the lowercase host name of an url. URLs without scheme are supported as well.
+    """
+    if "://" not in url:
+        url = "//" + url
+    host = urlparse(url).hostname
+    return host if host is not None else url.lower()
+
+
+def get_env_int(name: str, default: int) -> int:
+    """
+    Reads an integer from the environment variables.
+    Returns the default value when the variable is not set or not a valid integer.
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"Invalid value for environment variable {name}: {value}. Using {default}.")
+        return default
+
+
+def get_env_bool(name: str, default: bool) -> bool:
+    """
+    Reads a boolean from the environment variables. "true", "1" and "yes" are interpreted as True.
+    Returns the default value when the variable is not set.
+    """
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip().lower() in ("true", "1", "yes")
@@ -30,6 +30,9 @@ class MockDomInteractionDriver(DomInteractionInterface):
     def is_element_visible(self, xpath: str) -> bool:
         return True
 
+    def is_element_present(self, xpath: str) -> bool:
+        return True
+
     def get_page_html(self) -> str:
         return self._html_content
 
@@ -39,8 +42,8 @@ class MockDomInteractionDriver(DomInteractionInterface):
     def find_element(self, xpath: str) -> bool:
         return True
 
-    def solve_captcha(self):
-        pass
+    def solve_captcha(self) -> bool:
+        return False
 
     def disconnect_driver(self):
         pass
@@ -48,6 +51,12 @@ class MockDomInteractionDriver(DomInteractionInterface):
     def get_current_url(self) -> str:
         return "http://test.com"
 
+    def has_cookie(self, name: str) -> bool:
+        return False
+
+    def get_input_value(self, xpath: str) -> str | None:
+        return None
+
     def __enter__(self):
         return self
 
@@ -0,0 +1,30 @@
+from endpoints.models.scheduler_model import GetSchedulerMetrics, GetSchedulerStatus
+from execution.login_worker_pool import LoginWorkerPoolStatus, LoginWorkerStatus
+from execution.scheduler_metrics import SchedulerMetrics
+
+
+def test_status_only_shows_websites_of_user():
+    status = LoginWorkerPoolStatus(
+        queue_depth=0,
+        throttled_jobs=0,
+        workers=[
+            LoginWorkerStatus(worker_id=0, busy=True, website_id=1, jobs_executed=3, utilisation=0.5),
+            LoginWorkerStatus(worker_id=1, busy=True, website_id=2, jobs_executed=4, utilisation=0.5),
+        ],
+        wait_times={},
+        timed_out_jobs=0,
+        browser_pool=None,
+    )
+
+    user_status = GetSchedulerStatus.from_status(status, {}, user_id=1, user_website_ids={1})
+    assert [worker.website_id for worker in user_status.workers] == [1, None]
+    assert all(worker.busy for worker in user_status.workers)
+
+
+def test_metrics_only_show_captchas_of_user():
+    metrics = SchedulerMetrics()
+    metrics.record_captchas(1, probes=2, hits=1, solve_seconds=[1.0])
+    metrics.record_captchas(2, probes=5, hits=0, solve_seconds=[])
+
+    user_metrics = GetSchedulerMetrics.from_snapshot(metrics.get_snapshot(), user_website_ids={1})
+    assert list(user_metrics.captchas) == [1]
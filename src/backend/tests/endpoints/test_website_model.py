@@ -0,0 +1,42 @@
+import pytest
+
+from dataAccess.data_access import DataAccess
+from dataAccess.database.database import SuccessUrlMatch, Website
+from endpoints.models.website_model import EditWebsite
+from utils.exceptions import RequestValidationError
+
+
+def test_edit_validates_stored_success_url_with_new_match():
+    """Only the match type changes, the stored success url has to be a valid pattern for it."""
+    website = Website(success_url="https://example.com/(", success_url_match=SuccessUrlMatch.EXACT)
+
+    with pytest.raises(RequestValidationError):
+        DataAccess.validate_edited_success_url(EditWebsite(success_url_match=SuccessUrlMatch.REGEX), website)
+    assert website.success_url_match == SuccessUrlMatch.EXACT
+
+
+def test_edit_validates_new_success_url_with_stored_match():
+    website = Website(success_url="https://example\\.com/.*", success_url_match=SuccessUrlMatch.REGEX)
+
+    with pytest.raises(RequestValidationError):
+        DataAccess.validate_edited_success_url(EditWebsite(success_url="https://example.com/["), website)
+
+
+def test_edit_request_validates_success_url_it_contains():
+    with pytest.raises(ValueError):
+        EditWebsite(success_url="https://example.com/[", success_url_match=SuccessUrlMatch.REGEX)
+
+
+def test_edit_keeps_success_conditions_that_were_not_sent():
+    """Pausing only sends paused, the success conditions stay as they are."""
+    website = Website(
+        success_url="https://example.com/home", success_selector="//a[@id='logout']", success_cookie="session"
+    )
+
+    EditWebsite(paused=True).edit_existing_model(website)
+    assert website.success_selector == "//a[@id='logout']"
+    assert website.success_cookie == "session"
+
+    EditWebsite(success_selector=None).edit_existing_model(website)
+    assert website.success_selector is None
+    assert website.success_cookie == "session"
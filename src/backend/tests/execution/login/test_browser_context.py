@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from execution.login.dom_interaction import browser_context
+from execution.login.dom_interaction.browser_context import SharedBrowser, _LockedCDPMethods
+from execution.login.dom_interaction.dom_interaction_driver import DomInteractionDriver
+
+
+class FakeCDPMethods:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.opened = []
+
+    def open(self, url: str):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        time.sleep(0.01)
+        self.opened.append(url)
+        self.running -= 1
+
+    def solve_captcha(self):
+        pass
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+    def call(self, function):
+        # Sets up event handlers, which are not needed by the fake
+        pass
+
+
+class FakeContext:
+    def __init__(self):
+        self.cdp = FakeCDPMethods()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSharedBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.killed = False
+
+    def new_context(self):
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    def kill(self):
+        self.killed = True
+
+
+def test_locked_cdp_methods_serialize_calls():
+    """Pages of the shared browser never run CDP calls at the same time."""
+    cdp_methods = FakeCDPMethods()
+    locked = _LockedCDPMethods(cdp_methods, threading.Lock())
+    threads = [
+        threading.Thread(target=locked.open, args=(f"https://{i}.example.com",))
+        for i in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cdp_methods.opened) == 5
+    assert cdp_methods.max_running == 1
+
+
+def test_locked_cdp_methods_do_not_lock_sleep():
+    """Sleeping does not run the event loop, so other pages are not held back by it."""
+    lock = threading.Lock()
+    locked = _LockedCDPMethods(FakeCDPMethods(), lock)
+    with lock:
+        locked.sleep(0)
+
+
+def test_browser_is_launched_outside_condition(monkeypatch):
+    """Killing or closing the shared browser is not blocked while a browser starts."""
+    shared_browser = SharedBrowser()
+    kills = []
+
+    class LaunchingBrowser:
+        def __init__(self, pooled: bool, display_pool=None):
+            thread = threading.Thread(target=lambda: kills.append(shared_browser.kills))
+            thread.start()
+            thread.join(1)
+
+    monkeypatch.setattr(browser_context, "Browser", LaunchingBrowser)
+    browser = shared_browser._get_browser()
+    assert kills == [0]
+    assert shared_browser._get_browser() is browser
+    assert shared_browser._active_contexts == 2
+
+
+def test_driver_uses_and_disposes_context():
+    """A login in context mode opens its URL in a new context that is disposed afterwards."""
+    shared_browser = FakeSharedBrowser()
+    driver = DomInteractionDriver(url="https://example.com", shared_browser=shared_browser)
+    with driver:
+        context = shared_browser.contexts[0]
+        assert context.cdp.opened == ["https://example.com"]
+    assert context.closed
+    assert not shared_browser.killed
+
+
+def test_driver_kill_kills_shared_browser():
+    """A hanging context blocks the shared browser, so a timeout kills the shared browser."""
+    shared_browser = FakeSharedBrowser()
+    driver = DomInteractionDriver(url="https://example.com", shared_browser=shared_browser)
+    driver.__enter__()
+    driver.kill()
+    assert shared_browser.killed
+    driver.__exit__(None, None, None)
+    assert not shared_browser.contexts[0].closed
+
+
+def test_close_if_idle_detaches_browser_before_quitting():
+    """A context that starts while the idle browser quits gets a new browser, not the quitting one."""
+    shared_browser = SharedBrowser()
+    states = []
+
+    class QuittingBrowser:
+        def quit(self):
+            # Runs outside the lock, so a new context is not blocked by the quit
+            acquired = shared_browser._condition.acquire(blocking=False)
+            states.append((acquired, shared_browser._browser))
+            if acquired:
+                shared_browser._condition.release()
+
+    shared_browser._browser = QuittingBrowser()
+    shared_browser._active_contexts = 1
+    shared_browser.close_if_idle()
+    assert states == []
+
+    shared_browser._active_contexts = 0
+    shared_browser.close_if_idle()
+    assert states == [(True, None)]
+
+
+def test_failed_page_only_disposes_its_context(monkeypatch):
+    """A page that is not attached in time fails its own login, not the other contexts of the shared browser."""
+    sent = []
+
+    class FakeLoop:
+        def run_until_complete(self, value):
+            if asyncio.iscoroutine(value):
+                value.close()
+                raise TimeoutError("Page was not attached")
+            sent.append(value)
+            return "context-1"
+
+    class FakeBrowser:
+        def __init__(self, pooled: bool, display_pool=None):
+            self.jobs_executed = 0
+            self.sb = SimpleNamespace(
+                cdp=SimpleNamespace(loop=FakeLoop(), page=SimpleNamespace(send=lambda command: command))
+            )
+
+    monkeypatch.setattr(browser_context, "Browser", FakeBrowser)
+    shared_browser = SharedBrowser()
+    browser = shared_browser._get_browser()
+
+    with pytest.raises(TimeoutError):
+        shared_browser.new_context()
+    assert shared_browser.kills == 0
+    assert shared_browser._browser is browser
+    assert shared_browser._active_contexts == 1
+    assert len(sent) == 2
@@ -0,0 +1,271 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from execution.login.dom_interaction import browser_pool
+from execution.login.dom_interaction.browser_pool import (
+    Browser,
+    BrowserPool,
+    BrowserRecyclePolicy,
+    RecycleReason,
+)
+
+
+class FakeBrowser:
+    def __init__(self, pooled: bool = True, url: str = "about:blank", display_pool=None):
+        self.pooled = pooled
+        self.jobs_executed = 0
+        self.resets = 0
+        self.closed = False
+        self.memory_usage = 0
+        self.url = url
+        self.opened = []
+        self.sb = SimpleNamespace(cdp=SimpleNamespace(opened=self.opened))
+
+    def get_memory_usage(self) -> int:
+        return self.memory_usage
+
+    def open(self, url: str):
+        self.opened.append(url)
+
+    def reset(self):
+        self.resets += 1
+
+    def quit(self):
+        self.closed = True
+
+    def kill(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_browser(monkeypatch):
+    monkeypatch.setattr(browser_pool, "Browser", FakeBrowser)
+
+
+def wait_for_idle(pool: BrowserPool, idle: int):
+    deadline = time.monotonic() + 5
+    while pool.get_stats().idle < idle and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.get_stats().idle == idle
+
+
+def test_pool_reuses_reset_browsers():
+    """Browsers are launched in advance and reset before they are reused."""
+    pool = BrowserPool(size=1)
+    pool.start()
+    wait_for_idle(pool, 1)
+
+    browser = pool.borrow()
+    pool.give_back(browser)
+    assert pool.borrow() is browser
+    assert browser.resets == 1
+    assert pool.get_stats().launched == 1
+
+
+def test_pool_launches_overflow_browsers():
+    """Without an idle pooled browser an additional browser is used and closed afterwards."""
+    pool = BrowserPool(size=1)
+    pooled = pool.borrow()
+    overflow = pool.borrow()
+    assert pooled.pooled and not overflow.pooled
+
+    pool.give_back(overflow)
+    assert overflow.closed
+    assert pool.get_stats().busy == 1
+
+
+def test_pool_replaces_broken_browsers():
+    """Browsers that broke or were killed are closed and replaced in the background."""
+    pool = BrowserPool(size=1)
+    browser = pool.borrow()
+    pool.give_back(browser, reusable=False)
+    assert browser.closed
+    wait_for_idle(pool, 1)
+
+    browser = pool.borrow()
+    pool.discard(browser)
+    wait_for_idle(pool, 1)
+    assert pool.get_stats().launched == 3
+    assert pool.get_stats().busy == 0
+
+    pool.close()
+    assert pool.get_stats().idle == 0
+
+
+@pytest.mark.parametrize(
+    "jobs, memory_mb, reason",
+    [(2, 0, RecycleReason.JOBS), (0, 100, RecycleReason.MEMORY)],
+)
+def test_pool_recycles_browsers_over_limit(jobs, memory_mb, reason):
+    """Browsers over the job count or memory limit are replaced after their login."""
+    recycles = []
+    pool = BrowserPool(
+        size=1,
+        recycle_policy=BrowserRecyclePolicy(max_jobs=jobs, max_memory_mb=memory_mb),
+        on_recycle=recycles.append,
+    )
+    browser = pool.borrow()
+    pool.give_back(browser)
+    assert not browser.closed and recycles == []
+
+    assert pool.borrow() is browser
+    browser.memory_usage = 200 * 1024 * 1024
+    pool.give_back(browser)
+    assert browser.closed
+    assert recycles == [reason]
+    wait_for_idle(pool, 1)
+    assert pool.borrow() is not browser
+    assert pool.get_stats().recycled == 1
+
+
+def wait_for_prewarmed(pool: BrowserPool, prewarmed: int):
+    deadline = time.monotonic() + 5
+    while pool.get_stats().prewarmed < prewarmed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.get_stats().prewarmed == prewarmed
+
+
+def test_pool_hands_prewarmed_browsers_to_next_logins():
+    """Prewarmed browsers are not bound to a website, the login opens the website itself."""
+    pool = BrowserPool(size=0, max_prewarmed=2)
+    pool.prewarm(3)
+    wait_for_prewarmed(pool, 2)
+
+    browser = pool.borrow("https://example.com")
+    assert browser.url == "about:blank" and browser.opened == ["https://example.com"]
+    # Two accounts of the same website
+    assert pool.borrow("https://example.com") is not browser
+    assert pool.get_stats().prewarm_hits == 2
+    assert pool.get_stats().launched == 2
+
+
+def test_pool_only_prewarms_missing_browsers():
+    """Idle pooled browsers are ready for the next logins as well."""
+    pool = BrowserPool(size=1, max_prewarmed=2)
+    pool.start()
+    wait_for_idle(pool, 1)
+    pool.prewarm(2)
+    wait_for_prewarmed(pool, 1)
+
+    pool.prewarm(2)
+    time.sleep(0.05)
+    assert pool.get_stats().prewarmed == 1
+    assert pool.get_stats().prewarm_hits == 0
+    pool.borrow()
+    assert pool.get_stats().prewarm_hits == 0
+
+
+def test_pool_expires_unused_prewarmed_browsers():
+    pool = BrowserPool(size=0, max_prewarmed=1)
+    pool.prewarm(1)
+    wait_for_prewarmed(pool, 1)
+
+    pool.expire_prewarmed(max_age=0)
+    assert pool.get_stats().prewarmed == 0
+    assert pool.get_stats().prewarm_hits == 0
+    assert pool.borrow("https://example.com").opened == ["https://example.com"]
+
+
+def test_suspended_pool_closes_and_relaunches_browsers():
+    """A suspended pool keeps no browsers, resuming launches them again."""
+    pool = BrowserPool(size=1)
+    pool.start()
+    wait_for_idle(pool, 1)
+    browser = pool.borrow()
+    pool.give_back(browser)
+
+    pool.suspend()
+    assert browser.closed
+    assert pool.get_stats().idle == 0 and pool.get_stats().suspended
+    borrowed = pool.borrow()
+    assert not borrowed.pooled
+
+    pool.resume()
+    wait_for_idle(pool, 1)
+    assert not pool.get_stats().suspended
+
+
+class FakeResourceBlocker:
+    def __init__(self):
+        self.opened_before_attach = None
+
+    def attach(self, cdp):
+        self.opened_before_attach = list(cdp.opened)
+
+
+def test_pool_blocks_resources_before_opening_url():
+    """Blocked resources must not be loaded by the first page load."""
+    pool = BrowserPool(size=1)
+    resource_blocker = FakeResourceBlocker()
+    browser = pool.borrow("https://example.com", resource_blocker)
+    assert resource_blocker.opened_before_attach == []
+    assert browser.opened == ["https://example.com"]
+
+
+class FakeTab:
+    def __init__(self, url: str):
+        self.url = url
+
+    async def close(self):
+        pass
+
+
+class FakeResetCDPMethods:
+    def __init__(self):
+        self.page = FakeTab("https://app.example.com/dashboard")
+        self.tabs = [self.page, FakeTab("https://popup.example.net/consent")]
+        self.handlers = []
+        self.commands = []
+        self.loop = SimpleNamespace(run_until_complete=self._run)
+        self.page.send = self.commands.append
+
+    @staticmethod
+    def _run(result):
+        # Closing tabs returns a coroutine, CDP commands are recorded by send
+        if hasattr(result, "close"):
+            result.close()
+
+    def get_current_url(self) -> str:
+        return self.page.url
+
+    def open_new_tab(self, url: str):
+        previous = self.page
+        self.page = FakeTab(url)
+        self.page.send = previous.send
+        self.tabs.append(self.page)
+
+    def get_tabs(self):
+        return list(self.tabs)
+
+    def clear_cookies(self):
+        pass
+
+    def add_handler(self, event, handler):
+        self.handlers.append(handler)
+
+
+def test_reset_clears_storage_of_all_navigated_origins():
+    """Origins reached through redirects and frames, not only the opened URL, are cleared."""
+    browser = Browser.__new__(Browser)
+    browser._visited_origins = set()
+    cdp = FakeResetCDPMethods()
+    browser.sb = SimpleNamespace(cdp=cdp)
+    browser._watch_origins()
+
+    frame = SimpleNamespace(url="https://sso.example.org/authorize?client=1")
+    cdp.handlers[0](SimpleNamespace(frame=frame), None)
+    browser.reset()
+
+    cleared = set()
+    for command in cdp.commands:
+        request = next(command)
+        if request["method"] == "Storage.clearDataForOrigin":
+            cleared.add(request["params"]["origin"])
+    assert cleared == {
+        "https://sso.example.org",
+        "https://app.example.com",
+        "https://popup.example.net",
+    }
+    assert browser._visited_origins == set()
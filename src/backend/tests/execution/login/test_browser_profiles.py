@@ -0,0 +1,53 @@
+import os
+
+from execution.login.dom_interaction.browser_profiles import BrowserProfiles
+
+
+def write_file(path: str, size: int):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(b"0" * size)
+
+
+def test_profile_keeps_cache_and_removes_cookies(tmp_path):
+    profiles = BrowserProfiles(str(tmp_path), max_size_mb=10, disk_cache_mb=50)
+    profile = profiles.acquire(1, keep_cookies=False)
+    assert profile.disk_cache_mb == 50
+    cache = os.path.join(profile.user_data_dir, "Default", "Cache", "data_0")
+    cookies = os.path.join(profile.user_data_dir, "Default", "Network", "Cookies")
+    write_file(cache, 10)
+    write_file(cookies, 10)
+    profiles.release(1)
+
+    profiles.acquire(1, keep_cookies=True)
+    profiles.release(1)
+    assert os.path.exists(cookies)
+
+    profiles.acquire(1, keep_cookies=False)
+    assert os.path.exists(cache)
+    assert not os.path.exists(cookies)
+
+
+def test_profile_is_used_by_one_browser_at_a_time(tmp_path):
+    profiles = BrowserProfiles(str(tmp_path), max_size_mb=10)
+    assert profiles.acquire(1, keep_cookies=False) is not None
+    assert profiles.acquire(1, keep_cookies=False) is None
+    profiles.release(1)
+    assert profiles.acquire(1, keep_cookies=False) is not None
+
+
+def test_garbage_collection_removes_least_recently_used_profiles(tmp_path):
+    """Profiles of removed websites are deleted and the oldest profiles until the disk budget is met."""
+    profiles = BrowserProfiles(str(tmp_path), max_size_mb=1)
+    profile_dirs = {}
+    for website_id in (1, 2, 3, 4):
+        profile_dirs[website_id] = profiles.acquire(website_id, keep_cookies=False).user_data_dir
+        write_file(os.path.join(profile_dirs[website_id], "Default", "Cache", "data_0"), 600 * 1024)
+        os.utime(os.path.join(profile_dirs[website_id], "last_used"), (website_id, website_id))
+        profiles.release(website_id)
+    # Profiles in use are never removed
+    profiles.acquire(1, keep_cookies=False)
+
+    profiles.collect_garbage({1, 2, 3})
+
+    assert [os.path.exists(profile_dirs[website_id]) for website_id in (1, 2, 3, 4)] == [True, False, True, False]
@@ -0,0 +1,47 @@
+from execution.login.dom_interaction.captcha_probe import CAPTCHA_PROBE_SCRIPT
+from execution.login.dom_interaction.dom_interaction_driver import DomInteractionDriver
+
+
+class FakeCDPMethods:
+    def __init__(self, captcha: bool):
+        self.captcha = captcha
+        self.solved = 0
+
+    def evaluate(self, expression: str):
+        assert expression == CAPTCHA_PROBE_SCRIPT
+        return self.captcha
+
+    def solve_captcha(self):
+        self.solved += 1
+
+
+def create_driver(cdp: FakeCDPMethods) -> DomInteractionDriver:
+    driver = DomInteractionDriver("https://example.com/login")
+    driver._cdp = cdp
+    return driver
+
+
+def test_solver_only_runs_when_captcha_is_present():
+    cdp = FakeCDPMethods(captcha=False)
+    driver = create_driver(cdp)
+
+    assert not driver.solve_captcha()
+    assert not driver.solve_captcha()
+    assert cdp.solved == 0
+
+    cdp.captcha = True
+    assert driver.solve_captcha()
+    assert cdp.solved == 1
+    assert driver.captcha_stats.probes == 3
+    assert driver.captcha_stats.hits == 1
+    assert len(driver.captcha_stats.solve_seconds) == 1
+
+
+def test_solver_runs_when_probe_fails():
+    class FailingCDPMethods(FakeCDPMethods):
+        def evaluate(self, expression: str):
+            raise Exception("Page is loading")
+
+    cdp = FailingCDPMethods(captcha=False)
+    create_driver(cdp).solve_captcha()
+    assert cdp.solved == 1
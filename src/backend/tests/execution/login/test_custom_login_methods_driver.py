@@ -0,0 +1,155 @@
+import pytest
+
+from execution.login.constants import LoginStatusCode
+from execution.login.custom_login.custom_login_methods_driver import CustomLoginMethodsDriver
+from execution.login.dom_interaction.interfaces.dom_interaction_interface import DomInteractionInterface
+from execution.login.find_form_automatically import XPaths
+from utils.exceptions import ScriptExecutionStopped
+
+
+class FakeDriver(DomInteractionInterface):
+    def __init__(self, elements=()):
+        super().__init__("https://example.com/login")
+        self.elements = elements
+        self.values = {}
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def fill_text(self, xpath: str, value: str):
+        if xpath not in self.elements:
+            raise Exception("Element not found")
+        self.calls.append(("fill_text", xpath))
+        self.values[xpath] = value
+
+    def click_button(self, xpath: str):
+        if xpath not in self.elements:
+            raise Exception("Element not found")
+        self.calls.append(("click_button", xpath))
+
+    def has_cookie(self, name: str) -> bool:
+        return False
+
+    def get_input_value(self, xpath: str) -> str | None:
+        return self.values.get(xpath)
+
+    def wait_for_element(self, xpath: str, timeout_ms: int) -> bool:
+        self.calls.append(("wait_for_element", xpath))
+        return xpath in self.elements
+
+    def wait_for_network_idle(self, quiet_ms: int, timeout_ms: int) -> bool:
+        self.calls.append(("wait_for_network_idle",))
+        return True
+
+    def wait(self, ms: int):
+        self.calls.append(("wait", ms))
+
+    def open_url(self, url: str):
+        pass
+
+    def get_current_url(self) -> str:
+        return self._url
+
+    def find_element(self, xpath: str) -> bool:
+        return xpath in self.elements
+
+    def is_element_visible(self, xpath: str) -> bool:
+        return xpath in self.elements
+
+    def is_element_present(self, xpath: str) -> bool:
+        return xpath in self.elements
+
+    def get_page_html(self) -> str:
+        return ""
+
+    def save_screenshot(self, screenshot_id: str):
+        pass
+
+    def solve_captcha(self) -> bool:
+        return False
+
+    def disconnect_driver(self):
+        pass
+
+
+def test_steps_wait_for_conditions_instead_of_sleeping():
+    driver = FakeDriver(elements=["//input[1]", "//input[2]", "//button"])
+    steps = []
+    methods = CustomLoginMethodsDriver(
+        driver,
+        XPaths("//input[1]", "//input[2]", "//button"),
+        "user",
+        "secret",
+        on_step=lambda name, seconds: steps.append(name),
+    )
+
+    methods.fill_username()
+    methods.fill_password()
+    methods.click_submit_button()
+
+    assert driver.calls == [
+        ("wait_for_element", "//input[1]"),
+        ("fill_text", "//input[1]"),
+        ("wait_for_element", "//input[2]"),
+        ("fill_text", "//input[2]"),
+        ("wait_for_element", "//button"),
+        ("click_button", "//button"),
+    ]
+    assert steps == ["fillUsername", "fillPassword", "clickSubmitButton"]
+
+
+def test_clicks_only_wait_for_network_idle_when_requested():
+    driver = FakeDriver(elements=("//button",))
+    methods = CustomLoginMethodsDriver(driver, XPaths(None, None, None), "user", "secret")
+
+    methods.click_button("//button")
+    assert ("wait_for_network_idle",) not in driver.calls
+
+    methods.wait_for_network_idle(2000)
+    assert driver.calls[-1] == ("wait_for_network_idle",)
+
+
+def test_missing_element_stops_script():
+    methods = CustomLoginMethodsDriver(FakeDriver(), XPaths(None, None, None), "user", "secret")
+
+    with pytest.raises(ScriptExecutionStopped) as e:
+        methods.click_button("//button")
+    assert e.value.status == LoginStatusCode.BUTTON_NOT_FOUND
+
+
+def test_wait_for_url_supports_wildcards():
+    driver = FakeDriver()
+    urls = []
+    driver.wait_for_url = lambda matches, timeout_ms: urls.append(matches) or True
+    methods = CustomLoginMethodsDriver(driver, XPaths(None, None, None), "user", "secret")
+
+    methods.wait_for_url("https://example.com/*/home", 1000)
+    methods.wait_for_url("https://example.com/home", 1000)
+
+    assert urls[0]("https://example.com/de/home")
+    assert urls[1]("https://example.com/home/")
+    assert not urls[1]("https://example.com/de/home")
+
+
+def test_timed_out_waits_stop_script():
+    """The script stops at the wait that timed out instead of failing at a later step."""
+    methods = CustomLoginMethodsDriver(FakeDriver(), XPaths(None, None, None), "user", "secret")
+
+    with pytest.raises(ScriptExecutionStopped) as e:
+        methods.wait_for_element("//form", 5000)
+    assert e.value.status == LoginStatusCode.WAIT_TIMEOUT
+    assert e.value.message == 'waitForElement("//form", 5000) timed out.'
+
+    with pytest.raises(ScriptExecutionStopped) as e:
+        methods.wait_for_url("https://example.com/home", 1000)
+    assert e.value.status == LoginStatusCode.WAIT_TIMEOUT
+    assert e.value.message == (
+        'waitForUrl("https://example.com/home", 1000) timed out on "https://example.com/login".'
+    )
+
+    methods = CustomLoginMethodsDriver(FakeDriver(elements=("//form",)), XPaths(None, None, None), "user", "secret")
+    methods.wait_for_element("//form", 5000)
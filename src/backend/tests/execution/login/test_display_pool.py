@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+from execution.login.dom_interaction import display_pool
+from execution.login.dom_interaction.display_pool import Display, DisplayPool, use_display
+
+
+@pytest.fixture
+def fake_xvfb(monkeypatch):
+    monkeypatch.setattr(display_pool.shutil, "which", lambda name: f"/usr/bin/{name}")
+    started = []
+    monkeypatch.setattr(Display, "start", lambda display: started.append(display.number))
+    monkeypatch.setattr(Display, "alive", property(lambda display: True))
+    monkeypatch.setattr(Display, "stop", lambda display: None)
+    return started
+
+
+def test_display_pool_reuses_released_displays(fake_xvfb):
+    """Every browser gets its own display, released displays are reused."""
+    pool = DisplayPool(first_display=1000)
+    first = pool.acquire()
+    second = pool.acquire()
+    assert first.name != second.name
+
+    pool.release(first)
+    assert pool.acquire() is first
+    assert len(fake_xvfb) == 2
+
+
+def test_display_pool_without_xvfb(monkeypatch):
+    monkeypatch.setattr(display_pool.shutil, "which", lambda name: None)
+    assert DisplayPool().acquire() is None
+
+
+def test_use_display_switches_display(monkeypatch):
+    monkeypatch.setenv("DISPLAY", ":99")
+    with use_display(Display(1000)):
+        assert os.environ["DISPLAY"] == ":1000"
+    assert os.environ["DISPLAY"] == ":99"
+    with use_display(None):
+        assert os.environ["DISPLAY"] == ":99"
@@ -0,0 +1,90 @@
+import httpx
+import pytest
+
+from execution.login import http_login as http_login_module
+from execution.login.find_form_automatically import LoginFormFinder
+from execution.login.http_login import StaticHtmlPage, get_form_submission, http_login
+
+LOGIN_PAGE = """
+<html><body>
+  <form action="/session" method="post">
+    <input type="hidden" name="csrf" value="token">
+    <input type="email" name="email" id="email">
+    <input type="password" name="password" id="password">
+    <input type="checkbox" name="remember" checked>
+    <button type="submit" id="login">Log in</button>
+  </form>
+</body></html>
+"""
+
+
+def test_form_submission_contains_all_form_fields():
+    page = StaticHtmlPage("https://example.com/login", LOGIN_PAGE)
+    xpaths = LoginFormFinder(driver=page).find_login_automatically()
+
+    submission = get_form_submission(page, xpaths, "user@example.com", "secret")
+
+    assert submission.method == "POST"
+    assert submission.action == "https://example.com/session"
+    assert submission.data == [
+        ("csrf", "token"),
+        ("email", "user@example.com"),
+        ("password", "secret"),
+        ("remember", "on"),
+    ]
+
+
+def test_static_page_returns_input_value_of_markup():
+    page = StaticHtmlPage("https://example.com/login", LOGIN_PAGE)
+
+    assert page.get_input_value("//input[@name='csrf']") == "token"
+    assert page.get_input_value("//input[@id='email']") == ""
+    assert page.get_input_value("//input[@id='missing']") is None
+
+
+@pytest.fixture
+def fake_website(monkeypatch):
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/login":
+            return httpx.Response(200, html=LOGIN_PAGE)
+        if request.url.path == "/session":
+            if b"password=secret" not in request.content:
+                return httpx.Response(303, headers={"Location": "/login"})
+            return httpx.Response(
+                303, headers={"Location": "/dashboard", "Set-Cookie": "session=1; Path=/"}
+            )
+        if request.url.path == "/dashboard":
+            if "session=1" not in request.headers.get("cookie", ""):
+                return httpx.Response(302, headers={"Location": "/login"})
+            return httpx.Response(200, html="<html><body>Welcome</body></html>")
+        return httpx.Response(404)
+
+    async_client = httpx.AsyncClient
+
+    def create_client(**kwargs):
+        return async_client(transport=httpx.MockTransport(handle), **kwargs)
+
+    monkeypatch.setattr(http_login_module.httpx, "AsyncClient", create_client)
+    return requests
+
+
+def test_http_login_follows_redirect_to_success_url(fake_website):
+    assert http_login(
+        url="https://example.com/login",
+        success_url="https://example.com/dashboard",
+        username="user@example.com",
+        password="secret",
+    )
+
+
+def test_http_login_fails_with_wrong_password(fake_website):
+    """A login that ends on the login page again has to be retried in the browser."""
+    assert not http_login(
+        url="https://example.com/login",
+        success_url="https://example.com/dashboard",
+        username="user@example.com",
+        password="wrong",
+    )
@@ -0,0 +1,92 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from execution.login.dom_interaction import navigation_watcher
+from execution.login.dom_interaction.navigation_watcher import NavigationWatcher
+
+
+class FakeCDPMethods:
+    def __init__(self, url: str):
+        self.loop = asyncio.new_event_loop()
+        self.url = url
+
+    def get_current_url(self) -> str:
+        return self.url
+
+
+def frame_navigated(url: str, loader_id: str = "loader"):
+    return SimpleNamespace(
+        frame=SimpleNamespace(id_="main", parent_id=None, loader_id=loader_id, url=url, url_fragment=None)
+    )
+
+
+def lifecycle_event(name: str, loader_id: str = "loader"):
+    return SimpleNamespace(frame_id="main", loader_id=loader_id, name=name)
+
+
+@pytest.fixture
+def cdp():
+    cdp = FakeCDPMethods("https://example.com/login")
+    yield cdp
+    cdp.loop.close()
+
+
+def test_wait_returns_when_url_matches(cdp):
+    """The wait ends with the navigation event, not with the next poll."""
+    watcher = NavigationWatcher()
+    cdp.loop.call_later(
+        0.1, watcher._on_frame_navigated, frame_navigated("https://example.com/dashboard")
+    )
+
+    started = time.monotonic()
+    assert watcher.wait_for_url(
+        lambda function: function(cdp), lambda url: url == "https://example.com/dashboard", timeout=10
+    )
+    assert time.monotonic() - started < 1
+
+
+def test_wait_fails_when_page_settles_elsewhere(cdp, monkeypatch):
+    monkeypatch.setattr(navigation_watcher, "SETTLE_QUIET_SECONDS", 0.2)
+    watcher = NavigationWatcher()
+    cdp.loop.call_later(0.05, watcher._on_frame_navigated, frame_navigated("https://example.com/login"))
+    cdp.loop.call_later(0.1, watcher._on_lifecycle_event, lifecycle_event("networkIdle"))
+
+    started = time.monotonic()
+    assert not watcher.wait_for_url(
+        lambda function: function(cdp), lambda url: url == "https://example.com/dashboard", timeout=10
+    )
+    assert time.monotonic() - started < 1
+
+
+def test_idle_event_of_previous_document_is_ignored(cdp, monkeypatch):
+    monkeypatch.setattr(navigation_watcher, "SETTLE_QUIET_SECONDS", 0.1)
+    watcher = NavigationWatcher()
+    watcher._on_frame_navigated(frame_navigated("https://example.com/login", loader_id="new"))
+    watcher._on_lifecycle_event(lifecycle_event("networkIdle", loader_id="old"))
+
+    assert not watcher.wait_for_url(lambda function: function(cdp), lambda url: False, timeout=0.5)
+    assert not watcher._settled
+
+
+def request(request_id: str):
+    return SimpleNamespace(request_id=request_id)
+
+
+def test_network_idle_waits_for_pending_requests(cdp):
+    watcher = NavigationWatcher()
+    watcher._on_request_will_be_sent(request("1"))
+    cdp.loop.call_later(0.2, watcher._on_request_done, request("1"))
+
+    started = time.monotonic()
+    assert watcher.wait_for_network_idle(lambda function: function(cdp), quiet=0.1, timeout=10)
+    assert 0.3 <= time.monotonic() - started < 1
+
+
+def test_network_idle_times_out_with_open_request(cdp):
+    watcher = NavigationWatcher()
+    watcher._on_request_will_be_sent(request("long-poll"))
+
+    assert not watcher.wait_for_network_idle(lambda function: function(cdp), quiet=0.1, timeout=0.3)
@@ -35,6 +35,15 @@ class MockCustomLoginMethods(CustomLoginMethodsInterface):
     def wait(self, ms: int):
         self.calls.append(("wait", ms))
 
+    def wait_for_element(self, xpath: str, timeout_ms: int):
+        self.calls.append(("wait_for_element", xpath, timeout_ms))
+
+    def wait_for_url(self, url: str, timeout_ms: int):
+        self.calls.append(("wait_for_url", url, timeout_ms))
+
+    def wait_for_network_idle(self, timeout_ms: int):
+        self.calls.append(("wait_for_network_idle", timeout_ms))
+
 
 class TestCustomLoginScriptParser:
     """Test suite for CustomLoginScriptParser"""
@@ -171,6 +180,32 @@ class TestCustomLoginScriptParser:
         result = CustomLoginScriptParser.check_syntax("wait()")
         assert result is not None
 
+    # Execution tests for condition waits
+
+    def test_execute_wait_for_element(self, parser, mock_methods):
+        """Test executing waitForElement with xpath and timeout"""
+        script = 'waitForElement("//div[@id=\'dashboard\']", 5000)'
+        parser.execute(script)
+        assert mock_methods.calls == [("wait_for_element", "//div[@id='dashboard']", 5000)]
+
+    def test_execute_wait_for_url(self, parser, mock_methods):
+        """Test executing waitForUrl with url pattern and timeout"""
+        script = 'waitForUrl("https://example.com/*/home", 10000)'
+        parser.execute(script)
+        assert mock_methods.calls == [("wait_for_url", "https://example.com/*/home", 10000)]
+
+    def test_execute_wait_for_network_idle(self, parser, mock_methods):
+        """Test executing waitForNetworkIdle with timeout"""
+        script = "clickButton('//button') waitForNetworkIdle(3000)"
+        parser.execute(script)
+        assert mock_methods.calls == [("click_button", "//button"), ("wait_for_network_idle", 3000)]
+
+    def test_condition_waits_require_timeout(self):
+        """Test that condition waits without timeout are invalid"""
+        assert CustomLoginScriptParser.check_syntax('waitForElement("//div")') is not None
+        assert CustomLoginScriptParser.check_syntax('waitForUrl("https://example.com")') is not None
+        assert CustomLoginScriptParser.check_syntax("waitForNetworkIdle()") is not None
+
     # Error handling tests
 
     def test_execute_script_execution_stopped(self):
@@ -200,6 +235,15 @@ class TestCustomLoginScriptParser:
             def wait(self, ms: int):
                 pass
 
+            def wait_for_element(self, xpath: str, timeout_ms: int):
+                pass
+
+            def wait_for_url(self, url: str, timeout_ms: int):
+                pass
+
+            def wait_for_network_idle(self, timeout_ms: int):
+                pass
+
         mock_methods = ExceptionRaisingMock()
         parser = CustomLoginScriptParser(mock_methods)
 
@@ -0,0 +1,100 @@
+import socket
+import ssl
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from execution.login.preflight import check_reachability
+
+
+def create_server(status: int) -> HTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            self.send_response(status)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.mark.parametrize("status", [200, 403, 503])
+def test_responding_website_is_reachable(status):
+    """Bot protection often answers requests without a browser with errors, e.g. challenge pages with 503."""
+    server = create_server(status)
+    try:
+        assert check_reachability(f"http://127.0.0.1:{server.server_port}/login") is None
+    finally:
+        server.shutdown()
+
+
+def test_closed_port_is_unreachable():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    message = check_reachability(f"http://127.0.0.1:{port}/login")
+    assert message.startswith(f"Connection to 127.0.0.1:{port} failed")
+
+
+def test_failed_tls_handshake_is_unreachable():
+    """A server that does not speak TLS on an HTTPS URL."""
+    server = create_server(200)
+    try:
+        message = check_reachability(f"https://127.0.0.1:{server.server_port}/login")
+        assert message.startswith(f"TLS handshake with 127.0.0.1:{server.server_port} failed")
+    finally:
+        server.shutdown()
+
+
+def test_url_without_scheme_is_checked_with_https():
+    """Like the browser, which opens URLs without scheme with HTTPS."""
+    server = create_server(200)
+    try:
+        message = check_reachability(f"127.0.0.1:{server.server_port}/login")
+        assert message.startswith(f"TLS handshake with 127.0.0.1:{server.server_port} failed")
+    finally:
+        server.shutdown()
+
+
+def test_untrusted_certificate_is_reachable(tmp_path):
+    """The browser may trust a certificate Python does not, e.g. of a private CA."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "example.com")])
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    certificate_path = tmp_path / "certificate.pem"
+    key_path = tmp_path / "key.pem"
+    certificate_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption(),
+        )
+    )
+    server = create_server(200)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certificate_path, key_path)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    try:
+        assert check_reachability(f"https://127.0.0.1:{server.server_port}/login") is None
+    finally:
+        server.shutdown()
@@ -0,0 +1,54 @@
+import mycdp
+
+from execution.login.dom_interaction.resource_blocking import (
+    BlockedResource,
+    CAPTCHA_URL_PATTERNS,
+    ResourceBlocker,
+    get_block_patterns,
+    parse_blocked_resources,
+)
+
+
+def test_parse_blocked_resources_skips_invalid_types(capsys):
+    assert parse_blocked_resources(["image", "scripts", "tracker"]) == [
+        BlockedResource.IMAGE,
+        BlockedResource.TRACKER,
+    ]
+    assert "Invalid resource type scripts" in capsys.readouterr().out
+
+
+def test_allowed_patterns_precede_blocked_patterns():
+    """Chrome applies the first matching pattern, so allowed URLs have to come first."""
+    patterns = get_block_patterns([BlockedResource.FONT], ["https://example.com/*.woff2"])
+    allowed = [pattern.url_pattern for pattern in patterns if not pattern.block]
+    assert allowed == [*CAPTCHA_URL_PATTERNS, "https://example.com/*.woff2"]
+    assert patterns[: len(allowed)] == [pattern for pattern in patterns if not pattern.block]
+    assert "*://*/*.woff2" in [pattern.url_pattern for pattern in patterns if pattern.block]
+
+
+def test_nothing_is_blocked_without_resource_types():
+    assert get_block_patterns([], ["https://example.com/*"]) == []
+
+
+def test_blocker_counts_blocked_requests_and_loaded_bytes():
+    resource_blocker = ResourceBlocker(get_block_patterns([BlockedResource.IMAGE]))
+    resource_blocker._on_loading_failed(
+        mycdp.network.LoadingFailed.from_json(
+            {"requestId": "1", "timestamp": 1, "type": "Image", "errorText": "", "blockedReason": "inspector"}
+        ),
+        None,
+    )
+    resource_blocker._on_loading_failed(
+        mycdp.network.LoadingFailed.from_json(
+            {"requestId": "2", "timestamp": 1, "type": "Script", "errorText": "net::ERR_FAILED"}
+        ),
+        None,
+    )
+    resource_blocker._on_loading_finished(
+        mycdp.network.LoadingFinished.from_json({"requestId": "3", "timestamp": 1, "encodedDataLength": 2048}),
+        None,
+    )
+
+    stats = resource_blocker.get_stats()
+    assert stats.blocked_requests == 1
+    assert stats.loaded_bytes == 2048
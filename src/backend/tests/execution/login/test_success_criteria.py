@@ -0,0 +1,202 @@
+import time
+from typing import Callable
+
+from dataAccess.database.database import SuccessUrlMatch
+from execution.login.dom_interaction.interfaces.dom_interaction_interface import DomInteractionInterface
+from execution.login import login
+from execution.login.login import _wait_for_success
+from execution.login.success_criteria import SuccessCriteria, get_url_matcher
+
+
+class FakeDriver(DomInteractionInterface):
+    def __init__(self, current_url: str, elements=(), cookies=()):
+        super().__init__(current_url)
+        self.current_url = current_url
+        self.elements = elements
+        self.cookies = cookies
+        self.opened = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def get_current_url(self) -> str:
+        return self.current_url
+
+    def find_element(self, xpath: str) -> bool:
+        # Like SeleniumBase, which waits for the element and raises if it does not appear
+        if xpath not in self.elements:
+            raise Exception(f"Element {xpath} was not found")
+        return True
+
+    def is_element_present(self, xpath: str) -> bool:
+        return xpath in self.elements
+
+    def has_cookie(self, name: str) -> bool:
+        return name in self.cookies
+
+    def get_input_value(self, xpath: str) -> str | None:
+        return None
+
+    def wait_for_url(self, matches: Callable[[str], bool], timeout_ms: int) -> bool:
+        return matches(self.current_url)
+
+    def open_url(self, url: str):
+        self.opened.append(url)
+        self.current_url = url
+
+    def is_element_visible(self, xpath: str) -> bool:
+        return self.is_element_present(xpath)
+
+    def get_page_html(self) -> str:
+        return ""
+
+    def save_screenshot(self, screenshot_id: str):
+        pass
+
+    def solve_captcha(self) -> bool:
+        return False
+
+    def disconnect_driver(self):
+        pass
+
+    def fill_text(self, xpath: str, value: str):
+        pass
+
+    def click_button(self, xpath: str):
+        pass
+
+    def wait(self, ms: int):
+        pass
+
+
+def test_url_matchers():
+    assert get_url_matcher(SuccessUrlMatch.EXACT, "https://example.com/home")("https://example.com/home/")
+    assert get_url_matcher(SuccessUrlMatch.PREFIX, "https://example.com/app")("https://example.com/app/1")
+    assert get_url_matcher(SuccessUrlMatch.GLOB, "https://example.com/*/home")("https://example.com/de/home")
+    assert not get_url_matcher(SuccessUrlMatch.GLOB, "https://example.com/*/home")("https://example.com/de/login")
+    assert get_url_matcher(SuccessUrlMatch.REGEX, r"https://example\.com/u/\d+")("https://example.com/u/42")
+    assert not get_url_matcher(SuccessUrlMatch.REGEX, r"https://example\.com/u/\d+")("https://example.com/u/42/x")
+
+
+def test_glob_only_treats_asterisk_as_wildcard():
+    matches = get_url_matcher(SuccessUrlMatch.GLOB, "https://example.com/a?b=*")
+    assert matches("https://example.com/a?b=1")
+    assert not matches("https://example.com/aXb=1")
+    matches = get_url_matcher(SuccessUrlMatch.GLOB, "https://example.com/search?q[]=*")
+    assert matches("https://example.com/search?q[]=enterr")
+    assert not matches("https://example.com/search?q=enterr")
+
+
+def test_prefix_matches_on_host_and_path_segments():
+    matches = get_url_matcher(SuccessUrlMatch.PREFIX, "https://example.com/app")
+    assert matches("https://example.com/app")
+    assert matches("https://EXAMPLE.com/app/1?tab=2")
+    assert not matches("https://example.com.evil/app")
+    assert not matches("https://example.com/apple")
+    assert not matches("http://example.com/app")
+    assert get_url_matcher(SuccessUrlMatch.PREFIX, "https://example.com")("https://example.com/any")
+
+
+def test_url_matchers_are_compiled_once():
+    assert get_url_matcher(SuccessUrlMatch.REGEX, "https://.*") is get_url_matcher(SuccessUrlMatch.REGEX, "https://.*")
+
+
+def test_all_conditions_have_to_be_met():
+    criteria = SuccessCriteria("https://example.com/home", selector="//a[@id='logout']", cookie="session")
+    assert criteria.is_met(
+        FakeDriver("https://example.com/home", elements=["//a[@id='logout']"], cookies=["session"])
+    )
+    assert not criteria.is_met(FakeDriver("https://example.com/home", elements=["//a[@id='logout']"]))
+    assert not criteria.is_met(FakeDriver("https://example.com/home", cookies=["session"]))
+
+
+def test_success_url_is_not_opened_after_redirect():
+    """The page after the submit already meets the criteria, so no additional page load is needed."""
+    driver = FakeDriver("https://example.com/home")
+    assert _wait_for_success(driver, SuccessCriteria("https://example.com/home"))
+    assert driver.opened == []
+
+
+def test_success_url_is_opened_when_page_did_not_redirect():
+    driver = FakeDriver("https://example.com/login")
+    assert _wait_for_success(driver, SuccessCriteria("https://example.com/home"))
+    assert driver.opened == ["https://example.com/home"]
+
+
+def test_patterns_are_not_opened():
+    driver = FakeDriver("https://example.com/login")
+    assert not _wait_for_success(driver, SuccessCriteria("https://example.com/home/*", url_match=SuccessUrlMatch.GLOB))
+    assert driver.opened == []
+
+
+def test_success_url_gets_own_timeout_when_page_never_settles(monkeypatch):
+    """A page that keeps polling in the background uses up the whole wait after the submit."""
+    monkeypatch.setattr(login, "POST_SUBMIT_TIMEOUT", 0.2)
+    monkeypatch.setattr(login, "TIMEOUT", 1)
+
+    class NeverSettlingDriver(FakeDriver):
+        def wait_for_url(self, matches: Callable[[str], bool], timeout_ms: int) -> bool:
+            if not matches(self.current_url):
+                time.sleep(timeout_ms / 1000)
+            return matches(self.current_url)
+
+    driver = NeverSettlingDriver("https://example.com/login")
+    started = time.monotonic()
+    assert _wait_for_success(driver, SuccessCriteria("https://example.com/home"))
+    assert driver.opened == ["https://example.com/home"]
+    assert time.monotonic() - started < 1
+
+
+def test_captcha_is_solved_when_it_holds_back_the_redirect():
+    class CaptchaDriver(FakeDriver):
+        def solve_captcha(self) -> bool:
+            self.current_url = "https://example.com/home"
+            return True
+
+    driver = CaptchaDriver("https://example.com/captcha")
+    assert _wait_for_success(driver, SuccessCriteria("https://example.com/home"))
+    assert driver.opened == []
+
+
+def test_captcha_attempts_are_limited(monkeypatch):
+    monkeypatch.setattr(login, "MAX_CAPTCHA_ATTEMPTS", 2)
+
+    class UnsolvableCaptchaDriver(FakeDriver):
+        solved = 0
+
+        def solve_captcha(self) -> bool:
+            self.solved += 1
+            return True
+
+    driver = UnsolvableCaptchaDriver("https://example.com/captcha")
+    criteria = SuccessCriteria("https://example.com/home/*", url_match=SuccessUrlMatch.GLOB)
+    assert not _wait_for_success(driver, criteria)
+    assert driver.solved == 2
+
+
+def test_success_url_is_opened_when_page_settles_on_another_url():
+    """Without a captcha the page gets no further chance, so the success url is opened at once."""
+
+    class SettlingDriver(FakeDriver):
+        waits_before_open = 0
+
+        def wait_for_url(self, matches: Callable[[str], bool], timeout_ms: int) -> bool:
+            if not self.opened:
+                self.waits_before_open += 1
+            return matches(self.current_url)
+
+    driver = SettlingDriver("https://example.com/dashboard")
+    started = time.monotonic()
+    assert _wait_for_success(driver, SuccessCriteria("https://example.com/home/settings"))
+    assert driver.opened == ["https://example.com/home/settings"]
+    assert driver.waits_before_open == 1
+    assert time.monotonic() - started < 1
+
+
+def test_missing_success_element_does_not_match(monkeypatch):
+    monkeypatch.setattr(login, "SUCCESS_CONDITIONS_TIMEOUT", 0.1)
+    driver = FakeDriver("https://example.com/home")
+    assert not _wait_for_success(driver, SuccessCriteria("https://example.com/home", selector="//a[@id='logout']"))
@@ -0,0 +1,243 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from execution import login_worker_pool
+from execution.login_queue import LoginJob, LoginQueue
+from execution.login_worker_pool import LoginWorkerPool
+
+
+def test_queue_ignores_duplicate_website():
+    """A website that is already waiting is not queued twice."""
+    queue = LoginQueue()
+    assert queue.put(LoginJob(website_id=1, host="host1", user_id=1))
+    assert not queue.put(LoginJob(website_id=1, host="host1", user_id=1))
+    assert queue.put(LoginJob(website_id=2, host="host2", user_id=1))
+    assert len(queue) == 2
+
+
+def test_queue_remove_and_close():
+    """Removed jobs are not returned and a closed queue returns None."""
+    queue = LoginQueue()
+    queue.put(LoginJob(website_id=1, host="host1", user_id=1))
+    queue.put(LoginJob(website_id=2, host="host2", user_id=1))
+    assert queue.remove(1)
+    assert not queue.remove(1)
+    assert queue.get().website_id == 2
+    queue.close()
+    assert queue.get() is None
+    assert not queue.put(LoginJob(website_id=3, host="host3", user_id=1))
+
+
+def test_queue_limits_concurrent_logins_per_host():
+    """Jobs of a saturated host wait while jobs of other hosts are executed."""
+    queue = LoginQueue(max_per_host=1)
+    first = LoginJob(website_id=1, host="a.com", user_id=1)
+    queue.put(first)
+    queue.put(LoginJob(website_id=2, host="a.com", user_id=1))
+    queue.put(LoginJob(website_id=3, host="b.com", user_id=1))
+
+    assert queue.get() is first
+    assert queue.get().website_id == 3
+    assert queue.throttled() == 1
+
+    queue.task_done(first)
+    assert queue.throttled() == 0
+    assert queue.get().website_id == 2
+
+
+def test_queue_spaces_logins_to_same_host():
+    """Consecutive logins to the same host are started with a minimum spacing."""
+    queue = LoginQueue(max_per_host=2, host_min_interval=0.2)
+    queue.put(LoginJob(website_id=1, host="a.com", user_id=1))
+    queue.put(LoginJob(website_id=2, host="a.com", user_id=1))
+
+    start = time.monotonic()
+    queue.get()
+    queue.get()
+    assert time.monotonic() - start >= 0.2
+
+
+def test_queue_shares_workers_fairly_between_users():
+    """A user with many jobs does not starve a user with few jobs."""
+    queue = LoginQueue(max_per_host=10)
+    for website_id in range(1, 6):
+        queue.put(LoginJob(website_id=website_id, host="a.com", user_id=1))
+    queue.put(LoginJob(website_id=10, host="b.com", user_id=2))
+    queue.put(LoginJob(website_id=11, host="b.com", user_id=2))
+
+    order = []
+    for _ in range(7):
+        job = queue.get()
+        order.append(job.user_id)
+        queue.task_done(job)
+    assert order[:4] == [1, 2, 1, 2]
+    assert set(queue.get_wait_times()) == {1, 2}
+
+
+def test_queue_respects_user_weights_and_limits():
+    """Users get a share proportional to their weight and at most max_per_user running jobs."""
+    queue = LoginQueue(max_per_host=10, max_per_user=1, user_weights={1: 2})
+    for website_id in range(1, 5):
+        queue.put(LoginJob(website_id=website_id, host="a.com", user_id=1))
+        queue.put(LoginJob(website_id=website_id + 10, host="b.com", user_id=2))
+
+    first = queue.get()
+    second = queue.get()
+    assert {first.user_id, second.user_id} == {1, 2}
+    # Both users reached their limit
+    assert queue.throttled() == 6
+
+    queue.task_done(first)
+    queue.task_done(second)
+    order = []
+    for _ in range(6):
+        job = queue.get()
+        order.append(job.user_id)
+        queue.task_done(job)
+    assert order.count(1) == 3
+    assert order[:3].count(1) == 2
+
+
+def test_queue_runs_jobs_earliest_deadline_first():
+    """Jobs in the danger window run first, otherwise a user's jobs run earliest deadline first."""
+    now = datetime.now(timezone.utc)
+    queue = LoginQueue(max_per_host=10, danger_window=timedelta(hours=1))
+    queue.put(LoginJob(website_id=1, host="a.com", user_id=1))
+    queue.put(LoginJob(website_id=2, host="a.com", user_id=1, deadline=now + timedelta(days=7)))
+    queue.put(LoginJob(website_id=3, host="a.com", user_id=1, deadline=now + timedelta(days=2)))
+    queue.put(LoginJob(website_id=4, host="b.com", user_id=2, deadline=now + timedelta(days=1)))
+    queue.put(LoginJob(website_id=5, host="b.com", user_id=2, deadline=now + timedelta(minutes=30)))
+    queue.put(LoginJob(website_id=6, host="b.com", user_id=2, deadline=now - timedelta(minutes=5)))
+
+    order = []
+    for _ in range(6):
+        job = queue.get()
+        order.append(job.website_id)
+        queue.task_done(job)
+    assert order[:2] == [6, 5]
+    assert [website_id for website_id in order if website_id < 4] == [3, 2, 1]
+
+
+def test_worker_pool_executes_jobs_in_parallel():
+    """All workers of the pool pick up jobs at the same time."""
+    worker_count = 3
+    barrier = threading.Barrier(worker_count, timeout=5)
+    all_executed = threading.Event()
+    executed = []
+    lock = threading.Lock()
+
+    def execute(worker, job):
+        barrier.wait()
+        with lock:
+            executed.append((worker.worker_id, job.website_id))
+            if len(executed) == worker_count:
+                all_executed.set()
+
+    pool = LoginWorkerPool(size=worker_count, execute=execute)
+    pool.start()
+    for website_id in range(worker_count):
+        pool.submit(LoginJob(website_id=website_id, host=f"host{website_id}", user_id=1))
+
+    assert all_executed.wait(5)
+    pool.stop()
+    assert sorted(website_id for _, website_id in executed) == [0, 1, 2]
+    assert len({worker_id for worker_id, _ in executed}) == worker_count
+
+
+def test_worker_pool_status():
+    """The status reports queue depth and utilisation of every worker."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def execute(_worker, _job):
+        started.set()
+        release.wait(5)
+
+    pool = LoginWorkerPool(size=1, execute=execute)
+    pool.start()
+    pool.submit(LoginJob(website_id=1, host="host1", user_id=1))
+    started.wait(5)
+    pool.submit(LoginJob(website_id=2, host="host2", user_id=1))
+
+    status = pool.get_status()
+    assert status.queue_depth == 1
+    assert len(status.workers) == 1
+    assert status.workers[0].busy
+    assert status.workers[0].website_id == 1
+    assert 0 < status.workers[0].utilisation <= 1
+
+    release.set()
+    pool.stop()
+    assert pool.get_status().workers == []
+
+
+def test_worker_pool_replaces_hung_worker():
+    """A job exceeding the timeout is abandoned and a new worker takes over the slot."""
+    release = threading.Event()
+    executed = []
+    timed_out = []
+
+    def execute(worker, job):
+        if job.website_id == 1:
+            release.wait(5)
+            # The results of an abandoned job are discarded
+            assert worker.abandoned
+            return
+        executed.append(job.website_id)
+
+    pool = LoginWorkerPool(
+        size=1,
+        execute=execute,
+        timeout=0.2,
+        on_timeout=lambda _worker, job: timed_out.append(job.website_id),
+    )
+    pool.start()
+    pool.submit(LoginJob(website_id=1, host="host1", user_id=1))
+    pool.submit(LoginJob(website_id=2, host="host1", user_id=1))
+
+    deadline = time.monotonic() + 5
+    while not executed and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert timed_out == [1]
+    assert executed == [2]
+    status = pool.get_status()
+    assert status.timed_out_jobs == 1
+    assert len(status.workers) == 1
+
+    release.set()
+    pool.stop()
+
+
+def test_worker_pool_stop_kills_and_leaves_hung_jobs(monkeypatch):
+    """A job that hangs in its browser or outside of it does not block the shutdown."""
+    monkeypatch.setattr(login_worker_pool, "STOP_TIMEOUT_SECONDS", 0.2)
+    started = threading.Barrier(3, timeout=5)
+    release = threading.Event()
+    killed = []
+
+    class HungDriver:
+        def kill(self):
+            killed.append(True)
+            release.set()
+
+    def execute(worker, job):
+        if job.website_id == 1:
+            worker.driver = HungDriver()
+            started.wait()
+            release.wait(5)
+        else:
+            started.wait()
+            threading.Event().wait(5)
+
+    pool = LoginWorkerPool(size=2, execute=execute)
+    pool.start()
+    pool.submit(LoginJob(website_id=1, host="host1", user_id=1))
+    pool.submit(LoginJob(website_id=2, host="host2", user_id=1))
+    started.wait()
+
+    stopped_at = time.monotonic()
+    pool.stop()
+    assert time.monotonic() - stopped_at < 2
+    assert killed == [True]
+    assert pool.get_status().workers == []
@@ -0,0 +1,222 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+
+from dataAccess.database.change_database import ExpirationEntry, ScheduleEntry
+from execution.constants import CATCH_UP_WINDOW_MINUTES
+from execution.login.constants import LoginStatusCode
+from execution.scheduler import Scheduler
+
+
+def create_entry(
+    website_id: int, next_schedule: datetime | None, expiration_interval: timedelta | None
+) -> ScheduleEntry:
+    return ScheduleEntry(
+        id=website_id,
+        paused=False,
+        next_schedule=next_schedule.replace(tzinfo=None) if next_schedule else None,
+        expiration_interval=expiration_interval,
+    )
+
+
+def get_run_dates(scheduler: Scheduler) -> dict[int, datetime]:
+    return {int(job.id): job.trigger.run_date for job in scheduler.scheduler.get_jobs()}
+
+
+def test_init_tasks_schedules_entries(monkeypatch):
+    """Future logins keep their schedule, paused websites without schedule are skipped."""
+    now = datetime.now(timezone.utc)
+    entries = [
+        create_entry(1, now + timedelta(hours=1), None),
+        create_entry(2, None, None)._replace(paused=True),
+        create_entry(3, now - timedelta(hours=1), None),
+    ]
+    monkeypatch.setattr(
+        "dataAccess.data_access_internal.DataAccessInternal.get_schedule_entries_all_users",
+        lambda: iter(entries),
+    )
+    monkeypatch.setattr(
+        "dataAccess.data_access_internal.DataAccessInternal.get_expiration_entries_all_users",
+        lambda: iter([]),
+    )
+    scheduler = Scheduler(data_access_internal=None, webhook_endpoints=None, persistent_jobs=False)
+
+    scheduler._init_tasks()
+
+    run_dates = get_run_dates(scheduler)
+    assert set(run_dates) == {1, 3}
+    assert run_dates[1] == now + timedelta(hours=1)
+    assert run_dates[3] >= now
+
+
+def create_expiration_entry(
+    website_id: int, last_successful_login: datetime, expiration_interval: timedelta
+) -> ExpirationEntry:
+    return ExpirationEntry(
+        id=website_id,
+        user=1,
+        paused=False,
+        added_at=last_successful_login.replace(tzinfo=None),
+        expiration_interval=expiration_interval,
+        last_successful_login=last_successful_login.replace(tzinfo=None),
+    )
+
+
+def test_catch_up_spreads_overdue_logins_by_urgency(monkeypatch):
+    """Overdue logins are spread over the catch-up window, the account that expires first first."""
+    scheduler = Scheduler(data_access_internal=None, webhook_endpoints=None, persistent_jobs=False)
+    now = datetime.now(timezone.utc)
+    entries = [
+        # Overdue by days, but the account expires in 28 days
+        create_entry(1, now - timedelta(days=3), timedelta(days=30)),
+        # Overdue by an hour only, but the account expires in an hour
+        create_entry(2, now - timedelta(hours=1), timedelta(days=1)),
+        # No expiration interval
+        create_entry(3, now - timedelta(days=30), None),
+    ]
+    expiration_entries = [
+        create_expiration_entry(1, now - timedelta(days=2), timedelta(days=30)),
+        create_expiration_entry(2, now - timedelta(hours=23), timedelta(days=1)),
+        # Not overdue
+        create_expiration_entry(4, now - timedelta(days=1), timedelta(days=1)),
+    ]
+    monkeypatch.setattr(
+        "dataAccess.data_access_internal.DataAccessInternal.get_expiration_entries_all_users",
+        lambda: iter(expiration_entries),
+    )
+
+    scheduler._schedule_catch_up(entries, now)
+
+    run_dates = get_run_dates(scheduler)
+    assert sorted(run_dates, key=run_dates.get) == [2, 1, 3]
+    spacing = timedelta(minutes=CATCH_UP_WINDOW_MINUTES) / 3
+    assert run_dates[2] == now
+    assert run_dates[1] == now + spacing
+    assert run_dates[3] == now + spacing * 2
+
+
+def test_init_tasks_reconciles_persisted_jobs(monkeypatch, tmp_path, capsys):
+    """Persisted jobs that still match are kept, changed and removed websites are updated."""
+    monkeypatch.setattr(
+        "execution.scheduler.engine", create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    )
+    now = datetime.now(timezone.utc)
+    entries = [
+        create_entry(1, now + timedelta(hours=1), None),
+        create_entry(2, now + timedelta(hours=2), None),
+        create_entry(3, now + timedelta(hours=3), None),
+    ]
+    monkeypatch.setattr(
+        "dataAccess.data_access_internal.DataAccessInternal.get_schedule_entries_all_users",
+        lambda: iter(entries),
+    )
+
+    async def restart() -> dict[int, datetime]:
+        scheduler = Scheduler(data_access_internal=None, webhook_endpoints=None, persistent_jobs=True)
+        scheduler.scheduler.start(paused=True)
+        scheduler._init_tasks()
+        run_dates = get_run_dates(scheduler)
+        scheduler.scheduler.shutdown(wait=False)
+        return run_dates
+
+    asyncio.run(restart())
+    entries = [
+        entries[0],
+        create_entry(2, now + timedelta(hours=4), None),
+        create_entry(4, now + timedelta(hours=5), None),
+    ]
+    capsys.readouterr()
+
+    run_dates = asyncio.run(restart())
+
+    assert run_dates == {
+        1: now + timedelta(hours=1),
+        2: now + timedelta(hours=4),
+        4: now + timedelta(hours=5),
+    }
+    assert "1 unchanged, 2 registered" in capsys.readouterr().out
+
+
+def test_upcoming_website_ids_within_prewarm_window():
+    scheduler = Scheduler(data_access_internal=None, webhook_endpoints=None, persistent_jobs=False)
+    now = datetime.now(timezone.utc)
+    scheduler._add_job(1, now + timedelta(seconds=10))
+    scheduler._add_job(2, now + timedelta(hours=1))
+
+    async def get_upcoming_website_ids() -> list[int]:
+        scheduler.scheduler.start(paused=True)
+        website_ids = scheduler._get_upcoming_website_ids(now + timedelta(seconds=30))
+        scheduler.scheduler.shutdown(wait=False)
+        return website_ids
+
+    assert asyncio.run(get_upcoming_website_ids()) == [1]
+
+
+class FakeWorkerPool:
+    def __init__(self):
+        self.idle = True
+        self.suspended = False
+
+    def is_idle(self) -> bool:
+        return self.idle
+
+    def suspend_browsers(self):
+        self.suspended = True
+
+    def resume_browsers(self):
+        self.suspended = False
+
+
+def test_idle_resources_follow_next_login(monkeypatch):
+    """Kept browsers are closed while the next login is far away and started again before it is due."""
+    scheduler = Scheduler(data_access_internal=None, webhook_endpoints=None, persistent_jobs=False)
+    worker_pool = FakeWorkerPool()
+    scheduler.worker_pool = worker_pool
+    now = datetime.now(timezone.utc)
+    next_run_time = now + timedelta(days=1)
+    monkeypatch.setattr(scheduler, "_get_next_run_time", lambda: next_run_time)
+
+    scheduler._manage_idle_resources()
+    assert worker_pool.suspended
+
+    next_run_time = now + timedelta(minutes=1)
+    scheduler._manage_idle_resources()
+    assert not worker_pool.suspended
+
+    next_run_time = None
+    worker_pool.idle = False
+    scheduler._manage_idle_resources()
+    assert not worker_pool.suspended
+
+
+def test_website_moves_to_dedicated_browser_after_successful_trial():
+    """Only an execution error in a context that also succeeds in a dedicated browser moves the website."""
+    scheduler = Scheduler(data_access_internal=None, webhook_endpoints=None, persistent_jobs=False)
+    shared_browser = SimpleNamespace(kills=0)
+    scheduler.worker_pool = SimpleNamespace(shared_browser=shared_browser)
+
+    scheduler._update_browser_isolation(1, True, LoginStatusCode.SUCCESS_URL_DID_NOT_MATCH, 0)
+    assert scheduler._uses_browser_context(1)
+
+    # Another login killed the shared browser, which failed all of its contexts
+    shared_browser.kills = 1
+    scheduler._update_browser_isolation(1, True, LoginStatusCode.UNKNOWN_EXECUTION_ERROR, 0)
+    assert scheduler._uses_browser_context(1)
+
+    scheduler._update_browser_isolation(1, True, LoginStatusCode.UNKNOWN_EXECUTION_ERROR, 1)
+    assert not scheduler._uses_browser_context(1)
+    # The trial fails as well, so the context was not the cause
+    scheduler._update_browser_isolation(1, False, LoginStatusCode.UNKNOWN_EXECUTION_ERROR, None)
+    assert scheduler._uses_browser_context(1)
+
+    scheduler._update_browser_isolation(1, True, LoginStatusCode.UNKNOWN_EXECUTION_ERROR, 1)
+    scheduler._update_browser_isolation(1, False, LoginStatusCode.SUCCESS, None)
+    assert not scheduler._uses_browser_context(1)
+
+    # The fallback expires
+    assert scheduler._dedicated_browser_websites[1] > time.monotonic() + 23 * 3600
+    scheduler._dedicated_browser_websites[1] = time.monotonic() - 1
+    assert scheduler._uses_browser_context(1)
@@ -0,0 +1,68 @@
+from execution.scheduler_metrics import RollingPercentiles, SchedulerMetrics
+
+
+def test_rolling_percentiles():
+    """Percentiles use the nearest rank of the most recent samples."""
+    percentiles = RollingPercentiles(window=100)
+    assert percentiles.get() is None
+
+    for value in range(1, 201):
+        percentiles.add(value)
+
+    stats = percentiles.get()
+    assert stats.samples == 100
+    assert stats.p50 == 150
+    assert stats.p90 == 190
+    assert stats.p99 == 199
+    assert stats.max == 200
+
+
+def test_scheduler_metrics_snapshot():
+    metrics = SchedulerMetrics()
+    metrics.start_lag.add(1.5)
+    metrics.record_misfire()
+    metrics.record_misfire()
+    metrics.record_browser_recycle("memory")
+
+    snapshot = metrics.get_snapshot()
+    assert snapshot.start_lag_seconds.p50 == 1.5
+    assert snapshot.queue_depth is None
+    assert snapshot.duration_seconds is None
+    assert snapshot.misfires == 2
+    assert snapshot.browser_recycles == {"memory": 1}
+    assert snapshot.blocked_requests == 0
+    assert snapshot.loaded_bytes_with_blocking is None
+
+
+def test_scheduler_metrics_resource_blocking():
+    metrics = SchedulerMetrics()
+    metrics.record_resource_blocking(blocked_requests=12, loaded_bytes=4000)
+    metrics.record_resource_blocking(blocked_requests=3, loaded_bytes=1000)
+
+    snapshot = metrics.get_snapshot()
+    assert snapshot.blocked_requests == 15
+    assert snapshot.loaded_bytes_with_blocking.max == 4000
+
+
+def test_scheduler_metrics_login_steps():
+    metrics = SchedulerMetrics()
+    metrics.record_login_step("fillUsername", 0.2)
+    metrics.record_login_step("fillUsername", 0.4)
+    metrics.record_login_step("clickSubmitButton", 1.0)
+
+    snapshot = metrics.get_snapshot()
+    assert snapshot.login_step_seconds["fillUsername"].samples == 2
+    assert snapshot.login_step_seconds["clickSubmitButton"].max == 1.0
+
+
+def test_scheduler_metrics_captchas_by_website():
+    metrics = SchedulerMetrics()
+    metrics.record_captchas(1, probes=4, hits=1, solve_seconds=[2.5])
+    metrics.record_captchas(1, probes=2, hits=0, solve_seconds=[])
+    metrics.record_captchas(2, probes=3, hits=0, solve_seconds=[])
+
+    snapshot = metrics.get_snapshot()
+    assert snapshot.captchas[1].probes == 6
+    assert snapshot.captchas[1].hits == 1
+    assert snapshot.captchas[1].solve_seconds.max == 2.5
+    assert snapshot.captchas[2].solve_seconds is None
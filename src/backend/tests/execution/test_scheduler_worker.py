@@ -0,0 +1,120 @@
+import threading
+import time
+from multiprocessing.connection import Listener
+
+import pytest
+
+from execution import scheduler_client
+from execution.scheduler_client import SchedulerClient
+from execution.scheduler_worker import SchedulerWorkerServer, WebhookEventForwarder
+from utils.exceptions import SchedulerUnavailableException
+
+AUTHKEY = b"test"
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.tasks = []
+
+    def add_task(self, website_id: int):
+        self.tasks.append(("add", website_id))
+
+    def remove_task(self, website_id: int):
+        self.tasks.append(("remove", website_id))
+
+    def get_status(self):
+        return "status"
+
+    def get_metrics(self):
+        raise ValueError("metrics failed")
+
+    def get_danger_window_websites(self):
+        return {1: 2}
+
+
+class FakeWebhookEndpoints:
+    def __init__(self):
+        self.events = []
+
+    def action_history_changed(self, action_history_id: int, website_id: int):
+        self.events.append((action_history_id, website_id))
+
+
+def wait_until(condition) -> bool:
+    deadline = time.monotonic() + 5
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    return condition()
+
+
+def test_client_forwards_requests_and_events(tmp_path):
+    """Requests reach the worker and webhook events of the worker reach the API process."""
+    address = str(tmp_path / "scheduler.sock")
+    scheduler = FakeScheduler()
+    events = WebhookEventForwarder()
+    server = SchedulerWorkerServer(scheduler, events, address=address, authkey=AUTHKEY)
+    server.start()
+    webhook_endpoints = FakeWebhookEndpoints()
+    client = SchedulerClient(webhook_endpoints, address=address, authkey=AUTHKEY)
+    client.start()
+
+    client.add_task(1)
+    client.remove_task(2)
+    assert scheduler.tasks == [("add", 1), ("remove", 2)]
+    assert client.get_status() == "status"
+    assert client.get_danger_window_websites() == {1: 2}
+    with pytest.raises(RuntimeError, match="metrics failed"):
+        client.get_metrics()
+
+    assert wait_until(lambda: events._subscribers)
+    events.action_history_changed(action_history_id=3, website_id=1)
+    assert wait_until(lambda: webhook_endpoints.events)
+    assert webhook_endpoints.events == [(3, 1)]
+
+    client.stop()
+    server.stop()
+
+
+def test_client_sends_tasks_when_worker_is_back(tmp_path, monkeypatch):
+    """Tasks changed while the worker is down are sent once it is reachable again."""
+    monkeypatch.setattr(scheduler_client, "RECONNECT_INTERVAL_SECONDS", 0.05)
+    address = str(tmp_path / "scheduler.sock")
+    client = SchedulerClient(FakeWebhookEndpoints(), address=address, authkey=AUTHKEY)
+    client.start()
+    assert not client.connected
+
+    client.add_task(1)
+    client.add_task(2)
+    client.remove_task(1)
+
+    scheduler = FakeScheduler()
+    server = SchedulerWorkerServer(
+        scheduler, WebhookEventForwarder(), address=address, authkey=AUTHKEY
+    )
+    server.start()
+    assert wait_until(lambda: len(scheduler.tasks) == 2)
+    assert sorted(scheduler.tasks) == [("add", 2), ("remove", 1)]
+    assert client.connected
+
+    server.stop()
+    assert wait_until(lambda: not client.connected)
+
+    client.stop()
+
+
+def test_client_gives_up_on_hanging_worker(tmp_path, monkeypatch):
+    """A worker that keeps the connection open without answering does not block the API."""
+    monkeypatch.setattr(scheduler_client, "REQUEST_TIMEOUT_SECONDS", 0.2)
+    address = str(tmp_path / "scheduler.sock")
+    listener = Listener(address, authkey=AUTHKEY)
+    connections = []
+    threading.Thread(target=lambda: connections.append(listener.accept()), daemon=True).start()
+    client = SchedulerClient(FakeWebhookEndpoints(), address=address, authkey=AUTHKEY)
+
+    started = time.monotonic()
+    with pytest.raises(SchedulerUnavailableException):
+        client.get_status()
+    assert time.monotonic() - started < 2
+    assert client._connection is None
+
+    listener.close()
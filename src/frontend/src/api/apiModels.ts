@@ -6,6 +6,12 @@ export interface ActionInterval {
   allowed_time_minutes_end: number
 }
 
+export type ExecutionEngine = 'BROWSER' | 'HTTP'
+
+export type BrowserProfileMode = 'NONE' | 'CACHE' | 'CACHE_AND_COOKIES'
+
+export type SuccessUrlMatch = 'EXACT' | 'PREFIX' | 'GLOB' | 'REGEX'
+
 export interface Website {
   id: number
   url: string
@@ -17,6 +23,12 @@ export interface Website {
   paused: boolean
   expiration_interval_minutes: number | null
   custom_login_script: string | null
+  execution_engine: ExecutionEngine
+  block_resources: boolean
+  browser_profile: BrowserProfileMode
+  success_url_match: SuccessUrlMatch
+  success_selector: string | null
+  success_cookie: string | null
   action_interval: ActionInterval | null
   next_schedule: string | null
 }
@@ -30,6 +42,9 @@ export enum FailedDetails {
   SUBMIT_BUTTON_NOT_FOUND = 'SUBMIT_BUTTON_NOT_FOUND',
   SUCCESS_URL_DID_NOT_MATCH = 'SUCCESS_URL_DID_NOT_MATCH',
   UNKNOWN_EXECUTION_ERROR = 'UNKNOWN_EXECUTION_ERROR',
+  EXECUTION_TIMEOUT = 'EXECUTION_TIMEOUT',
+  SITE_UNREACHABLE = 'SITE_UNREACHABLE',
+  WAIT_TIMEOUT = 'WAIT_TIMEOUT',
 }
 
 export interface ActionHistory {
@@ -1,5 +1,6 @@
+import type { SuccessUrlMatch } from '../../../api/apiModels.ts'
 import type { ChangeWebsite } from '../../activity/model.ts'
-import { Checkbox, FormControlLabel, FormHelperText, Grid } from '@mui/material'
+import { Checkbox, FormControlLabel, FormHelperText, Grid, MenuItem } from '@mui/material'
 import TextFieldForm from '../../form/TextFieldForm.tsx'
 import FormGrouping from '../FormGrouping.tsx'
 
@@ -73,7 +74,63 @@ export default function GeneralInfoForm(props: GeneralInfoFormProps) {
             fullWidth
             placeholder="https://www.example.com/success"
             helperText="Redirects to URL after login. This is used to check if the login was successful. Make sure that the URL is not accessible when logged out."
-            onValidate={validateURL}
+            onValidate={value.success_url_match === 'GLOB' || value.success_url_match === 'REGEX' ? undefined : validateURL}
+          />
+        </Grid>
+        <Grid size={{ xs: 4 }}>
+          <TextFieldForm
+            identifier="success_url_match"
+            disabled={loading}
+            select
+            value={value.success_url_match ?? 'EXACT'}
+            onChange={event =>
+              onChange?.({
+                ...value,
+                success_url_match: event.target.value as SuccessUrlMatch,
+              })}
+            variant="filled"
+            label="Success URL match"
+            fullWidth
+            helperText="How the URL after the login is compared with the success URL."
+          >
+            <MenuItem value="EXACT">Exact URL</MenuItem>
+            <MenuItem value="PREFIX">URL starts with</MenuItem>
+            <MenuItem value="GLOB">Wildcard pattern (*)</MenuItem>
+            <MenuItem value="REGEX">Regular expression</MenuItem>
+          </TextFieldForm>
+        </Grid>
+        <Grid size={{ xs: 4 }}>
+          <TextFieldForm
+            identifier="success_selector"
+            disabled={loading}
+            value={value.success_selector ?? ''}
+            onChange={event =>
+              onChange?.({
+                ...value,
+                success_selector: event.target.value === '' ? null : event.target.value,
+              })}
+            variant="filled"
+            label="Success element"
+            fullWidth
+            placeholder="//button[@id='logout']"
+            helperText="Optional XPath of an element that is only shown when logged in."
+          />
+        </Grid>
+        <Grid size={{ xs: 4 }}>
+          <TextFieldForm
+            identifier="success_cookie"
+            disabled={loading}
+            value={value.success_cookie ?? ''}
+            onChange={event =>
+              onChange?.({
+                ...value,
+                success_cookie: event.target.value === '' ? null : event.target.value,
+              })}
+            variant="filled"
+            label="Success cookie"
+            fullWidth
+            placeholder="session"
+            helperText="Optional name of a cookie that is only set when logged in."
           />
         </Grid>
         <Grid size={{ xs: 12 }}>
@@ -104,6 +161,58 @@ export default function GeneralInfoForm(props: GeneralInfoFormProps) {
               />
               <FormHelperText sx={{ marginTop: 0 }}>Automatic login will not be triggered while in paused state.</FormHelperText>
             </div>
+            <div>
+              <FormControlLabel
+                control={(
+                  <Checkbox
+                    disabled={loading}
+                    checked={value.execution_engine === 'HTTP'}
+                    onChange={event => onChange?.({ ...value, execution_engine: event.target.checked ? 'HTTP' : 'BROWSER' })}
+                  />
+                )}
+                label="Try login without browser"
+              />
+              <FormHelperText sx={{ marginTop: 0 }}>Submits simple login forms without starting a browser. Falls back to the browser if it fails.</FormHelperText>
+            </div>
+            <div>
+              <FormControlLabel
+                control={(
+                  <Checkbox
+                    disabled={loading}
+                    checked={value.block_resources ?? false}
+                    onChange={event => onChange?.({ ...value, block_resources: event.target.checked })}
+                  />
+                )}
+                label="Block images and trackers"
+              />
+              <FormHelperText sx={{ marginTop: 0 }}>Loads the login page faster. Disable it if the login breaks.</FormHelperText>
+            </div>
+            <div>
+              <FormControlLabel
+                control={(
+                  <Checkbox
+                    disabled={loading}
+                    checked={value.browser_profile !== undefined && value.browser_profile !== 'NONE'}
+                    onChange={event => onChange?.({ ...value, browser_profile: event.target.checked ? 'CACHE' : 'NONE' })}
+                  />
+                )}
+                label="Keep browser cache"
+              />
+              <FormHelperText sx={{ marginTop: 0 }}>Keeps downloaded files between logins, so repeated logins load faster.</FormHelperText>
+            </div>
+            <div>
+              <FormControlLabel
+                control={(
+                  <Checkbox
+                    disabled={loading || value.browser_profile === undefined || value.browser_profile === 'NONE'}
+                    checked={value.browser_profile === 'CACHE_AND_COOKIES'}
+                    onChange={event => onChange?.({ ...value, browser_profile: event.target.checked ? 'CACHE_AND_COOKIES' : 'CACHE' })}
+                  />
+                )}
+                label="Keep cookies"
+              />
+              <FormHelperText sx={{ marginTop: 0 }}>Keeps the cookies of the last login in the browser cache.</FormHelperText>
+            </div>
           </div>
         </Grid>
       </Grid>
@@ -59,6 +59,21 @@ export function completions(context: CompletionContext) {
         type: "function",
         info: "wait(ms): Pauses execution for the specified number of milliseconds.",
       },
+      {
+        label: 'waitForElement(\'\', 5000)',
+        type: "function",
+        info: "waitForElement(xpath, timeoutMs): Pauses execution until the element found by xpath is visible. The login fails if it is not visible within the timeout.",
+      },
+      {
+        label: 'waitForUrl(\'\', 10000)',
+        type: "function",
+        info: "waitForUrl(url, timeoutMs): Pauses execution until the page URL matches. The login fails if it does not match within the timeout. * matches any characters.",
+      },
+      {
+        label: "waitForNetworkIdle(5000)",
+        type: "function",
+        info: "waitForNetworkIdle(timeoutMs): Pauses execution until the page stopped loading, at most for the timeout. Continues after the timeout.",
+      },
     ],
   };
 }
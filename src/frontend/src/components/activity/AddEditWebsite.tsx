@@ -24,6 +24,12 @@ const emptyChangeWebsite: ChangeWebsite = {
   paused: false,
   expiration_interval_minutes: null,
   custom_login_script: null,
+  execution_engine: 'BROWSER',
+  block_resources: false,
+  browser_profile: 'NONE',
+  success_url_match: 'EXACT',
+  success_selector: null,
+  success_cookie: null,
   action_interval: {
     date_minutes_start: 0,
     date_minutes_end: null,
@@ -74,6 +74,15 @@ export default function LoginHistoryDetails(props: LoginHistoryDetailsProps) {
       case FailedDetails.UNKNOWN_EXECUTION_ERROR:
         message = 'An unknown error occurred while executing task.';
         break;
+      case FailedDetails.EXECUTION_TIMEOUT:
+        message = 'The login did not finish in time and was aborted.';
+        break;
+      case FailedDetails.SITE_UNREACHABLE:
+        message = 'The website was not reachable. The login is retried sooner.';
+        break;
+      case FailedDetails.WAIT_TIMEOUT:
+        message = 'A wait of the custom login script timed out.';
+        break;
       case null:
         message = 'Unknown error';
         break;
@@ -1,4 +1,4 @@
-import type { ActionHistory } from '../../api/apiModels.ts'
+import type { ActionHistory, BrowserProfileMode, ExecutionEngine, SuccessUrlMatch } from '../../api/apiModels.ts'
 import { ActivityStatusCode } from './StatusIcon.tsx'
 
 export interface ActivityData {
@@ -30,5 +30,11 @@ export interface ChangeWebsite {
   paused?: boolean;
   expiration_interval_minutes?: number | null;
   custom_login_script?: string | null;
+  execution_engine?: ExecutionEngine;
+  block_resources?: boolean;
+  browser_profile?: BrowserProfileMode;
+  success_url_match?: SuccessUrlMatch;
+  success_selector?: string | null;
+  success_cookie?: string | null;
   action_interval?: ActionInterval | null;
 }
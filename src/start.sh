@@ -5,4 +5,27 @@ Xvfb -ac :99 -screen 0 1920x1080x24 > /dev/null 2>&1 &
 
 sleep 1
 
-exec uvicorn main:app --host 0.0.0.0 --port 7653
+if [ "$SCHEDULER_MODE" != "worker" ]; then
+    exec uvicorn main:app --host 0.0.0.0 --port 7653
+fi
+
+# Migrate the database once before both processes use it
+python -c "from dataAccess.database.database import init_db; init_db()"
+
+python -m execution.scheduler_worker &
+worker_pid=$!
+uvicorn main:app --host 0.0.0.0 --port 7653 &
+api_pid=$!
+
+# Forward stop signals to both processes, so a running login can finish its cleanup
+stop() {
+    kill -TERM "$worker_pid" "$api_pid" 2>/dev/null
+}
+trap stop TERM INT
+
+# Stop the container when either process exits, so it is restarted instead of running without logins
+wait -n "$worker_pid" "$api_pid"
+exit_code=$?
+stop
+wait
+exit "$exit_code"